@@ -6,7 +6,12 @@ a = Analysis(
     pathex=['src'],
     binaries=[],
     datas=[('resources/templates', 'resources/templates'), ('docs', 'docs'), ('src', 'src')],
-    hiddenimports=['pandas', 'pyodbc', 'openpyxl', 'evaluacion_docente'],
+    hiddenimports=[
+        'pandas', 'pyodbc', 'openpyxl', 'evaluacion_docente', 'ingesta_lote', 'pool_conexiones',
+        'arranque', 'catalogos', 'cumplimiento', 'diario_local', 'explorador', 'exportacion_bi', 'informes_docentes',
+        'ingesta_desatendida', 'lector_excel', 'manifiesto', 'metricas', 'plantillas', 'prevalidacion',
+        'registro_grupal', 'resolvedor_nombres', 'resumen_cumplimiento'
+    ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,162 @@
+"""Mide la ingesta completa con libros sintéticos y el sustituto SQLite de la base de datos.
+
+Uso:
+    python benchmarks/benchmark_ingesta.py [--archivos N] [--items N] [--workers N] [--grupo N]
+                                           [--cumplimiento-cliente] [--directorio DIR] [--json ARCHIVO]
+
+Genera los libros y la base sustituta en un directorio temporal, registra
+todos los archivos con procesar_archivo_excel (o con MotorIngestaLote si se
+indica --workers o --grupo) y muestra archivos/s, filas/s, el pico de memoria residente
+y los tiempos por etapa tomados del registro de métricas (metricas.jsonl).
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:
+    # Windows: sin getrusage
+    resource = None
+
+# Agregar el directorio src al path
+src_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from evaluacion_docente import EvaluacionDocenteSystem
+from metricas import resumir_tiempos
+
+from generar_libros import generar_catalogo, generar_libros
+from sustituto_sqlite import crear_base, fabrica_conexiones
+
+
+def leer_metricas_archivos(ruta_metricas: str, desde: int = 0) -> List[Dict]:
+    """Duraciones por archivo (en segundos) registradas en metricas.jsonl a partir de un byte"""
+    resultados = []
+    with open(ruta_metricas, encoding='utf-8') as f:
+        f.seek(desde)
+        for linea in f:
+            evento = json.loads(linea)
+            if evento['evento'] == 'archivo':
+                resultados.append({
+                    'archivo': evento['archivo'],
+                    'duraciones': {etapa: ms / 1000 for etapa, ms in evento['duraciones_ms'].items()}
+                })
+    return resultados
+
+
+def pico_memoria_mib() -> Optional[Dict[str, float]]:
+    """Pico de memoria residente del proceso y de sus hijos (MiB), si el sistema lo permite"""
+    if resource is None:
+        return None
+    # ru_maxrss está en KiB en Linux y en bytes en macOS
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return {
+        'proceso': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / divisor,
+        'hijos': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / divisor
+    }
+
+
+def ejecutar(archivos: int, items: int, directorio: str, workers: Optional[int] = None,
+             cumplimiento_cliente: bool = False, semilla: int = 0, grupo: Optional[int] = None) -> Dict:
+    """Prepara los datos, ejecuta la ingesta y devuelve las métricas"""
+    catalogo = generar_catalogo(archivos, items)
+    inicio = time.perf_counter()
+    rutas = generar_libros(os.path.join(directorio, 'libros'), catalogo, archivos, semilla)
+    duracion_generacion = time.perf_counter() - inicio
+
+    ruta_bd = os.path.join(directorio, 'evaluaciones.db')
+    crear_base(ruta_bd, catalogo)
+    sistema = EvaluacionDocenteSystem(
+        fabrica_conexion=fabrica_conexiones(ruta_bd),
+        directorio_datos=os.path.join(directorio, 'datos')
+    )
+    sistema.cumplimiento_cliente = cumplimiento_cliente
+    # Catálogos en memoria antes de medir, como en una sesión ya iniciada
+    sistema.catalogos.recargar()
+    ruta_metricas = sistema.metricas.ruta_archivo
+    desde = os.path.getsize(ruta_metricas) if os.path.exists(ruta_metricas) else 0
+
+    inicio = time.perf_counter()
+    if workers or grupo:
+        from ingesta_lote import MotorIngestaLote
+        resultado = MotorIngestaLote(sistema, max_workers=workers or 1, tamano_grupo=grupo).procesar(rutas)
+        procesados = resultado['procesados']
+    else:
+        procesados = sum(1 for ruta in rutas if sistema.procesar_archivo_excel(ruta))
+    duracion = time.perf_counter() - inicio
+    sistema.pool.cerrar()
+
+    conn = sqlite3.connect(ruta_bd)
+    try:
+        filas = conn.execute("SELECT COUNT(*) FROM ResultadosEvaluacion").fetchone()[0]
+    finally:
+        conn.close()
+
+    tiempos = resumir_tiempos(leer_metricas_archivos(ruta_metricas, desde))
+    return {
+        'archivos': archivos,
+        'items': items,
+        'workers': workers,
+        'grupo': grupo,
+        'cumplimiento_cliente': cumplimiento_cliente,
+        'procesados': procesados,
+        'filas': filas,
+        'generacion_segundos': round(duracion_generacion, 3),
+        'duracion_segundos': round(duracion, 3),
+        'archivos_por_segundo': round(procesados / duracion, 2) if duracion > 0 else None,
+        'filas_por_segundo': round(filas / duracion, 1) if duracion > 0 else None,
+        'pico_memoria_mib': pico_memoria_mib(),
+        'etapas': tiempos['etapas'],
+        'mas_lentos': tiempos['mas_lentos']
+    }
+
+
+def imprimir(metricas: Dict):
+    print(f"Archivos: {metricas['procesados']}/{metricas['archivos']} ({metricas['items']} ítems)  "
+          f"Filas: {metricas['filas']}  Duración: {metricas['duracion_segundos']:.3f}s")
+    print(f"Rendimiento: {metricas['archivos_por_segundo']} archivos/s, {metricas['filas_por_segundo']} filas/s")
+    memoria = metricas['pico_memoria_mib']
+    if memoria:
+        print(f"Pico de memoria residente: {memoria['proceso']:.1f} MiB (hijos: {memoria['hijos']:.1f} MiB)")
+    print(f"\n{'Etapa':<20} {'Total (s)':>10} {'p50 (ms)':>10} {'p95 (ms)':>10}")
+    for etapa, datos in metricas['etapas'].items():
+        print(f"{etapa:<20} {datos['total'] / 1000:>10.3f} {datos['p50']:>10.2f} {datos['p95']:>10.2f}")
+    if metricas['mas_lentos']:
+        print("\nMás lentos: " + ", ".join(
+            f"{lento['archivo']} ({lento['total_ms']:.0f} ms)" for lento in metricas['mas_lentos']
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--archivos', type=int, default=50, help='Cantidad de libros')
+    parser.add_argument('--items', type=int, default=60, help='Ítems por libro')
+    parser.add_argument('--workers', type=int, default=None, help='Procesos de lectura (MotorIngestaLote)')
+    parser.add_argument('--grupo', type=int, default=None, help='Archivos por transacción (commit en grupo)')
+    parser.add_argument('--cumplimiento-cliente', action='store_true', help='Calcula el cumplimiento en el cliente')
+    parser.add_argument('--semilla', type=int, default=0, help='Semilla del generador de libros')
+    parser.add_argument('--directorio', help='Directorio de trabajo (por defecto, uno temporal)')
+    parser.add_argument('--json', metavar='ARCHIVO', help='Guarda las métricas en JSON')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='benchmark_ingesta_') as temporal:
+        metricas = ejecutar(
+            args.archivos, args.items, args.directorio or temporal,
+            workers=args.workers, cumplimiento_cliente=args.cumplimiento_cliente, semilla=args.semilla,
+            grupo=args.grupo
+        )
+    imprimir(metricas)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(metricas, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
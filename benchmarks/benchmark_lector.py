@@ -0,0 +1,64 @@
+"""Compara la lectura doble con pd.read_excel frente al lector de una sola apertura.
+
+Uso:
+    python benchmarks/benchmark_lector.py archivo1.xlsm [archivo2.xlsm ...] [--repeticiones N]
+
+Para cada archivo muestra el tiempo medio de lectura y el pico de memoria
+(tracemalloc) de ambos métodos.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+# Agregar el directorio src al path
+src_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from lector_excel import leer_libro_evaluacion
+
+
+def leer_doble_read_excel(ruta_archivo: str):
+    """Lectura original: dos llamadas a pd.read_excel sobre el mismo libro"""
+    df_general = pd.read_excel(ruta_archivo, sheet_name='DATOS_GENERALES', header=None, engine='openpyxl')
+    df_eval = pd.read_excel(ruta_archivo, sheet_name='EVALUACION', engine='openpyxl')
+    return df_general, df_eval
+
+
+def medir(funcion, ruta_archivo: str, repeticiones: int):
+    """Devuelve (segundos medios, pico de memoria en MiB) de una función de lectura"""
+    duraciones = []
+    pico = 0
+    for _ in range(repeticiones):
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        funcion(ruta_archivo)
+        duraciones.append(time.perf_counter() - inicio)
+        pico = max(pico, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return sum(duraciones) / len(duraciones), pico / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('archivos', nargs='+', help='Libros de evaluación (.xlsm/.xlsx)')
+    parser.add_argument('--repeticiones', type=int, default=3, help='Repeticiones por archivo')
+    args = parser.parse_args()
+
+    print(f"{'Archivo':<40} {'read_excel x2 (s)':>18} {'MiB':>8} {'lector (s)':>12} {'MiB':>8} {'Mejora':>8}")
+    for ruta_archivo in args.archivos:
+        t_doble, m_doble = medir(leer_doble_read_excel, ruta_archivo, args.repeticiones)
+        t_lector, m_lector = medir(leer_libro_evaluacion, ruta_archivo, args.repeticiones)
+        mejora = t_doble / t_lector if t_lector > 0 else float('inf')
+        print(
+            f"{os.path.basename(ruta_archivo)[:40]:<40} {t_doble:>18.4f} {m_doble:>8.2f} "
+            f"{t_lector:>12.4f} {m_lector:>8.2f} {mejora:>7.1f}x"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""Genera libros de evaluación sintéticos y el catálogo de referencia correspondiente.
+
+Uso:
+    python benchmarks/generar_libros.py DIRECTORIO [--archivos N] [--items N] [--semilla N]
+
+Cada libro tiene las hojas DATOS_GENERALES y EVALUACION con la misma
+estructura que la plantilla, y una identidad (periodo, docente, asignatura)
+distinta para que todos puedan registrarse en la misma base. Con
+--consolidado se genera además un libro con todas las evaluaciones, en pares
+de hojas o en la tabla EVALUACIONES.
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from openpyxl import Workbook
+
+# Agregar el directorio src al path
+src_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from evaluacion_docente import CAMPOS_REQUERIDOS, ESTADOS_VALIDOS
+from lector_excel import COLUMNAS_GENERALES_TABLA, HOJA_TABLA_CONSOLIDADA
+
+ITEMS_POR_CATEGORIA = 10
+ENCABEZADO_EVALUACION = ['CATEGORÍA', 'ÍTEM DE EVALUACIÓN', 'ESTADO', 'FECHA', 'OBSERVACIONES']
+
+
+def generar_catalogo(archivos: int, items: int, facultades: int = 4, carreras_por_facultad: int = 5) -> Dict:
+    """Catálogo de referencia con datos suficientes para `archivos` evaluaciones distintas"""
+    categorias = {}
+    for numero in range(items):
+        categorias.setdefault(f"Categoría {numero // ITEMS_POR_CATEGORIA + 1}", []).append(
+            f"Ítem de evaluación {numero + 1}"
+        )
+    return {
+        'facultades': {
+            f"Facultad {f + 1}": [f"Carrera {f + 1}.{c + 1}" for c in range(carreras_por_facultad)]
+            for f in range(facultades)
+        },
+        'categorias': categorias,
+        'docentes': [(f"Nombre{d + 1}", f"Apellido{d + 1}") for d in range(archivos)],
+        'asignaturas': [f"Asignatura {a + 1}" for a in range(max(1, archivos // 10))],
+        'periodos': ['2024-1', '2024-2']
+    }
+
+
+def _filas_evaluacion(items: Dict[str, List[str]], aleatorio: random.Random):
+    """Filas de la hoja EVALUACION con un resultado aleatorio por ítem"""
+    fecha_base = datetime(2024, 5, 1)
+    for categoria, nombres in items.items():
+        for item in nombres:
+            # Un estado vacío se registra como 'No Aplica'
+            estado = aleatorio.choice(ESTADOS_VALIDOS + [None])
+            fecha = fecha_base + timedelta(days=aleatorio.randrange(60)) if aleatorio.random() < 0.9 else None
+            observacion = f"Observación sobre {item.lower()}" if aleatorio.random() < 0.3 else None
+            yield [categoria, item, estado, fecha, observacion]
+
+
+def _agregar_hojas(libro: Workbook, datos_generales: List[str], items: Dict[str, List[str]],
+                   aleatorio: random.Random, sufijo: str = ''):
+    hoja_general = libro.create_sheet(f"DATOS_GENERALES{sufijo}")
+    hoja_general.append(['EVALUACIÓN DOCENTE'])
+    hoja_general.append([])
+    for fila, valor in zip(sorted(CAMPOS_REQUERIDOS), datos_generales):
+        hoja_general.append([CAMPOS_REQUERIDOS[fila], valor])
+
+    hoja_eval = libro.create_sheet(f"EVALUACION{sufijo}")
+    hoja_eval.append(ENCABEZADO_EVALUACION)
+    for fila in _filas_evaluacion(items, aleatorio):
+        hoja_eval.append(fila)
+
+
+def generar_libro(ruta_archivo: str, datos_generales: List[str], items: Dict[str, List[str]],
+                  aleatorio: random.Random):
+    """Escribe un libro con los datos generales y un resultado por ítem"""
+    libro = Workbook(write_only=True)
+    _agregar_hojas(libro, datos_generales, items, aleatorio)
+    libro.save(ruta_archivo)
+
+
+def generar_libro_consolidado(ruta_archivo: str, evaluaciones: List[List[str]], items: Dict[str, List[str]],
+                              aleatorio: random.Random, formato: str = 'pares'):
+    """Escribe un libro con varias evaluaciones: pares de hojas numeradas o la tabla EVALUACIONES"""
+    libro = Workbook(write_only=True)
+    if formato == 'pares':
+        for numero, datos_generales in enumerate(evaluaciones, start=1):
+            _agregar_hojas(libro, datos_generales, items, aleatorio, f"_{numero}")
+    else:
+        hoja = libro.create_sheet(HOJA_TABLA_CONSOLIDADA)
+        hoja.append(COLUMNAS_GENERALES_TABLA + ENCABEZADO_EVALUACION)
+        for datos_generales in evaluaciones:
+            for fila in _filas_evaluacion(items, aleatorio):
+                hoja.append(list(datos_generales) + fila)
+    libro.save(ruta_archivo)
+
+
+def _datos_generales(catalogo: Dict, numero: int) -> List[str]:
+    """Datos generales de la evaluación `numero` (identidad distinta para cada número)"""
+    facultades = list(catalogo['facultades'].items())
+    facultad, carreras = facultades[numero % len(facultades)]
+    nombres, apellidos = catalogo['docentes'][numero % len(catalogo['docentes'])]
+    return [
+        catalogo['periodos'][numero % len(catalogo['periodos'])],
+        facultad,
+        carreras[numero % len(carreras)],
+        "Coordinación Académica",
+        catalogo['asignaturas'][numero % len(catalogo['asignaturas'])],
+        f"{nombres} {apellidos}"
+    ]
+
+
+def generar_libros(directorio: str, catalogo: Dict, archivos: int, semilla: int = 0) -> List[str]:
+    """Genera `archivos` libros en el directorio y devuelve sus rutas"""
+    os.makedirs(directorio, exist_ok=True)
+    aleatorio = random.Random(semilla)
+    rutas = []
+    for numero in range(archivos):
+        ruta_archivo = os.path.join(directorio, f"evaluacion_{numero + 1:05d}.xlsx")
+        generar_libro(ruta_archivo, _datos_generales(catalogo, numero), catalogo['categorias'], aleatorio)
+        rutas.append(ruta_archivo)
+    return rutas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('directorio', help='Directorio de salida')
+    parser.add_argument('--archivos', type=int, default=20, help='Cantidad de libros')
+    parser.add_argument('--items', type=int, default=60, help='Ítems por libro')
+    parser.add_argument('--semilla', type=int, default=0, help='Semilla del generador aleatorio')
+    parser.add_argument('--consolidado', choices=['pares', 'tabla'],
+                        help='Genera un único libro con todas las evaluaciones en el formato indicado')
+    args = parser.parse_args()
+
+    catalogo = generar_catalogo(args.archivos, args.items)
+    if args.consolidado:
+        os.makedirs(args.directorio, exist_ok=True)
+        ruta_archivo = os.path.join(args.directorio, f"consolidado_{args.consolidado}.xlsx")
+        evaluaciones = [_datos_generales(catalogo, numero) for numero in range(args.archivos)]
+        generar_libro_consolidado(
+            ruta_archivo, evaluaciones, catalogo['categorias'], random.Random(args.semilla), args.consolidado
+        )
+        print(f"Libro con {len(evaluaciones)} evaluaciones generado en {os.path.abspath(ruta_archivo)}")
+        return
+    rutas = generar_libros(args.directorio, catalogo, args.archivos, args.semilla)
+    print(f"{len(rutas)} libros generados en {os.path.abspath(args.directorio)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Mide el tiempo de arranque de la aplicación (script o ejecutable de PyInstaller).
+
+Uso:
+    python benchmarks/medir_arranque.py [EJECUTABLE] [--repeticiones N] [--json ARCHIVO]
+
+Sin EJECUTABLE se mide `python main.py`. Cada repetición inicia la aplicación
+con --informe-arranque, que cierra la ventana cuando el sistema termina de
+inicializarse, y muestra la mediana de cada hito:
+
+- antes_de_main: creación del proceso hasta main.py (intérprete y cargador).
+- interfaz: tkinter y el módulo de la interfaz importados.
+- ventana: ventana principal dibujada.
+- modulos: pandas, openpyxl y pyodbc importados (en segundo plano).
+- sistema: EvaluacionDocenteSystem listo.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HITOS = ['interfaz', 'ventana', 'modulos', 'sistema']
+
+
+def medir(comando, repeticiones: int):
+    """Ejecuta la aplicación varias veces y devuelve los informes de arranque"""
+    informes = []
+    with tempfile.TemporaryDirectory(prefix='arranque_') as temporal:
+        ruta_informe = os.path.join(temporal, 'arranque.jsonl')
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            subprocess.run(comando + ['--informe-arranque', ruta_informe], check=True, timeout=300)
+            duracion = time.perf_counter() - inicio
+            with open(ruta_informe, encoding='utf-8') as f:
+                informe = json.loads(f.readlines()[-1])
+            informe['proceso_completo'] = round(duracion, 3)
+            informes.append(informe)
+    return informes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('ejecutable', nargs='?', help='Ejecutable generado por build_installer.py')
+    parser.add_argument('--repeticiones', type=int, default=5, help='Arranques a medir')
+    parser.add_argument('--json', metavar='ARCHIVO', help='Guarda los informes en JSON')
+    args = parser.parse_args()
+
+    comando = [args.ejecutable] if args.ejecutable else [sys.executable, os.path.join(RAIZ, 'main.py')]
+    informes = medir(comando, args.repeticiones)
+
+    print(f"{'Hito':<16} {'Mediana (s)':>12} {'Máximo (s)':>12}")
+    filas = [('antes_de_main', [i['antes_de_main'] for i in informes if i['antes_de_main'] is not None])]
+    filas += [(hito, [i['hitos'][hito] for i in informes if hito in i['hitos']]) for hito in HITOS]
+    filas.append(('proceso_completo', [i['proceso_completo'] for i in informes]))
+    for hito, valores in filas:
+        if valores:
+            print(f"{hito:<16} {statistics.median(valores):>12.3f} {max(valores):>12.3f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(informes, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,513 @@
+"""Sustituto SQLite de EvaluacionDocenteDB para medir la ingesta sin SQL Server.
+
+Crea las tablas que usa la aplicación y expone conexiones con la interfaz de
+pyodbc que usa el sistema (cursor, execute con parámetros posicionales,
+executemany, fetchval, fetchmany, commit y rollback). Las sentencias T-SQL de la
+ingesta se reconocen por su contenido y se emulan:
+
+- sp_RegistrarEvaluacion, sp_RegistrarResultadosEvaluacion (ítem no
+  encontrado y duplicados) y sp_CalcularPorcentajeCumplimiento.
+- La carga de resultados por lotes (#ResultadosCarga, registrada fila por fila
+  con el procedimiento) con cumplimiento en el servidor o en el cliente
+  (#CumplimientoCarga).
+- Los puntos de guardado del commit en grupo (SAVE/ROLLBACK TRANSACTION).
+- El resumen de cumplimiento para BI (creación, anotación de aportes en las
+  temporales de la sesión, MERGE tras el commit y reconstrucción).
+- Las consultas de catálogos, traducidas a la sintaxis de SQLite.
+
+No pretende reproducir SQL Server: el objetivo es que los tiempos del cliente
+(lectura, validación, preparación y envío de parámetros) sean medibles.
+"""
+import re
+import sqlite3
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+ESQUEMA = """
+    CREATE TABLE IF NOT EXISTS Facultades (
+        FacultadID INTEGER PRIMARY KEY,
+        Nombre TEXT NOT NULL COLLATE NOCASE,
+        Estado INTEGER NOT NULL DEFAULT 1
+    );
+    CREATE TABLE IF NOT EXISTS Carreras (
+        CarreraID INTEGER PRIMARY KEY,
+        FacultadID INTEGER NOT NULL REFERENCES Facultades (FacultadID),
+        Nombre TEXT NOT NULL COLLATE NOCASE,
+        Estado INTEGER NOT NULL DEFAULT 1
+    );
+    CREATE TABLE IF NOT EXISTS Docentes (
+        DocenteID INTEGER PRIMARY KEY,
+        Nombres TEXT NOT NULL COLLATE NOCASE,
+        Apellidos TEXT NOT NULL COLLATE NOCASE
+    );
+    CREATE TABLE IF NOT EXISTS Asignaturas (
+        AsignaturaID INTEGER PRIMARY KEY,
+        Nombre TEXT NOT NULL COLLATE NOCASE
+    );
+    CREATE TABLE IF NOT EXISTS PeriodosAcademicos (
+        PeriodoID INTEGER PRIMARY KEY,
+        Nombre TEXT NOT NULL COLLATE NOCASE
+    );
+    CREATE TABLE IF NOT EXISTS CategoriasEvaluacion (
+        CategoriaID INTEGER PRIMARY KEY,
+        Nombre TEXT NOT NULL COLLATE NOCASE,
+        Estado INTEGER NOT NULL DEFAULT 1,
+        Orden INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS ItemsEvaluacion (
+        ItemID INTEGER PRIMARY KEY,
+        CategoriaID INTEGER NOT NULL REFERENCES CategoriasEvaluacion (CategoriaID),
+        Nombre TEXT NOT NULL COLLATE NOCASE,
+        Estado INTEGER NOT NULL DEFAULT 1,
+        Orden INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS ix_items_nombre ON ItemsEvaluacion (Nombre);
+    CREATE TABLE IF NOT EXISTS Evaluaciones (
+        EvaluacionID INTEGER PRIMARY KEY AUTOINCREMENT,
+        DocenteID INTEGER NOT NULL,
+        PeriodoID INTEGER NOT NULL,
+        AsignaturaID INTEGER NOT NULL,
+        CarreraID INTEGER NOT NULL,
+        RevisadoPor TEXT,
+        FechaEvaluacion TEXT NOT NULL,
+        PorcentajeCumplimiento REAL,
+        Estado INTEGER NOT NULL DEFAULT 1
+    );
+    CREATE INDEX IF NOT EXISTS ix_evaluaciones_identidad
+        ON Evaluaciones (PeriodoID, DocenteID, AsignaturaID);
+    CREATE TABLE IF NOT EXISTS ResultadosEvaluacion (
+        ResultadoID INTEGER PRIMARY KEY,
+        EvaluacionID INTEGER NOT NULL REFERENCES Evaluaciones (EvaluacionID),
+        ItemID INTEGER NOT NULL REFERENCES ItemsEvaluacion (ItemID),
+        Estado TEXT NOT NULL,
+        FechaRevision TEXT,
+        Observaciones TEXT,
+        UNIQUE (EvaluacionID, ItemID)
+    );
+"""
+
+# Peso de cada estado en sp_CalcularPorcentajeCumplimiento ('No Aplica' no cuenta)
+SQL_CALCULAR_CUMPLIMIENTO = """
+    UPDATE Evaluaciones SET PorcentajeCumplimiento = COALESCE((
+        SELECT ROUND(100.0 * SUM(CASE Estado
+                                     WHEN 'Cumplimiento satisfactorio' THEN 1.0
+                                     WHEN 'Cumplimiento parcial' THEN 0.5
+                                     ELSE 0.0 END)
+                     / NULLIF(SUM(CASE WHEN Estado <> 'No Aplica' THEN 1 END), 0), 2)
+        FROM ResultadosEvaluacion r
+        WHERE r.EvaluacionID = Evaluaciones.EvaluacionID
+    ), 0)
+    WHERE EvaluacionID {condicion}
+"""
+
+# Traducciones T-SQL -> SQLite para las consultas de lectura
+TRADUCCIONES = [
+    (re.compile(r"(\w+(?:\.\w+)?)\s*\+\s*' '\s*\+\s*(\w+(?:\.\w+)?)"), r"\1 || ' ' || \2"),
+    (re.compile(r"\bISNULL\("), "IFNULL("),
+    (re.compile(r"#(\w+)"), r"temp.\1"),
+    (re.compile(r"STRING_SPLIT\(\?, ','\)"), "json_each('[' || ? || ']')"),
+    (re.compile(r"\s+WITH \((?:UPDLOCK|HOLDLOCK|ROWLOCK|, )+\)"), ""),
+]
+
+
+class ErrorSustituto(Exception):
+    """Error equivalente a un THROW o RAISERROR del servidor"""
+
+
+def crear_base(ruta_bd: str, catalogo: Dict):
+    """Crea la base sustituta y carga los catálogos de referencia.
+
+    catalogo tiene las claves facultades ({facultad: [carreras]}), categorias
+    ({categoria: [ítems]}), docentes ([(nombres, apellidos)]), asignaturas y
+    periodos (listas de nombres).
+    """
+    conn = sqlite3.connect(ruta_bd)
+    try:
+        conn.executescript(ESQUEMA)
+        for facultad, carreras in catalogo['facultades'].items():
+            facultad_id = conn.execute("INSERT INTO Facultades (Nombre) VALUES (?)", (facultad,)).lastrowid
+            conn.executemany(
+                "INSERT INTO Carreras (FacultadID, Nombre) VALUES (?, ?)",
+                [(facultad_id, carrera) for carrera in carreras]
+            )
+        for orden, (categoria, items) in enumerate(catalogo['categorias'].items(), start=1):
+            categoria_id = conn.execute(
+                "INSERT INTO CategoriasEvaluacion (Nombre, Orden) VALUES (?, ?)", (categoria, orden)
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO ItemsEvaluacion (CategoriaID, Nombre, Orden) VALUES (?, ?, ?)",
+                [(categoria_id, item, orden_item) for orden_item, item in enumerate(items, start=1)]
+            )
+        conn.executemany("INSERT INTO Docentes (Nombres, Apellidos) VALUES (?, ?)", catalogo['docentes'])
+        conn.executemany("INSERT INTO Asignaturas (Nombre) VALUES (?)", [(a,) for a in catalogo['asignaturas']])
+        conn.executemany("INSERT INTO PeriodosAcademicos (Nombre) VALUES (?)", [(p,) for p in catalogo['periodos']])
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _parametro(valor):
+    """Convierte los parámetros que pyodbc acepta y sqlite3 no"""
+    if isinstance(valor, datetime):
+        return valor.isoformat(sep=' ')
+    if isinstance(valor, date):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if hasattr(valor, 'item') and not isinstance(valor, (str, bytes)):
+        # Escalares de numpy
+        return valor.item()
+    return valor
+
+
+def _punto_guardado(sql: str) -> str:
+    """Nombre del punto de guardado de SAVE/ROLLBACK TRANSACTION"""
+    return re.search(r"(?:SAVE|ROLLBACK) TRANSACTION (\w+)", sql).group(1)
+
+
+def _parametros(parametros) -> List:
+    """Admite parámetros como secuencia o como argumentos sueltos (estilo pyodbc)"""
+    if len(parametros) == 1 and isinstance(parametros[0], (list, tuple)):
+        parametros = parametros[0]
+    return [_parametro(valor) for valor in parametros]
+
+
+class CursorSustituto:
+    """Cursor con la interfaz de pyodbc que emula las sentencias de la ingesta"""
+
+    def __init__(self, conexion: 'ConexionSustituta'):
+        self._conexion = conexion
+        self._cursor = conexion._conn.cursor()
+        self._filas: Optional[List] = None
+        self.fast_executemany = False
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def _resultado(self, filas: List):
+        self._filas = list(filas)
+
+    def execute(self, sql: str, *parametros):
+        parametros = _parametros(parametros)
+        self._filas = None
+        # pyodbc envía los lotes con parámetros por sp_executesql: las #tablas que
+        # crean se eliminan al terminar la llamada
+        temporales = self._temporales() if parametros and 'CREATE TABLE #' in sql else None
+        self._ejecutar(sql, parametros)
+        if temporales is not None:
+            for nombre in self._temporales() - temporales:
+                self._cursor.execute(f"DROP TABLE temp.{nombre}")
+        return self
+
+    def _temporales(self) -> set:
+        return {fila[0] for fila in self._cursor.execute(
+            "SELECT name FROM sqlite_temp_master WHERE type = 'table'"
+        ).fetchall()}
+
+    def _ejecutar(self, sql: str, parametros: List):
+        if 'sp_RegistrarEvaluacion' in sql:
+            self._resultado([(self._registrar_evaluacion(*parametros),)])
+        elif 'CREATE TABLE #ResultadosCarga' in sql:
+            self._crear_tablas_carga()
+        elif 'sp_RegistrarResultadosEvaluacion' in sql and '#ResultadosCarga' in sql:
+            self._registrar_resultados_lote(cumplimiento_cliente='#CumplimientoCarga c' in sql)
+        elif 'SAVE TRANSACTION' in sql:
+            self._cursor.execute(f"SAVEPOINT {_punto_guardado(sql)}")
+        elif 'ROLLBACK TRANSACTION' in sql:
+            # En SQLite un error no invalida la transacción: siempre sigue utilizable
+            self._cursor.execute(f"ROLLBACK TO {_punto_guardado(sql)}")
+            self._resultado([(1,)])
+        elif 'CREATE TABLE dbo.ResumenEvaluaciones' in sql:
+            self._crear_resumen()
+        elif 'CREATE TABLE #DeltaEvaluaciones' in sql or 'MERGE #DeltaEvaluaciones' in sql:
+            if 'CREATE TABLE #DeltaEvaluaciones' in sql:
+                self._crear_deltas_resumen()
+            if 'MERGE #DeltaEvaluaciones' in sql:
+                self._acumular_resumen(*parametros)
+        elif 'MERGE dbo.ResumenEvaluaciones' in sql:
+            self._aplicar_resumen()
+        elif 'DELETE FROM dbo.ResumenEvaluaciones WITH (TABLOCKX)' in sql:
+            self._reconstruir_resumen()
+        elif 'sp_CalcularPorcentajeCumplimiento' in sql:
+            self._cursor.execute(SQL_CALCULAR_CUMPLIMIENTO.format(condicion="= ?"), parametros)
+        else:
+            for patron, reemplazo in TRADUCCIONES:
+                sql = patron.sub(reemplazo, sql)
+            sql = re.sub(r"SELECT\s+TOP\s+(\d+)\s+(.*)", r"SELECT \2 LIMIT \1", sql, flags=re.S | re.I)
+            self._cursor.execute(sql, parametros)
+
+    def executemany(self, sql: str, secuencia):
+        for patron, reemplazo in TRADUCCIONES:
+            sql = patron.sub(reemplazo, sql)
+        self._cursor.executemany(sql, [[_parametro(v) for v in fila] for fila in secuencia])
+
+    def fetchone(self):
+        if self._filas is not None:
+            return self._filas.pop(0) if self._filas else None
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        if self._filas is not None:
+            filas, self._filas = self._filas, []
+            return filas
+        return self._cursor.fetchall()
+
+    def fetchmany(self, tamano: int = 1):
+        if self._filas is not None:
+            filas, self._filas = self._filas[:tamano], self._filas[tamano:]
+            return filas
+        return self._cursor.fetchmany(tamano)
+
+    def fetchval(self):
+        fila = self.fetchone()
+        return fila[0] if fila else None
+
+    def close(self):
+        self._cursor.close()
+
+    def _buscar_id(self, consulta: str, parametros: List, mensaje: str) -> int:
+        fila = self._cursor.execute(consulta, parametros).fetchone()
+        if fila is None:
+            raise ErrorSustituto(mensaje)
+        return fila[0]
+
+    def _registrar_evaluacion(self, periodo, docente, asignatura, carrera, facultad, revisado_por, fecha) -> int:
+        """Emulación de sp_RegistrarEvaluacion (devuelve el EvaluacionID)"""
+        periodo_id = self._buscar_id(
+            "SELECT PeriodoID FROM PeriodosAcademicos WHERE Nombre = ?", [periodo],
+            f"Periodo académico no encontrado: {periodo}"
+        )
+        docente_id = self._buscar_id(
+            "SELECT DocenteID FROM Docentes WHERE Nombres || ' ' || Apellidos = ? COLLATE NOCASE", [docente],
+            f"Docente no encontrado: {docente}"
+        )
+        asignatura_id = self._buscar_id(
+            "SELECT AsignaturaID FROM Asignaturas WHERE Nombre = ?", [asignatura],
+            f"Asignatura no encontrada: {asignatura}"
+        )
+        carrera_id = self._buscar_id("""
+            SELECT c.CarreraID FROM Carreras c
+            INNER JOIN Facultades f ON c.FacultadID = f.FacultadID
+            WHERE c.Nombre = ? AND f.Nombre = ? AND c.Estado = 1 AND f.Estado = 1
+        """, [carrera, facultad], f"Carrera no encontrada en la facultad {facultad}: {carrera}")
+
+        existente = self._cursor.execute("""
+            SELECT EvaluacionID FROM Evaluaciones
+            WHERE PeriodoID = ? AND DocenteID = ? AND AsignaturaID = ? AND Estado = 1
+        """, [periodo_id, docente_id, asignatura_id]).fetchone()
+        if existente:
+            raise ErrorSustituto("Ya existe una evaluación para este periodo, docente y asignatura")
+
+        return self._cursor.execute("""
+            INSERT INTO Evaluaciones (DocenteID, PeriodoID, AsignaturaID, CarreraID, RevisadoPor, FechaEvaluacion)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [docente_id, periodo_id, asignatura_id, carrera_id, revisado_por, fecha]).lastrowid
+
+    def _crear_tablas_carga(self):
+        # Sentencias sueltas: executescript confirmaría la transacción en curso
+        for sentencia in (
+            "DROP TABLE IF EXISTS temp.ResultadosCarga",
+            """CREATE TEMP TABLE ResultadosCarga (
+                EvaluacionID INTEGER NOT NULL,
+                Fila INTEGER NOT NULL,
+                ItemNombre TEXT NOT NULL COLLATE NOCASE,
+                Estado TEXT NOT NULL,
+                FechaRevision TEXT NOT NULL,
+                Observaciones TEXT,
+                ItemID INTEGER
+            )""",
+            "DROP TABLE IF EXISTS temp.CumplimientoCarga",
+            """CREATE TEMP TABLE CumplimientoCarga (
+                EvaluacionID INTEGER PRIMARY KEY,
+                Porcentaje REAL NOT NULL
+            )"""
+        ):
+            self._cursor.execute(sentencia)
+
+    def _registrar_resultado(self, evaluacion_id, item, estado, fecha, observaciones):
+        """Emulación de sp_RegistrarResultadosEvaluacion para una fila"""
+        fila = self._cursor.execute(
+            "SELECT MIN(ItemID) FROM ItemsEvaluacion WHERE Nombre = ? COLLATE NOCASE AND Estado = 1", [item]
+        ).fetchone()
+        if fila[0] is None:
+            raise ErrorSustituto(f"Ítem no encontrado: {item}")
+        existente = self._cursor.execute(
+            "SELECT 1 FROM ResultadosEvaluacion WHERE EvaluacionID = ? AND ItemID = ?", [evaluacion_id, fila[0]]
+        ).fetchone()
+        if existente:
+            raise ErrorSustituto(f"Ya existe un resultado para el ítem: {item}")
+        self._cursor.execute("""
+            INSERT INTO ResultadosEvaluacion (EvaluacionID, ItemID, Estado, FechaRevision, Observaciones)
+            VALUES (?, ?, ?, ?, ?)
+        """, [evaluacion_id, fila[0], estado, fecha, observaciones])
+
+    def _registrar_resultados_lote(self, cumplimiento_cliente: bool):
+        """Emulación de SQL_REGISTRAR_RESULTADOS_LOTE y su bloque de cumplimiento"""
+        c = self._cursor
+        filas = c.execute("""
+            SELECT EvaluacionID, ItemNombre, Estado, FechaRevision, Observaciones
+            FROM temp.ResultadosCarga ORDER BY EvaluacionID, Fila
+        """).fetchall()
+        for fila in filas:
+            self._registrar_resultado(*fila)
+        if cumplimiento_cliente:
+            c.execute("""
+                UPDATE Evaluaciones SET PorcentajeCumplimiento = (
+                    SELECT Porcentaje FROM temp.CumplimientoCarga c
+                    WHERE c.EvaluacionID = Evaluaciones.EvaluacionID
+                )
+                WHERE EvaluacionID IN (SELECT EvaluacionID FROM temp.CumplimientoCarga)
+            """)
+        else:
+            c.execute(SQL_CALCULAR_CUMPLIMIENTO.format(
+                condicion="IN (SELECT DISTINCT EvaluacionID FROM temp.ResultadosCarga)"
+            ))
+        c.execute("DROP TABLE temp.ResultadosCarga")
+        c.execute("DROP TABLE temp.CumplimientoCarga")
+
+    def _crear_resumen(self):
+        self._cursor.execute("""
+            CREATE TABLE IF NOT EXISTS ResumenEvaluaciones (
+                PeriodoID INTEGER NOT NULL,
+                FacultadID INTEGER NOT NULL,
+                CarreraID INTEGER NOT NULL,
+                Evaluaciones INTEGER NOT NULL,
+                SumaPorcentaje REAL NOT NULL,
+                PRIMARY KEY (PeriodoID, FacultadID, CarreraID)
+            )
+        """)
+        self._cursor.execute("""
+            CREATE TABLE IF NOT EXISTS ResumenCumplimiento (
+                PeriodoID INTEGER NOT NULL,
+                FacultadID INTEGER NOT NULL,
+                CarreraID INTEGER NOT NULL,
+                CategoriaID INTEGER NOT NULL,
+                Estado TEXT NOT NULL,
+                Items INTEGER NOT NULL,
+                PRIMARY KEY (PeriodoID, FacultadID, CarreraID, CategoriaID, Estado)
+            )
+        """)
+
+    def _insertar_resumen(self, filtro: str, parametros: List, signo: int = 1, prefijo: str = 'Resumen'):
+        """Suma (o resta) a las tablas prefijo* los agregados de las evaluaciones del filtro"""
+        c = self._cursor
+        c.execute(f"""
+            INSERT INTO {prefijo}Evaluaciones (PeriodoID, FacultadID, CarreraID, Evaluaciones, SumaPorcentaje)
+            SELECT e.PeriodoID, c.FacultadID, e.CarreraID, {signo} * COUNT(*),
+                   {signo} * SUM(IFNULL(e.PorcentajeCumplimiento, 0))
+            FROM Evaluaciones e INNER JOIN Carreras c ON e.CarreraID = c.CarreraID
+            WHERE {filtro}
+            GROUP BY e.PeriodoID, c.FacultadID, e.CarreraID
+            ON CONFLICT DO UPDATE SET
+                Evaluaciones = Evaluaciones + excluded.Evaluaciones,
+                SumaPorcentaje = SumaPorcentaje + excluded.SumaPorcentaje
+        """, parametros)
+        c.execute(f"""
+            INSERT INTO {prefijo}Cumplimiento (PeriodoID, FacultadID, CarreraID, CategoriaID, Estado, Items)
+            SELECT e.PeriodoID, c.FacultadID, e.CarreraID, i.CategoriaID, r.Estado, {signo} * COUNT(*)
+            FROM ResultadosEvaluacion r
+            INNER JOIN Evaluaciones e ON r.EvaluacionID = e.EvaluacionID
+            INNER JOIN Carreras c ON e.CarreraID = c.CarreraID
+            INNER JOIN ItemsEvaluacion i ON r.ItemID = i.ItemID
+            WHERE {filtro}
+            GROUP BY e.PeriodoID, c.FacultadID, e.CarreraID, i.CategoriaID, r.Estado
+            ON CONFLICT DO UPDATE SET Items = Items + excluded.Items
+        """, parametros)
+
+    def _existe_tabla(self, nombre: str, temporal: bool = False) -> bool:
+        catalogo = 'sqlite_temp_master' if temporal else 'sqlite_master'
+        return self._cursor.execute(
+            f"SELECT 1 FROM {catalogo} WHERE type = 'table' AND name = ?", [nombre]
+        ).fetchone() is not None
+
+    def _crear_deltas_resumen(self):
+        """Emulación de SQL_CREAR_DELTAS_RESUMEN (temporales de la sesión)"""
+        if not self._existe_tabla('ResumenCumplimiento'):
+            return
+        self._cursor.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS DeltaEvaluaciones (
+                PeriodoID INTEGER NOT NULL,
+                FacultadID INTEGER NOT NULL,
+                CarreraID INTEGER NOT NULL,
+                Evaluaciones INTEGER NOT NULL,
+                SumaPorcentaje REAL NOT NULL,
+                PRIMARY KEY (PeriodoID, FacultadID, CarreraID)
+            )
+        """)
+        self._cursor.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS DeltaCumplimiento (
+                PeriodoID INTEGER NOT NULL,
+                FacultadID INTEGER NOT NULL,
+                CarreraID INTEGER NOT NULL,
+                CategoriaID INTEGER NOT NULL,
+                Estado TEXT NOT NULL,
+                Items INTEGER NOT NULL,
+                PRIMARY KEY (PeriodoID, FacultadID, CarreraID, CategoriaID, Estado)
+            )
+        """)
+
+    def _acumular_resumen(self, signo: int, evaluacion_id: int):
+        """Emulación de SQL_ACUMULAR_RESUMEN (anotación en las temporales de la sesión)"""
+        if self._existe_tabla('DeltaEvaluaciones', temporal=True):
+            self._insertar_resumen("e.EvaluacionID = ?", [evaluacion_id], signo, prefijo='temp.Delta')
+
+    def _aplicar_resumen(self):
+        """Emulación de SQL_APLICAR_RESUMEN (MERGE de las anotaciones en orden de clave)"""
+        c = self._cursor
+        if self._existe_tabla('DeltaEvaluaciones', temporal=True):
+            c.execute("""
+                INSERT INTO ResumenEvaluaciones (PeriodoID, FacultadID, CarreraID, Evaluaciones, SumaPorcentaje)
+                SELECT PeriodoID, FacultadID, CarreraID, Evaluaciones, SumaPorcentaje
+                FROM temp.DeltaEvaluaciones
+                WHERE Evaluaciones <> 0 OR SumaPorcentaje <> 0
+                ORDER BY PeriodoID, FacultadID, CarreraID
+                ON CONFLICT DO UPDATE SET
+                    Evaluaciones = Evaluaciones + excluded.Evaluaciones,
+                    SumaPorcentaje = SumaPorcentaje + excluded.SumaPorcentaje
+            """)
+            c.execute("DELETE FROM ResumenEvaluaciones WHERE Evaluaciones = 0")
+            c.execute("DELETE FROM temp.DeltaEvaluaciones")
+        if self._existe_tabla('DeltaCumplimiento', temporal=True):
+            c.execute("""
+                INSERT INTO ResumenCumplimiento (PeriodoID, FacultadID, CarreraID, CategoriaID, Estado, Items)
+                SELECT PeriodoID, FacultadID, CarreraID, CategoriaID, Estado, Items
+                FROM temp.DeltaCumplimiento
+                WHERE Items <> 0
+                ORDER BY PeriodoID, FacultadID, CarreraID, CategoriaID, Estado
+                ON CONFLICT DO UPDATE SET Items = Items + excluded.Items
+            """)
+            c.execute("DELETE FROM ResumenCumplimiento WHERE Items = 0")
+            c.execute("DELETE FROM temp.DeltaCumplimiento")
+
+    def _reconstruir_resumen(self):
+        self._cursor.execute("DELETE FROM ResumenEvaluaciones")
+        self._cursor.execute("DELETE FROM ResumenCumplimiento")
+        self._insertar_resumen("e.Estado = 1", [])
+
+
+class ConexionSustituta:
+    """Conexión con la interfaz de pyodbc sobre un archivo SQLite"""
+
+    def __init__(self, ruta_bd: str):
+        # El pool y la recarga de catálogos usan las conexiones desde otros hilos
+        self._conn = sqlite3.connect(ruta_bd, timeout=30, check_same_thread=False)
+        self.autocommit = False
+
+    def cursor(self) -> CursorSustituto:
+        return CursorSustituto(self)
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
+
+
+def fabrica_conexiones(ruta_bd: str):
+    """Fábrica de conexiones para EvaluacionDocenteSystem(fabrica_conexion=...)"""
+    return lambda: ConexionSustituta(ruta_bd)
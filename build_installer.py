@@ -21,6 +21,25 @@ def build_executable():
         '--hidden-import=pyodbc',
         '--hidden-import=openpyxl',
         '--hidden-import=evaluacion_docente',  # Agregado
+        '--hidden-import=ingesta_lote',
+        '--hidden-import=pool_conexiones',
+        # Módulos importados de forma diferida por la interfaz y el modo desatendido
+        '--hidden-import=arranque',
+        '--hidden-import=catalogos',
+        '--hidden-import=cumplimiento',
+        '--hidden-import=diario_local',
+        '--hidden-import=explorador',
+        '--hidden-import=exportacion_bi',
+        '--hidden-import=ingesta_desatendida',
+        '--hidden-import=informes_docentes',
+        '--hidden-import=lector_excel',
+        '--hidden-import=manifiesto',
+        '--hidden-import=metricas',
+        '--hidden-import=plantillas',
+        '--hidden-import=prevalidacion',
+        '--hidden-import=registro_grupal',
+        '--hidden-import=resolvedor_nombres',
+        '--hidden-import=resumen_cumplimiento',
         '--path=src',  # Agregado - incluye la carpeta src en el path
         '--add-data=src;src'  # Agregado - incluye los archivos de src
     ])
@@ -1,4 +1,5 @@
-import tkinter as tk
+import argparse
+import multiprocessing
 import sys
 import os
 
@@ -10,16 +11,117 @@ src_dir = os.path.join(current_dir, 'src')
 if src_dir not in sys.path:
     sys.path.insert(0, src_dir)
 
-from src.app_evaluacion import EvaluacionDocenteApp
+# Referencia para medir el arranque (módulo liviano, sin pandas ni pyodbc)
+import arranque
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Sistema de Evaluación Docente")
+    modo = parser.add_mutually_exclusive_group()
+    modo.add_argument('--batch', metavar='DIR', help='Procesa todos los archivos del directorio sin interfaz gráfica')
+    modo.add_argument('--watch', metavar='DIR', help='Vigila el directorio y procesa los archivos nuevos')
+    modo.add_argument('--exportar', metavar='DIR', help='Exporta a Parquet las evaluaciones nuevas o modificadas')
+    modo.add_argument('--sincronizar', action='store_true',
+                      help='Envía al servidor las evaluaciones guardadas en el diario local')
+    modo.add_argument('--informes', metavar='DIR', help='Genera en DIR un informe por docente')
+    modo.add_argument('--plantillas', metavar='ASIGNACIONES',
+                      help='Genera una plantilla prellenada por cada asignación docente/asignatura del archivo')
+    modo.add_argument('--agregados', choices=['reconstruir', 'verificar'],
+                      help='Reconstruye el resumen de cumplimiento para BI o lo verifica contra el historial')
+    parser.add_argument('--workers', type=int, default=None, help='Procesos paralelos de lectura')
+    parser.add_argument('--grupo', type=int, default=None,
+                        help='Archivos por transacción en --batch y --watch (commit en grupo) o en --sincronizar')
+    parser.add_argument('--sin-conexion', action='store_true',
+                        help='Con --batch o --watch, guarda las evaluaciones en el diario local sin usar el servidor')
+    parser.add_argument('--periodo',
+                        help='Con --informes, periodo académico a incluir; con --plantillas, periodo por defecto')
+    parser.add_argument('--facultad', help='Con --informes, facultad a incluir')
+    parser.add_argument('--formato', action='append', choices=['xlsx', 'pdf'],
+                        help='Con --informes, formato de los informes (repetible; por defecto xlsx)')
+    parser.add_argument('--destino', metavar='DIR',
+                        help='Con --plantillas, directorio de salida (por defecto "plantillas" junto al archivo)')
+    parser.add_argument('--resumen', metavar='ARCHIVO', help='Ruta del resumen JSON')
+    parser.add_argument('--intervalo', type=float, default=10.0, help='Segundos entre revisiones en --watch')
+    parser.add_argument('--verificar', action='store_true', help='Con --batch, solo verifica los archivos')
+    parser.add_argument('--reverificar', action='store_true', help='Con --batch, reverifica antes los archivos ya cargados')
+    parser.add_argument('--actualizar', action='store_true',
+                        help='Con --batch o --watch, aplica los libros corregidos a las evaluaciones ya registradas')
+    parser.add_argument('--completa', action='store_true',
+                        help='Con --exportar, reescribe todas las particiones sin usar las firmas guardadas')
+    parser.add_argument('--informe-arranque', metavar='ARCHIVO',
+                        help='Mide el arranque de la interfaz, anexa el informe JSON y cierra la aplicación')
+    return parser.parse_args(argv)
+
+def main_headless(args) -> int:
+    from ingesta_desatendida import (
+        ejecutar_agregados, ejecutar_exportacion, ejecutar_informes, ejecutar_lote, ejecutar_plantillas,
+        ejecutar_sincronizacion, vigilar_directorio
+    )
+
+    if args.exportar:
+        return ejecutar_exportacion(args.exportar, ruta_resumen=args.resumen, completa=args.completa)
+    if args.agregados:
+        return ejecutar_agregados(args.agregados, ruta_resumen=args.resumen)
+    if args.plantillas:
+        return ejecutar_plantillas(
+            args.plantillas,
+            directorio=args.destino,
+            periodo=args.periodo,
+            max_workers=args.workers,
+            ruta_resumen=args.resumen
+        )
+    if args.informes:
+        return ejecutar_informes(
+            args.informes,
+            periodo=args.periodo,
+            facultad=args.facultad,
+            formatos=args.formato,
+            max_workers=args.workers,
+            ruta_resumen=args.resumen
+        )
+    if args.sincronizar:
+        return ejecutar_sincronizacion(ruta_resumen=args.resumen, tamano_lote=args.grupo or 500)
+    if args.batch:
+        return ejecutar_lote(
+            args.batch,
+            max_workers=args.workers,
+            ruta_resumen=args.resumen,
+            tamano_grupo=args.grupo,
+            sin_conexion=args.sin_conexion,
+            solo_verificar=args.verificar,
+            reverificar=args.reverificar,
+            actualizar=args.actualizar
+        )
+    return vigilar_directorio(
+        args.watch,
+        max_workers=args.workers,
+        ruta_resumen=args.resumen,
+        tamano_grupo=args.grupo,
+        sin_conexion=args.sin_conexion,
+        intervalo=args.intervalo,
+        actualizar=args.actualizar
+    )
+
+def main(args):
+    import tkinter as tk
+    from src.app_evaluacion import EvaluacionDocenteApp
+    arranque.registrar_hito('interfaz')
 
-def main():
     try:
         root = tk.Tk()
-        app = EvaluacionDocenteApp(root)
+        app = EvaluacionDocenteApp(root, informe_arranque=args.informe_arranque)
         root.mainloop()
     except Exception as e:
         tk.messagebox.showerror("Error Fatal", f"Error iniciando la aplicación: {str(e)}")
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Necesario para el pool de procesos en el ejecutable de PyInstaller
+    multiprocessing.freeze_support()
+    args = parse_args()
+    modo_desatendido = (
+        args.batch or args.watch or args.exportar or args.sincronizar or args.informes or args.plantillas
+        or args.agregados
+    )
+    if modo_desatendido:
+        sys.exit(main_headless(args))
+    main(args)
\ No newline at end of file
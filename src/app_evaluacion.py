@@ -1,13 +1,24 @@
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+from tkinter import ttk, filedialog, messagebox, simpledialog
 import sys
 import os
+import time
+import queue
+import threading
 from datetime import datetime
-from evaluacion_docente import EvaluacionDocenteSystem
+from typing import Optional
+
+import arranque
+from metricas import formatear_resumen
+
+# Frecuencia de volcado de la cola de mensajes al registro de operaciones
+INTERVALO_COLA_MS = 100
+# Líneas máximas que conserva el registro de operaciones
+MAX_LINEAS_LOG = 5000
 
 
 class EvaluacionDocenteApp:
-    def __init__(self, root):
+    def __init__(self, root, informe_arranque: Optional[str] = None):
         self.root = root
         self.root.title("Sistema de Evaluación Docente - UNIBE")
         self.root.geometry("900x600")
@@ -19,11 +30,94 @@ class EvaluacionDocenteApp:
         self.style.configure('Success.TLabel', foreground='green')
         self.style.configure('Error.TLabel', foreground='red')
         
-        # Inicializar el sistema
-        self.sistema = EvaluacionDocenteSystem()
+        # Cola de eventos de los hilos de trabajo hacia la interfaz
+        self.cola_ui = queue.Queue()
+        self.tarea_activa = None
+        self.cancelar_evento = None
+        
+        # El sistema (pandas, openpyxl, pyodbc) se inicializa en segundo plano
+        # después de mostrar la ventana; ver la propiedad sistema
+        self._sistema = None
+        self._error_sistema = None
+        self._sistema_listo = threading.Event()
+        self.informe_arranque = informe_arranque
         
         # Crear la interfaz
         self.create_widgets()
+        self.root.after(INTERVALO_COLA_MS, self.procesar_cola)
+        # after_idle se ejecuta cuando la ventana ya terminó de dibujarse
+        self.root.after_idle(self.iniciar_sistema)
+
+    def iniciar_sistema(self):
+        """Importa e inicializa el sistema en un hilo de fondo"""
+        arranque.registrar_hito('ventana')
+        self.status_label.config(text="Iniciando el sistema...", style='')
+        
+        def inicializar():
+            try:
+                from evaluacion_docente import EvaluacionDocenteSystem
+                arranque.registrar_hito('modulos')
+                self._sistema = EvaluacionDocenteSystem(notificador=self.notificar_usuario)
+                arranque.registrar_hito('sistema')
+            except Exception as e:
+                self._error_sistema = e
+            finally:
+                self._sistema_listo.set()
+                self.cola_ui.put(('sistema',))
+        
+        threading.Thread(target=inicializar, daemon=True).start()
+
+    def sistema_iniciado(self):
+        """Informa en la interfaz el resultado de la inicialización del sistema"""
+        if self._error_sistema is not None:
+            self.log_message(f"Error iniciando el sistema: {str(self._error_sistema)}", "ERROR")
+            self.status_label.config(text="Error iniciando el sistema", style='Error.TLabel')
+        else:
+            for control in self.controles_sistema:
+                control.config(state=tk.NORMAL)
+            self.status_label.config(text="Listo para procesar archivos", style='Success.TLabel')
+            pendientes = self._sistema.diario.contar()
+            if pendientes:
+                self.log_message(f"{pendientes} evaluaciones del diario local pendientes de sincronizar", "WARNING")
+        
+        informe = arranque.informe()
+        if 'sistema' in informe['hitos']:
+            self.log_message(
+                f"Sistema listo en {informe['hitos']['sistema']:.2f}s "
+                f"(ventana visible en {informe['hitos']['ventana']:.2f}s)"
+            )
+        if self.informe_arranque:
+            arranque.guardar_informe(self.informe_arranque)
+            self.root.after(0, self.root.destroy)
+
+    @property
+    def sistema(self):
+        """Sistema de evaluación.
+
+        Los hilos de fondo esperan a que termine la inicialización; el hilo de la
+        interfaz nunca espera (los controles que usan el sistema siguen
+        deshabilitados hasta sistema_iniciado).
+        """
+        if not self._sistema_listo.is_set():
+            if threading.current_thread() is threading.main_thread():
+                raise RuntimeError("El sistema aún se está iniciando")
+            self._sistema_listo.wait()
+        if self._error_sistema is not None:
+            raise RuntimeError(f"El sistema no pudo iniciarse: {str(self._error_sistema)}")
+        return self._sistema
+
+    def notificar_usuario(self, nivel: str, titulo: str, mensaje: str):
+        """Muestra como diálogo los avisos del sistema"""
+        if threading.current_thread() is not threading.main_thread():
+            # Los diálogos solo pueden abrirse desde el hilo de la interfaz
+            self.cola_ui.put(('notificacion', nivel, titulo, mensaje))
+            return
+        if nivel == "error":
+            messagebox.showerror(titulo, mensaje)
+        elif nivel == "advertencia":
+            messagebox.showwarning(titulo, mensaje)
+        else:
+            messagebox.showinfo(titulo, mensaje)
 
     def create_widgets(self):
         # Frame principal
@@ -55,12 +149,13 @@ class EvaluacionDocenteApp:
         actions_frame.grid(row=1, column=0, pady=10, sticky=(tk.W, tk.E))
         
         # Botones
-        ttk.Button(
+        self.boton_procesar = ttk.Button(
             actions_frame,
             text="Seleccionar Archivos",
             command=self.procesar_archivos,
             width=20
-        ).grid(row=0, column=0, padx=5, pady=5)
+        )
+        self.boton_procesar.grid(row=0, column=0, padx=5, pady=5)
         
         ttk.Button(
             actions_frame,
@@ -76,12 +171,115 @@ class EvaluacionDocenteApp:
             width=20
         ).grid(row=0, column=2, padx=5, pady=5)
 
-        ttk.Button(
+        self.boton_categorias = ttk.Button(
             actions_frame,
             text="Ver Categorías",
             command=self.mostrar_categorias,
             width=20
-        ).grid(row=0, column=3, padx=5, pady=5)
+        )
+        self.boton_categorias.grid(row=0, column=3, padx=5, pady=5)
+        
+        self.boton_verificar = ttk.Button(
+            actions_frame,
+            text="Verificar Archivos",
+            command=self.verificar_archivos,
+            width=20
+        )
+        self.boton_verificar.grid(row=0, column=4, padx=5, pady=5)
+        
+        # Procesos paralelos para la lectura de archivos
+        ttk.Label(actions_frame, text="Procesos paralelos:").grid(row=1, column=0, padx=5, sticky=tk.E)
+        self.procesos_var = tk.IntVar(value=os.cpu_count() or 1)
+        ttk.Spinbox(
+            actions_frame,
+            from_=1,
+            to=max(os.cpu_count() or 1, 1) * 2,
+            textvariable=self.procesos_var,
+            width=5
+        ).grid(row=1, column=1, padx=5, pady=5, sticky=tk.W)
+        
+        # Archivos por transacción (1 = un commit por archivo)
+        grupo_frame = ttk.Frame(actions_frame)
+        grupo_frame.grid(row=1, column=2, padx=5, pady=5)
+        ttk.Label(grupo_frame, text="Archivos por commit:").pack(side=tk.LEFT)
+        self.grupo_var = tk.IntVar(value=1)
+        ttk.Spinbox(grupo_frame, from_=1, to=100, textvariable=self.grupo_var, width=5).pack(side=tk.LEFT, padx=5)
+        
+        self.boton_reverificar = ttk.Button(
+            actions_frame,
+            text="Reverificar Cargados",
+            command=self.reverificar_cargados,
+            width=20
+        )
+        self.boton_reverificar.grid(row=1, column=4, padx=5, pady=5)
+        
+        self.boton_cancelar = ttk.Button(
+            actions_frame,
+            text="Cancelar",
+            command=self.cancelar_tarea,
+            width=20,
+            state=tk.DISABLED
+        )
+        self.boton_cancelar.grid(row=1, column=3, padx=5, pady=5)
+        
+        # Diario local para trabajar sin el servidor
+        self.sin_conexion_var = tk.BooleanVar(value=False)
+        self.casilla_sin_conexion = ttk.Checkbutton(
+            actions_frame,
+            text="Trabajar sin conexión",
+            variable=self.sin_conexion_var,
+            command=self.cambiar_modo_conexion
+        )
+        self.casilla_sin_conexion.grid(row=2, column=0, columnspan=2, padx=5, pady=5, sticky=tk.W)
+        
+        self.boton_informes = ttk.Button(
+            actions_frame,
+            text="Informes por Docente",
+            command=self.generar_informes,
+            width=20
+        )
+        self.boton_informes.grid(row=2, column=2, padx=5, pady=5)
+        
+        self.boton_explorar = ttk.Button(
+            actions_frame,
+            text="Explorar Evaluaciones",
+            command=self.explorar_evaluaciones,
+            width=20
+        )
+        self.boton_explorar.grid(row=2, column=3, padx=5, pady=5)
+        
+        self.boton_plantillas = ttk.Button(
+            actions_frame,
+            text="Generar Plantillas",
+            command=self.generar_plantillas,
+            width=20
+        )
+        self.boton_plantillas.grid(row=3, column=1, padx=5, pady=5)
+        
+        # Libros corregidos de evaluaciones ya registradas: solo se aplican los cambios
+        self.actualizar_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            actions_frame,
+            text="Actualizar existentes",
+            variable=self.actualizar_var
+        ).grid(row=3, column=0, padx=5, pady=5, sticky=tk.W)
+        
+        self.boton_sincronizar = ttk.Button(
+            actions_frame,
+            text="Sincronizar Diario",
+            command=self.sincronizar_diario,
+            width=20
+        )
+        self.boton_sincronizar.grid(row=2, column=4, padx=5, pady=5)
+        
+        # Controles que usan el sistema: deshabilitados hasta que termine de iniciarse
+        self.controles_sistema = (
+            self.boton_procesar, self.boton_verificar, self.boton_reverificar, self.boton_sincronizar,
+            self.boton_informes, self.boton_plantillas, self.boton_categorias, self.boton_explorar,
+            self.casilla_sin_conexion
+        )
+        for control in self.controles_sistema:
+            control.config(state=tk.DISABLED)
         
         # Frame de log
         log_frame = ttk.LabelFrame(main_frame, text="Registro de Operaciones", padding="10")
@@ -97,9 +295,20 @@ class EvaluacionDocenteApp:
         scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         self.log_text['yscrollcommand'] = scrollbar.set
         
+        # Frame de progreso
+        progress_frame = ttk.Frame(main_frame)
+        progress_frame.grid(row=3, column=0, pady=5, sticky=(tk.W, tk.E))
+        progress_frame.columnconfigure(0, weight=1)
+        
+        self.progress_bar = ttk.Progressbar(progress_frame, orient=tk.HORIZONTAL, mode='determinate')
+        self.progress_bar.grid(row=0, column=0, sticky=(tk.W, tk.E))
+        
+        self.progress_label = ttk.Label(progress_frame, text="")
+        self.progress_label.grid(row=0, column=1, padx=10, sticky=tk.E)
+        
         # Frame de estado
         status_frame = ttk.Frame(main_frame)
-        status_frame.grid(row=3, column=0, pady=5, sticky=(tk.W, tk.E))
+        status_frame.grid(row=4, column=0, pady=5, sticky=(tk.W, tk.E))
         
         self.status_label = ttk.Label(
             status_frame,
@@ -116,23 +325,126 @@ class EvaluacionDocenteApp:
         fecha_label.grid(row=0, column=1, sticky=tk.E)
 
     def log_message(self, message: str, level: str = "INFO"):
-        """Agregar mensaje al log con timestamp"""
+        """Agregar mensaje al log con timestamp (se muestra en el siguiente volcado de la cola)"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.log_text.insert(tk.END, f"[{timestamp}] {level}: {message}\n")
+        self.cola_ui.put(('log', f"[{timestamp}] {level}: {message}\n"))
+
+    def procesar_cola(self):
+        """Vuelca en lote los eventos pendientes de los hilos de trabajo"""
+        lineas = []
+        try:
+            while True:
+                evento = self.cola_ui.get_nowait()
+                tipo = evento[0]
+                if tipo == 'log':
+                    lineas.append(evento[1])
+                elif tipo == 'progreso':
+                    self.actualizar_progreso(*evento[1:])
+                elif tipo == 'notificacion':
+                    self.notificar_usuario(*evento[1:])
+                elif tipo == 'sistema':
+                    self.sistema_iniciado()
+                elif tipo == 'fin':
+                    self.escribir_log(lineas)
+                    lineas = []
+                    _, al_terminar, resumen = evento
+                    self.finalizar_tarea()
+                    al_terminar(resumen)
+                elif tipo == 'fallo':
+                    self.escribir_log(lineas)
+                    lineas = []
+                    _, descripcion, mensaje = evento
+                    self.finalizar_tarea()
+                    self.escribir_log([f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] ERROR: {mensaje}\n"])
+                    self.status_label.config(text=f"Error en {descripcion}", style='Error.TLabel')
+                    messagebox.showerror("Error", f"Error en {descripcion}: {mensaje}")
+        except queue.Empty:
+            pass
+        finally:
+            # Reprogramar siempre el volcado aunque falle un evento
+            self.escribir_log(lineas)
+            self.root.after(INTERVALO_COLA_MS, self.procesar_cola)
+
+    def escribir_log(self, lineas):
+        """Inserta varias líneas en el registro y descarta las más antiguas sobre el límite"""
+        if not lineas:
+            return
+        self.log_text.insert(tk.END, "".join(lineas))
+        total_lineas = int(self.log_text.index('end-1c').split('.')[0])
+        if total_lineas > MAX_LINEAS_LOG:
+            self.log_text.delete('1.0', f"{total_lineas - MAX_LINEAS_LOG + 1}.0")
         self.log_text.see(tk.END)
-        self.root.update()
+
+    def actualizar_progreso(self, hechos: int, total: int, inicio: float):
+        """Actualiza la barra de progreso con el rendimiento y el tiempo restante estimado"""
+        self.progress_bar.config(maximum=max(total, 1), value=hechos)
+        transcurrido = time.perf_counter() - inicio
+        tasa = hechos / transcurrido if transcurrido > 0 else 0.0
+        restante = (total - hechos) / tasa if tasa > 0 else 0.0
+        minutos, segundos = divmod(int(restante), 60)
+        self.progress_label.config(
+            text=f"{hechos}/{total} · {tasa:.2f} archivos/s · restante {minutos:02d}:{segundos:02d}"
+        )
+
+    def iniciar_tarea(self, descripcion: str, tarea, al_terminar):
+        """Ejecuta una tarea larga en un hilo de fondo sin bloquear la interfaz.
+
+        tarea recibe el evento de cancelación y su resultado se entrega a
+        al_terminar en el hilo de la interfaz.
+        """
+        if self.tarea_activa is not None and self.tarea_activa.is_alive():
+            messagebox.showwarning("Proceso en curso", "Espere a que termine el proceso actual")
+            return
+        
+        self.cancelar_evento = threading.Event()
+        for boton in (self.boton_procesar, self.boton_verificar, self.boton_reverificar, self.boton_sincronizar,
+                      self.boton_informes, self.boton_plantillas):
+            boton.config(state=tk.DISABLED)
+        self.boton_cancelar.config(state=tk.NORMAL)
+        self.progress_bar.config(value=0)
+        self.progress_label.config(text="")
+        
+        cancelar = self.cancelar_evento
+        
+        def ejecutar():
+            try:
+                self.cola_ui.put(('fin', al_terminar, tarea(cancelar)))
+            except Exception as e:
+                self.cola_ui.put(('fallo', descripcion, str(e)))
+        
+        self.tarea_activa = threading.Thread(target=ejecutar, daemon=True)
+        self.tarea_activa.start()
+
+    def finalizar_tarea(self):
+        """Restablece los controles al terminar una tarea de fondo"""
+        for boton in (self.boton_procesar, self.boton_verificar, self.boton_reverificar, self.boton_sincronizar,
+                      self.boton_informes, self.boton_plantillas):
+            boton.config(state=tk.NORMAL)
+        self.boton_cancelar.config(state=tk.DISABLED)
+        self.tarea_activa = None
+
+    def cancelar_tarea(self):
+        """Solicita la cancelación de la tarea en curso"""
+        if self.cancelar_evento is not None:
+            self.cancelar_evento.set()
+            self.boton_cancelar.config(state=tk.DISABLED)
+            self.log_message("Cancelando: se detendrá tras el archivo en curso", "WARNING")
+
+    def seleccionar_archivos(self):
+        """Diálogo de selección de archivos de evaluación"""
+        return filedialog.askopenfilenames(
+            title='Selecciona los archivos de evaluación',
+            filetypes=[
+                ('Excel con macros', '*.xlsm'),
+                ('Excel files', '*.xlsx'),
+                ('Todos los archivos', '*.*')
+            ]
+        )
 
     def procesar_archivos(self):
         """Procesar archivos de evaluación"""
         try:
-            archivos = filedialog.askopenfilenames(
-                title='Selecciona los archivos de evaluación',
-                filetypes=[
-                    ('Excel con macros', '*.xlsm'),
-                    ('Excel files', '*.xlsx'),
-                    ('Todos los archivos', '*.*')
-                ]
-            )
+            archivos = self.seleccionar_archivos()
             
             if not archivos:
                 return
@@ -140,26 +452,54 @@ class EvaluacionDocenteApp:
             self.status_label.config(text="Procesando archivos...", style='')
             self.log_message(f"Iniciando procesamiento de {len(archivos)} archivos")
             
-            archivos_procesados = 0
-            for archivo in archivos:
-                try:
-                    self.log_message(f"Procesando: {os.path.basename(archivo)}")
-                    if self.sistema.procesar_archivo_excel(archivo):
-                        archivos_procesados += 1
-                        self.log_message(f"Archivo procesado exitosamente: {os.path.basename(archivo)}")
+            inicio = time.perf_counter()
+            hechos = [0]
+            
+            def registrar_resultado(resultado):
+                nombre = os.path.basename(resultado['archivo'])
+                for correccion in resultado.get('correcciones', []):
+                    self.log_message(f"{nombre}: nombre corregido, {correccion}", "WARNING")
+                for evaluacion in resultado.get('evaluaciones', []):
+                    # Libro consolidado: una línea por evaluación
+                    etiqueta = f"{nombre} [{evaluacion['origen']}]"
+                    for correccion in evaluacion['correcciones']:
+                        self.log_message(f"{etiqueta}: nombre corregido, {correccion}", "WARNING")
+                    if evaluacion['exito'] and 'cambios' in evaluacion:
+                        self.log_message(
+                            f"Evaluación actualizada: {etiqueta} (ID {evaluacion['evaluacion_id']}, "
+                            f"{evaluacion['cambios']} ítems modificados, {evaluacion['eliminados']} eliminados)"
+                        )
+                    elif evaluacion['exito']:
+                        self.log_message(f"Evaluación registrada: {etiqueta} (ID {evaluacion['evaluacion_id']})")
+                    elif evaluacion['duplicado']:
+                        self.log_message(f"Evaluación ya registrada anteriormente: {etiqueta}", "WARNING")
                     else:
-                        self.log_message(f"Error procesando archivo: {os.path.basename(archivo)}", "ERROR")
-                except Exception as e:
-                    self.log_message(f"Error en archivo {os.path.basename(archivo)}: {str(e)}", "ERROR")
+                        self.log_message(f"Error en {etiqueta}: {evaluacion['error']}", "ERROR")
+                if resultado['exito'] and resultado.get('en_diario'):
+                    self.log_message(f"Archivo guardado en el diario local (sin conexión): {nombre}", "WARNING")
+                elif resultado['exito'] and 'cambios' in resultado:
+                    self.log_message(
+                        f"Evaluación actualizada: {nombre} ({resultado['cambios']} ítems modificados, "
+                        f"{resultado['eliminados']} eliminados)"
+                    )
+                elif resultado['exito']:
+                    self.log_message(f"Archivo procesado exitosamente: {nombre}")
+                elif resultado['duplicado']:
+                    self.log_message(f"Evaluación ya registrada anteriormente: {nombre}", "WARNING")
+                else:
+                    self.log_message(f"Error procesando archivo {nombre}: {resultado['error']}", "ERROR")
+                hechos[0] += 1
+                self.cola_ui.put(('progreso', hechos[0], len(archivos), inicio))
             
-            self.status_label.config(
-                text=f"Se procesaron {archivos_procesados} de {len(archivos)} archivos",
-                style='Success.TLabel' if archivos_procesados == len(archivos) else 'Error.TLabel'
+            from ingesta_lote import MotorIngestaLote
+            motor = MotorIngestaLote(
+                self.sistema, max_workers=self.procesos_var.get(), tamano_grupo=self.grupo_var.get(),
+                actualizar=self.actualizar_var.get()
             )
-            
-            messagebox.showinfo(
-                "Proceso Completado",
-                f"Se procesaron {archivos_procesados} de {len(archivos)} archivos correctamente"
+            self.iniciar_tarea(
+                "el procesamiento",
+                lambda cancelar: motor.procesar(archivos, callback=registrar_resultado, cancelar=cancelar),
+                self.finalizar_procesamiento
             )
             
         except Exception as e:
@@ -167,6 +507,207 @@ class EvaluacionDocenteApp:
             self.status_label.config(text="Error en el procesamiento", style='Error.TLabel')
             messagebox.showerror("Error", f"Error en el procesamiento: {str(e)}")
 
+    def finalizar_procesamiento(self, resumen):
+        """Muestra el resultado de un lote procesado"""
+        archivos_procesados = resumen['procesados']
+        total = len(resumen['resultados'])
+        self.log_message(
+            f"Lote {'cancelado' if resumen['cancelado'] else 'completado'} en {resumen['duracion']:.1f}s "
+            f"({resumen['archivos_por_segundo']:.2f} archivos/s)"
+        )
+        for linea in formatear_resumen(resumen['tiempos']):
+            self.log_message(linea)
+        
+        self.status_label.config(
+            text=f"Se procesaron {archivos_procesados} de {total} archivos",
+            style='Success.TLabel' if archivos_procesados == total and not resumen['cancelado'] else 'Error.TLabel'
+        )
+        
+        messagebox.showinfo(
+            "Proceso Cancelado" if resumen['cancelado'] else "Proceso Completado",
+            f"Se procesaron {archivos_procesados} de {total} archivos correctamente"
+        )
+
+    def verificar_archivos(self):
+        """Verificar archivos sin registrarlos en la base de datos"""
+        try:
+            archivos = self.seleccionar_archivos()
+            
+            if not archivos:
+                return
+            
+            self.status_label.config(text="Verificando archivos...", style='')
+            self.log_message(f"Iniciando verificación de {len(archivos)} archivos")
+            
+            inicio = time.perf_counter()
+            hechos = [0]
+            
+            def registrar_resultado(resultado):
+                nombre = os.path.basename(resultado['archivo'])
+                for correccion in resultado.get('correcciones', []):
+                    self.log_message(f"{nombre}: nombre corregido, {correccion}", "WARNING")
+                if resultado['valido']:
+                    self.log_message(f"Archivo válido: {nombre}")
+                else:
+                    for error in resultado['errores']:
+                        self.log_message(f"{nombre}: {error}", "ERROR")
+                hechos[0] += 1
+                self.cola_ui.put(('progreso', hechos[0], len(archivos), inicio))
+            
+            from ingesta_lote import MotorIngestaLote
+            motor = MotorIngestaLote(self.sistema, max_workers=self.procesos_var.get())
+            self.iniciar_tarea(
+                "la verificación",
+                lambda cancelar: motor.verificar(archivos, callback=registrar_resultado, cancelar=cancelar),
+                self.finalizar_verificacion
+            )
+            
+        except Exception as e:
+            self.log_message(f"Error: {str(e)}", "ERROR")
+            self.status_label.config(text="Error en la verificación", style='Error.TLabel')
+            messagebox.showerror("Error", f"Error en la verificación: {str(e)}")
+
+    def finalizar_verificacion(self, resumen):
+        """Muestra el resultado de una verificación en seco"""
+        self.status_label.config(
+            text=f"{resumen['validos']} de {resumen['total']} archivos válidos",
+            style='Success.TLabel' if resumen['validos'] == resumen['total'] else 'Error.TLabel'
+        )
+        
+        if resumen['informe']:
+            messagebox.showwarning(
+                "Verificación Completada",
+                f"{resumen['validos']} de {resumen['total']} archivos válidos.\n\n"
+                "Consulte el registro de operaciones para ver los errores."
+            )
+        else:
+            messagebox.showinfo(
+                "Verificación Completada",
+                f"Los {resumen['total']} archivos son válidos"
+            )
+
+    def reverificar_cargados(self):
+        """Contrastar el registro local de archivos cargados con la base de datos"""
+        def finalizar(resultado):
+            self.log_message(
+                f"Registro de archivos reverificado: {resultado['verificadas']} evaluaciones, "
+                f"{resultado['eliminadas']} eliminadas del registro local"
+            )
+        
+        self.log_message("Reverificando archivos cargados...")
+        self.iniciar_tarea(
+            "la reverificación de archivos cargados",
+            lambda cancelar: self.sistema.reverificar_manifiesto(),
+            finalizar
+        )
+
+    def cambiar_modo_conexion(self):
+        """Activa o desactiva el guardado de evaluaciones en el diario local"""
+        self.sistema.modo_sin_conexion = self.sin_conexion_var.get()
+        if self.sistema.modo_sin_conexion:
+            self.log_message("Modo sin conexión: las evaluaciones se guardan en el diario local", "WARNING")
+        else:
+            self.log_message("Modo con conexión: use Sincronizar Diario para enviar las evaluaciones pendientes")
+
+    def sincronizar_diario(self):
+        """Enviar al servidor las evaluaciones guardadas en el diario local"""
+        def finalizar(resumen):
+            self.log_message(
+                f"Diario sincronizado en {resumen['duracion']:.1f}s: {resumen['enviadas']} enviadas, "
+                f"{resumen['duplicadas']} ya registradas, {resumen['fallidas']} con errores, "
+                f"{resumen['pendientes']} pendientes"
+            )
+            for error in resumen['errores']:
+                self.log_message(f"{error['archivo']}: {error['error']}", "ERROR")
+        
+        if self.sin_conexion_var.get():
+            messagebox.showwarning("Modo sin conexión", "Desactive el modo sin conexión para sincronizar")
+            return
+        self.log_message("Sincronizando el diario local...")
+        self.iniciar_tarea(
+            "la sincronización del diario local",
+            lambda cancelar: self.sistema.sincronizar_diario(),
+            finalizar
+        )
+
+    def generar_informes(self):
+        """Generar un informe Excel por docente de un periodo académico"""
+        directorio = filedialog.askdirectory(title='Carpeta donde guardar los informes')
+        if not directorio:
+            return
+        periodo = simpledialog.askstring(
+            "Informes por Docente", "Periodo académico (vacío para todos):", parent=self.root
+        )
+        if periodo is None:
+            return
+        
+        def registrar_informe(resultado):
+            if resultado['error']:
+                self.log_message(f"Error en el informe de {resultado['docente']}: {resultado['error']}", "ERROR")
+        
+        def finalizar(resumen):
+            self.log_message(
+                f"Informes {'cancelados' if resumen['cancelado'] else 'generados'}: {resumen['generados']} de "
+                f"{resumen['docentes']} docentes ({resumen['evaluaciones']} evaluaciones) en "
+                f"{resumen['duracion']:.1f}s ({resumen['docentes_por_segundo']:.2f} docentes/s)"
+            )
+        
+        from informes_docentes import GeneradorInformes
+        generador = GeneradorInformes(self.sistema, directorio, max_workers=self.procesos_var.get())
+        self.log_message(f"Generando informes por docente en {directorio}...")
+        self.iniciar_tarea(
+            "la generación de informes",
+            lambda cancelar: generador.generar(
+                periodo=periodo.strip() or None, callback=registrar_informe, cancelar=cancelar
+            ),
+            finalizar
+        )
+
+    def generar_plantillas(self):
+        """Generar plantillas con los datos generales completos a partir de una lista de asignaciones"""
+        ruta_asignaciones = filedialog.askopenfilename(
+            title='Selecciona la lista de asignaciones docente/asignatura',
+            filetypes=[('Excel files', '*.xlsx'), ('CSV', '*.csv'), ('Todos los archivos', '*.*')]
+        )
+        if not ruta_asignaciones:
+            return
+        periodo = simpledialog.askstring(
+            "Generar Plantillas", "Periodo académico (si la lista no lo indica):", parent=self.root
+        )
+        if periodo is None:
+            return
+        directorio = filedialog.askdirectory(title='Carpeta donde guardar las plantillas')
+        if not directorio:
+            return
+        
+        def registrar_plantilla(resultado):
+            if not resultado['exito']:
+                self.log_message(f"Asignación de la fila {resultado['asignacion']}: {resultado['error']}", "ERROR")
+        
+        def finalizar(resumen):
+            self.log_message(
+                f"Plantillas {'canceladas' if resumen['cancelado'] else 'generadas'}: {resumen['generadas']} de "
+                f"{resumen['asignaciones']} asignaciones en {resumen['duracion']:.1f}s "
+                f"({resumen['plantillas_por_segundo']:.1f} plantillas/s)"
+            )
+        
+        try:
+            from plantillas import GeneradorPlantillas, leer_asignaciones
+            asignaciones = leer_asignaciones(ruta_asignaciones)
+        except Exception as e:
+            self.log_message(f"Error leyendo la lista de asignaciones: {str(e)}", "ERROR")
+            messagebox.showerror("Error", f"Error leyendo la lista de asignaciones: {str(e)}")
+            return
+        generador = GeneradorPlantillas(self.sistema, directorio, max_workers=self.procesos_var.get())
+        self.log_message(f"Generando plantillas para {len(asignaciones)} asignaciones en {directorio}...")
+        self.iniciar_tarea(
+            "la generación de plantillas",
+            lambda cancelar: generador.generar(
+                asignaciones, periodo=periodo.strip() or None, callback=registrar_plantilla, cancelar=cancelar
+            ),
+            finalizar
+        )
+
     def descargar_plantilla(self):
         """Abrir carpeta con la plantilla"""
         try:
@@ -207,60 +748,18 @@ class EvaluacionDocenteApp:
             messagebox.showerror("Error", "No se pudo acceder al manual")
 
     def mostrar_categorias(self):
-        """Muestra una ventana con las categorías disponibles"""
+        """Muestra las categorías disponibles en el explorador"""
+        self.abrir_explorador('categorias')
+
+    def explorar_evaluaciones(self):
+        """Muestra las evaluaciones registradas por periodo y facultad"""
+        self.abrir_explorador('evaluaciones')
+
+    def abrir_explorador(self, pestana: str):
+        """Abre el explorador; los datos se cargan en segundo plano al expandir cada nodo"""
         try:
-            ventana = tk.Toplevel(self.root)
-            ventana.title("Categorías de Evaluación")
-            ventana.geometry("800x600")
-            
-            # Frame principal
-            main_frame = ttk.Frame(ventana, padding="10")
-            main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-            
-            # Título
-            ttk.Label(
-                main_frame,
-                text="Categorías y sus Ítems de Evaluación",
-                style='SubHeader.TLabel'
-            ).grid(row=0, column=0, pady=10)
-            
-            # Crear Treeview
-            tree = ttk.Treeview(main_frame, columns=("Items"), show="tree headings")
-            tree.heading("#0", text="Categoría")
-            tree.heading("Items", text="Ítems de Evaluación")
-            tree.column("#0", width=200)
-            tree.column("Items", width=550)
-            
-            # Obtener categorías del sistema
-            categorias = self.sistema.obtener_categorias_items()
-            
-            # Llenar el Treeview
-            for categoria, items in categorias.items():
-                categoria_id = tree.insert("", "end", text=categoria)
-                for item in items:
-                    tree.insert(categoria_id, "end", values=(item,))
-            
-            # Agregar scrollbar
-            scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=tree.yview)
-            tree.configure(yscrollcommand=scrollbar.set)
-            
-            # Grid
-            tree.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-            scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
-            
-            # Configurar expansión
-            main_frame.columnconfigure(0, weight=1)
-            main_frame.rowconfigure(1, weight=1)
-            ventana.columnconfigure(0, weight=1)
-            ventana.rowconfigure(0, weight=1)
-            
-            # Botón cerrar
-            ttk.Button(
-                main_frame,
-                text="Cerrar",
-                command=ventana.destroy
-            ).grid(row=2, column=0, pady=10)
-            
+            from explorador import ExploradorEvaluaciones
+            ExploradorEvaluaciones(self.root, lambda: self.sistema, self.log_message, pestana=pestana)
         except Exception as e:
-            self.log_message(f"Error mostrando categorías: {str(e)}", "ERROR")
-            messagebox.showerror("Error", f"Error mostrando categorías: {str(e)}")
\ No newline at end of file
+            self.log_message(f"Error abriendo el explorador: {str(e)}", "ERROR")
+            messagebox.showerror("Error", f"Error abriendo el explorador: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,66 @@
+import os
+import sys
+import json
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+# Referencia de tiempo tomada al importar este módulo (primer import de main.py)
+_INICIO = time.perf_counter()
+_hitos: Dict[str, float] = {}
+
+
+def _segundos_previos() -> Optional[float]:
+    """Segundos entre la creación del proceso y la importación de este módulo.
+
+    Incluye el arranque del intérprete (y del cargador de PyInstaller en el
+    ejecutable). Devuelve None si el sistema operativo no lo permite.
+    """
+    try:
+        if sys.platform == 'win32':
+            import ctypes
+            from ctypes import wintypes
+            creacion, salida, kernel, usuario = (wintypes.FILETIME() for _ in range(4))
+            proceso = ctypes.windll.kernel32.GetCurrentProcess()
+            if not ctypes.windll.kernel32.GetProcessTimes(
+                proceso, ctypes.byref(creacion), ctypes.byref(salida), ctypes.byref(kernel), ctypes.byref(usuario)
+            ):
+                return None
+            # FILETIME: intervalos de 100 ns desde 1601-01-01
+            creado = ((creacion.dwHighDateTime << 32) + creacion.dwLowDateTime) / 1e7 - 11644473600
+            return time.time() - creado - (time.perf_counter() - _INICIO)
+        if os.path.exists('/proc/self/stat'):
+            with open('/proc/self/stat') as f:
+                inicio_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+            with open('/proc/uptime') as f:
+                uptime = float(f.read().split()[0])
+            edad = uptime - inicio_ticks / os.sysconf('SC_CLK_TCK')
+            return edad - (time.perf_counter() - _INICIO)
+    except Exception:
+        return None
+    return None
+
+
+_PREVIOS = _segundos_previos()
+
+
+def registrar_hito(nombre: str):
+    """Marca el momento en que se alcanza una etapa del arranque (solo la primera vez)"""
+    _hitos.setdefault(nombre, time.perf_counter() - _INICIO)
+
+
+def informe() -> Dict:
+    """Tiempos de arranque en segundos desde la importación de main.py"""
+    return {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'ejecutable': bool(getattr(sys, 'frozen', False)),
+        'antes_de_main': round(_PREVIOS, 3) if _PREVIOS is not None else None,
+        'hitos': {nombre: round(segundos, 3) for nombre, segundos in _hitos.items()}
+    }
+
+
+def guardar_informe(ruta_archivo: str):
+    """Anexa el informe de arranque como una línea JSON"""
+    os.makedirs(os.path.dirname(os.path.abspath(ruta_archivo)), exist_ok=True)
+    with open(ruta_archivo, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(informe(), ensure_ascii=False) + '\n')
@@ -0,0 +1,328 @@
+import os
+import json
+import time
+import logging
+import threading
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+
+def normalizar_nombre(nombre: str) -> str:
+    """Clave de búsqueda: sin tildes, sin distinguir mayúsculas y con espacios simples"""
+    texto = unicodedata.normalize('NFKD', str(nombre))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return ' '.join(texto.casefold().split())
+
+
+def clave_exacta(nombre: str) -> str:
+    """Clave equivalente a la comparación del servidor (sin distinguir mayúsculas)"""
+    return str(nombre).strip().casefold()
+
+
+# Segundos mínimos entre recargas provocadas por nombres ausentes de la caché
+RECARGA_MINIMA = 30.0
+
+
+# Tablas de referencia sin jerarquía: tipo -> consulta (ID, Nombre). Un nombre
+# puede repetirse (dos docentes homónimos): se conservan todos sus IDs.
+CONSULTAS_REFERENCIAS = {
+    'docentes': "SELECT DocenteID, Nombres + ' ' + Apellidos FROM Docentes ORDER BY DocenteID",
+    'asignaturas': "SELECT AsignaturaID, Nombre FROM Asignaturas ORDER BY AsignaturaID",
+    'periodos': "SELECT PeriodoID, Nombre FROM PeriodosAcademicos ORDER BY PeriodoID"
+}
+
+
+def _indexar(facultades: Dict[str, List[str]], categorias: Dict[str, List[str]],
+             referencias: Dict[str, Dict[str, List[int]]], cargado_en: Optional[float]) -> Dict:
+    """Catálogos y sus índices por nombre normalizado, listos para publicar juntos"""
+    # Índices con la misma semántica de comparación que el servidor: nombre -> IDs
+    indices_exactos = {}
+    for tipo, nombres in referencias.items():
+        indice = {}
+        for nombre, identificadores in nombres.items():
+            if not isinstance(identificadores, list):
+                # Instantánea anterior, con un solo ID por nombre
+                identificadores = [identificadores]
+            indice.setdefault(clave_exacta(nombre), []).extend(identificadores)
+        indices_exactos[tipo] = indice
+    indices_exactos['facultades'] = {clave_exacta(f) for f in facultades}
+    indices_exactos['carreras'] = {
+        (clave_exacta(f), clave_exacta(c)) for f, carreras in facultades.items() for c in carreras
+    }
+    indices_exactos['items'] = {
+        clave_exacta(item) for items in categorias.values() for item in items
+    }
+    return {
+        'facultades': facultades,
+        'categorias': categorias,
+        'referencias': referencias,
+        'indice_facultades': {normalizar_nombre(f): f for f in facultades},
+        'indice_categorias': {normalizar_nombre(c): c for c in categorias},
+        'indice_items': {
+            normalizar_nombre(item): (categoria, item)
+            for categoria, items in categorias.items()
+            for item in items
+        },
+        'indices_exactos': indices_exactos,
+        'cargado_en': cargado_en
+    }
+
+
+class CatalogoCache:
+    """Caché en memoria de facultades, carreras, categorías, ítems y datos de referencia.
+
+    Los catálogos (incluidos docentes, asignaturas y periodos) se cargan con una
+    consulta por tabla y se guardan en una instantánea
+    JSON para que la aplicación arranque con datos aunque la base de datos aún no
+    haya respondido. Al superar ttl segundos se sirven los datos vigentes mientras
+    se refrescan en segundo plano; invalidar() obliga a recargarlos.
+    """
+
+    def __init__(self, sistema, ttl: float = 600.0, ruta_snapshot: Optional[str] = None):
+        self.sistema = sistema
+        self.ttl = ttl
+        self.ruta_snapshot = ruta_snapshot
+        self.logger = logging.getLogger(__name__)
+        # Reentrante: recargar y la primera carga lo mantienen mientras se publica
+        self._lock = threading.RLock()
+        self._refrescando = False
+        # Catálogos e índices vigentes; se reemplazan juntos (ver _publicar)
+        self._datos = _indexar({}, {}, {tipo: {} for tipo in CONSULTAS_REFERENCIAS}, None)
+        self._cargar_snapshot()
+
+    def _publicar(self, datos: Dict):
+        """Reemplaza catálogos e índices con una sola asignación.
+
+        Los lectores toman self._datos una vez por consulta, por lo que nunca
+        combinan índices de dos cargas distintas.
+        """
+        with self._lock:
+            self._datos = datos
+
+    def _cargar_snapshot(self):
+        """Carga la instantánea en disco, si existe, para arrancar con la caché caliente"""
+        if not self.ruta_snapshot or not os.path.exists(self.ruta_snapshot):
+            return
+        try:
+            with open(self.ruta_snapshot, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            self._publicar(_indexar(
+                snapshot['facultades'],
+                snapshot['categorias'],
+                snapshot['referencias'],
+                snapshot['cargado_en']
+            ))
+            self.logger.info("Catálogos cargados desde la instantánea local")
+        except Exception as e:
+            self.logger.warning(f"No se pudo leer la instantánea de catálogos: {str(e)}")
+
+    def _guardar_snapshot(self, datos: Dict):
+        """Escribe la instantánea de forma atómica"""
+        if not self.ruta_snapshot:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.ruta_snapshot), exist_ok=True)
+            temporal = self.ruta_snapshot + '.tmp'
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'cargado_en': datos['cargado_en'],
+                    'facultades': datos['facultades'],
+                    'categorias': datos['categorias'],
+                    'referencias': datos['referencias']
+                }, f, ensure_ascii=False)
+            os.replace(temporal, self.ruta_snapshot)
+        except Exception as e:
+            self.logger.warning(f"No se pudo guardar la instantánea de catálogos: {str(e)}")
+
+    def _cargar_desde_bd(self):
+        """Consulta todos los catálogos activos con una consulta por tabla.
+
+        Los índices se construyen fuera del candado y se publican al final, de
+        modo que un refresco en segundo plano no interrumpe a los lectores.
+        """
+        duraciones = {}
+        with self.sistema.pool.conexion() as conn:
+            cursor = conn.cursor()
+            inicio = time.perf_counter()
+            cursor.execute("""
+                SELECT f.Nombre, c.Nombre
+                FROM Facultades f
+                LEFT JOIN Carreras c ON c.FacultadID = f.FacultadID AND c.Estado = 1
+                WHERE f.Estado = 1
+                ORDER BY f.Nombre, c.Nombre
+            """)
+            facultades = {}
+            for facultad, carrera in cursor.fetchall():
+                carreras = facultades.setdefault(facultad, [])
+                if carrera is not None:
+                    carreras.append(carrera)
+            duraciones['facultades'] = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            cursor.execute("""
+                SELECT
+                    c.Nombre as Categoria,
+                    i.Nombre as Item
+                FROM CategoriasEvaluacion c
+                INNER JOIN ItemsEvaluacion i ON c.CategoriaID = i.CategoriaID
+                WHERE c.Estado = 1 AND i.Estado = 1
+                ORDER BY c.Orden, i.Orden
+            """)
+            categorias = {}
+            for categoria, item in cursor.fetchall():
+                categorias.setdefault(categoria, []).append(item)
+            duraciones['categorias'] = time.perf_counter() - inicio
+
+            referencias = {}
+            for tipo, consulta in CONSULTAS_REFERENCIAS.items():
+                inicio = time.perf_counter()
+                cursor.execute(consulta)
+                referencias[tipo] = {}
+                for identificador, nombre in cursor.fetchall():
+                    if nombre is not None:
+                        referencias[tipo].setdefault(nombre.strip(), []).append(identificador)
+                duraciones[tipo] = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        datos = _indexar(facultades, categorias, referencias, time.time())
+        self._publicar(datos)
+        self._guardar_snapshot(datos)
+        duraciones['indexacion'] = time.perf_counter() - inicio
+        self.logger.info("Catálogos actualizados desde la base de datos")
+
+        metricas = getattr(self.sistema, 'metricas', None)
+        if metricas is not None:
+            metricas.consulta(
+                'catalogos', duraciones,
+                filas={tipo: len(nombres) for tipo, nombres in referencias.items()}
+            )
+
+    def _refrescar_en_segundo_plano(self):
+        """Recarga los catálogos sin bloquear a quien los consulta"""
+        try:
+            self._cargar_desde_bd()
+        except Exception as e:
+            # Sin base de datos se sigue usando la copia anterior
+            self.logger.warning(f"No se pudieron refrescar los catálogos: {str(e)}")
+        finally:
+            self._refrescando = False
+
+    def _asegurar_vigente(self):
+        """Carga los catálogos si no existen y los refresca en segundo plano al caducar"""
+        cargado_en = self._datos['cargado_en']
+        if cargado_en is None:
+            with self._lock:
+                if self._datos['cargado_en'] is None:
+                    self._cargar_desde_bd()
+            return
+
+        if time.time() - cargado_en >= self.ttl:
+            with self._lock:
+                if self._refrescando:
+                    return
+                self._refrescando = True
+            threading.Thread(target=self._refrescar_en_segundo_plano, daemon=True).start()
+
+    def invalidar(self):
+        """Descarta la caché en memoria y la instantánea en disco"""
+        with self._lock:
+            self._publicar(_indexar({}, {}, {tipo: {} for tipo in CONSULTAS_REFERENCIAS}, None))
+            if self.ruta_snapshot and os.path.exists(self.ruta_snapshot):
+                os.remove(self.ruta_snapshot)
+
+    def facultades(self) -> List[str]:
+        """Nombres de las facultades activas"""
+        self._asegurar_vigente()
+        return list(self._datos['facultades'])
+
+    def carreras_por_facultad(self, facultad: str) -> List[str]:
+        """Carreras activas de una facultad, buscada por nombre normalizado"""
+        self._asegurar_vigente()
+        datos = self._datos
+        nombre = datos['indice_facultades'].get(normalizar_nombre(facultad))
+        return list(datos['facultades'].get(nombre, []))
+
+    def categorias_items(self) -> Dict[str, List[str]]:
+        """Categorías activas con sus ítems, en el orden configurado"""
+        self._asegurar_vigente()
+        return {categoria: list(items) for categoria, items in self._datos['categorias'].items()}
+
+    def items_por_categoria(self, categoria: str) -> List[str]:
+        """Ítems de una categoría, buscada por nombre normalizado"""
+        self._asegurar_vigente()
+        datos = self._datos
+        nombre = datos['indice_categorias'].get(normalizar_nombre(categoria))
+        return list(datos['categorias'].get(nombre, []))
+
+    def buscar_facultad(self, nombre: str) -> Optional[str]:
+        """Nombre oficial de una facultad a partir de un nombre normalizable"""
+        self._asegurar_vigente()
+        return self._datos['indice_facultades'].get(normalizar_nombre(nombre))
+
+    def buscar_item(self, nombre: str) -> Optional[Tuple[str, str]]:
+        """(categoría, ítem) oficiales de un ítem a partir de un nombre normalizable"""
+        self._asegurar_vigente()
+        return self._datos['indice_items'].get(normalizar_nombre(nombre))
+
+    def antiguedad(self) -> Optional[float]:
+        """Segundos desde la última carga de los catálogos"""
+        cargado_en = self._datos['cargado_en']
+        if cargado_en is None:
+            return None
+        return time.time() - cargado_en
+
+    def recargar(self):
+        """Recarga los catálogos desde la base de datos de forma inmediata"""
+        with self._lock:
+            self._cargar_desde_bd()
+
+    def existe(self, tipo: str, nombre: str) -> bool:
+        """Indica si un nombre existe en una tabla de referencia con la comparación del servidor.
+
+        tipo es 'docentes', 'asignaturas', 'periodos', 'facultades' o 'items'.
+        """
+        self._asegurar_vigente()
+        return clave_exacta(nombre) in self._datos['indices_exactos'].get(tipo, ())
+
+    def existe_carrera(self, facultad: str, carrera: str) -> bool:
+        """Indica si la carrera pertenece a la facultad indicada"""
+        self._asegurar_vigente()
+        return (clave_exacta(facultad), clave_exacta(carrera)) in self._datos['indices_exactos'].get('carreras', ())
+
+    def id_referencia(self, tipo: str, nombre: str, recargar: bool = False) -> Optional[int]:
+        """ID de un docente, asignatura o periodo a partir de su nombre.
+
+        Con recargar, un nombre ausente provoca una recarga inmediata de los
+        catálogos (como máximo una cada RECARGA_MINIMA segundos) antes de darlo
+        por inexistente. Un nombre que corresponde a varios registros lanza
+        ValueError en lugar de elegir uno de ellos.
+        """
+        self._asegurar_vigente()
+        if tipo not in self._datos['referencias']:
+            return None
+        identificadores = self._datos['indices_exactos'].get(tipo, {}).get(clave_exacta(nombre))
+        if not identificadores and recargar and (self.antiguedad() or 0.0) >= RECARGA_MINIMA:
+            self.recargar()
+            identificadores = self._datos['indices_exactos'].get(tipo, {}).get(clave_exacta(nombre))
+        if not identificadores:
+            return None
+        if len(identificadores) > 1:
+            raise ValueError(
+                f"Nombre de {tipo[:-1]} ambiguo: '{nombre}' corresponde a los registros "
+                f"{', '.join(str(i) for i in identificadores)}"
+            )
+        return identificadores[0]
+
+    def version(self) -> Optional[float]:
+        """Marca de la última carga, para reconstruir estructuras derivadas"""
+        return self._datos['cargado_en']
+
+    def nombres_referencia(self, tipo: str) -> List[str]:
+        """Nombres de una tabla de referencia ('docentes', 'asignaturas' o 'periodos')"""
+        self._asegurar_vigente()
+        return list(self._datos['referencias'].get(tipo, {}))
+
+    def carreras(self) -> List[str]:
+        """Carreras activas de todas las facultades"""
+        self._asegurar_vigente()
+        return list(dict.fromkeys(c for carreras in self._datos['facultades'].values() for c in carreras))
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+from typing import List, Tuple
+
+# Peso de cada estado en el porcentaje de cumplimiento ('No Aplica' no cuenta).
+# Supuestos: la definición de sp_CalcularPorcentajeCumplimiento no está en este
+# repositorio; se copiaron de la regla que emula benchmarks/sustituto_sqlite.py.
+# Confirmarlos con recalcular_cumplimiento(verificar_paridad=True) contra la base
+# real antes de activar cumplimiento_cliente.
+PESOS_ESTADO = {
+    'Cumplimiento satisfactorio': 1.0,
+    'Cumplimiento parcial': 0.5,
+    'Incumplimiento': 0.0,
+    'No Aplica': np.nan
+}
+
+
+def acumular_estado(acumulado: List[float], estado: str, items: int = 1) -> bool:
+    """Suma el peso de un estado a acumulado ([suma, aplicables]).
+
+    Es la única regla de pesos del lado del cliente: los estados 'No Aplica' o
+    desconocidos no cuentan y devuelven False.
+    """
+    peso = PESOS_ESTADO.get(estado, np.nan)
+    if peso != peso:
+        return False
+    acumulado[0] += peso * items
+    acumulado[1] += items
+    return True
+
+
+def porcentaje_acumulado(acumulado: List[float]) -> float:
+    """Porcentaje de un acumulado [suma, aplicables] (0 si no hay ítems aplicables)"""
+    suma, aplicables = acumulado
+    return round(100 * suma / aplicables, 2) if aplicables else 0.0
+
+
+def calcular_cumplimiento(resultados: pd.DataFrame) -> Tuple[pd.Series, pd.DataFrame]:
+    """Calcula el porcentaje de cumplimiento de muchas evaluaciones en una pasada.
+
+    resultados tiene las columnas evaluacion_id, categoria y estado (una fila
+    por ítem). Devuelve el porcentaje por evaluación y un DataFrame con el
+    porcentaje, los ítems aplicables y los ítems 'No Aplica' por evaluación y
+    categoría. Las evaluaciones sin ítems aplicables quedan en 0.
+    """
+    pesos = resultados['estado'].map(PESOS_ESTADO)
+    datos = pd.DataFrame({
+        'evaluacion_id': resultados['evaluacion_id'].to_numpy(),
+        'categoria': resultados['categoria'].to_numpy(),
+        'peso': pesos.to_numpy(dtype=float),
+        'aplica': pesos.notna().to_numpy()
+    })
+
+    por_evaluacion = datos.groupby('evaluacion_id', sort=False)
+    totales = (por_evaluacion['peso'].mean() * 100).fillna(0.0).round(2)
+    totales.name = 'porcentaje'
+
+    por_categoria = datos.groupby(['evaluacion_id', 'categoria'], sort=False, dropna=False).agg(
+        porcentaje=('peso', 'mean'),
+        aplicables=('aplica', 'sum'),
+        items=('aplica', 'size')
+    )
+    por_categoria['porcentaje'] = (por_categoria['porcentaje'] * 100).fillna(0.0).round(2)
+    por_categoria['no_aplica'] = por_categoria['items'] - por_categoria['aplicables']
+    return totales, por_categoria.drop(columns='items').reset_index()
+
+
+def cumplimiento_evaluacion(resultados: List[Tuple]) -> float:
+    """Porcentaje de cumplimiento de una evaluación extraída de un archivo.
+
+    Con las decenas de ítems de un libro un recorrido simple es más rápido que
+    construir un DataFrame; el resultado coincide con calcular_cumplimiento.
+    """
+    total = [0.0, 0]
+    for _, estado, _, _ in resultados:
+        acumular_estado(total, estado)
+    return porcentaje_acumulado(total)
@@ -0,0 +1,149 @@
+import os
+import json
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from catalogos import clave_exacta
+
+# Campos de la evaluación extraída que se guardan en el diario
+CAMPOS_DIARIO = [
+    'archivo', 'hash_contenido', 'origen', 'periodo_academico', 'facultad', 'carrera', 'revisado_por',
+    'asignatura', 'nombre_docente', 'fecha_evaluacion', 'resultados', 'cumplimiento', 'correcciones'
+]
+
+
+def _serializar(datos: Dict) -> str:
+    """JSON de una evaluación extraída; las fechas se guardan en ISO 8601"""
+    guardados = {campo: datos.get(campo) for campo in CAMPOS_DIARIO}
+    guardados['fecha_evaluacion'] = datos['fecha_evaluacion'].isoformat()
+    guardados['resultados'] = [
+        [item, estado, fecha.isoformat() if fecha is not None else None, observaciones]
+        for item, estado, fecha, observaciones in datos['resultados']
+    ]
+    return json.dumps(guardados, ensure_ascii=False)
+
+
+def _deserializar(texto: str) -> Dict:
+    datos = json.loads(texto)
+    datos['fecha_evaluacion'] = datetime.fromisoformat(datos['fecha_evaluacion'])
+    datos['resultados'] = [
+        (item, estado, datetime.fromisoformat(fecha) if fecha else None, observaciones)
+        for item, estado, fecha, observaciones in datos['resultados']
+    ]
+    datos['duraciones'] = {}
+    return datos
+
+
+class DiarioIngesta:
+    """Diario local (SQLite) de evaluaciones validadas pendientes de enviar al servidor.
+
+    Se usa cuando SQL Server no está disponible o cuando se trabaja sin conexión
+    a propósito. Cada entrada guarda la evaluación ya extraída y validada; el
+    hash de contenido es único, por lo que encolar dos veces el mismo archivo no
+    duplica la entrada. sincronizar_diario las envía luego en lotes grandes.
+    """
+
+    def __init__(self, ruta_bd: str):
+        self.ruta_bd = ruta_bd
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(ruta_bd), exist_ok=True)
+        self._conn = sqlite3.connect(ruta_bd, check_same_thread=False)
+        self._conn.executescript("""
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS pendientes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                hash TEXT NOT NULL UNIQUE,
+                archivo TEXT NOT NULL,
+                periodo TEXT NOT NULL,
+                docente TEXT NOT NULL,
+                asignatura TEXT NOT NULL,
+                datos TEXT NOT NULL,
+                encolado_en TEXT NOT NULL,
+                intentos INTEGER NOT NULL DEFAULT 0,
+                ultimo_error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS ix_pendientes_identidad
+                ON pendientes (periodo, docente, asignatura);
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def _identidad(datos: Dict):
+        """Identidad normalizada de una evaluación (la misma que usa el manifiesto)"""
+        return (
+            clave_exacta(datos['periodo_academico']),
+            clave_exacta(datos['nombre_docente']),
+            clave_exacta(datos['asignatura'])
+        )
+
+    def encolar(self, datos: Dict) -> int:
+        """Guarda una evaluación validada y devuelve el id de su entrada en el diario"""
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR IGNORE INTO pendientes (hash, archivo, periodo, docente, asignatura, datos, encolado_en)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (datos['hash_contenido'], os.path.abspath(datos['archivo'])) + self._identidad(datos) +
+                (_serializar(datos), datetime.now().isoformat(timespec='seconds'))
+            )
+            self._conn.commit()
+            return self._conn.execute(
+                "SELECT id FROM pendientes WHERE hash = ?", (datos['hash_contenido'],)
+            ).fetchone()[0]
+
+    def buscar_identidad(self, datos: Dict) -> Optional[int]:
+        """Entrada pendiente con el mismo periodo, docente y asignatura"""
+        with self._lock:
+            fila = self._conn.execute(
+                "SELECT id FROM pendientes WHERE periodo = ? AND docente = ? AND asignatura = ?",
+                self._identidad(datos)
+            ).fetchone()
+        return fila[0] if fila else None
+
+    def contar(self) -> int:
+        """Cantidad de evaluaciones pendientes de sincronizar"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pendientes").fetchone()[0]
+
+    def iterar_lotes(self, tamano_lote: int) -> Iterator[List[Dict]]:
+        """Genera las entradas pendientes en lotes, en orden de llegada.
+
+        Cada entrada es la evaluación con la clave 'id_diario'. Se recorren por id
+        creciente, así una entrada que falla no se vuelve a leer en la misma pasada.
+        """
+        ultimo_id = 0
+        while True:
+            with self._lock:
+                filas = self._conn.execute(
+                    "SELECT id, datos FROM pendientes WHERE id > ? ORDER BY id LIMIT ?",
+                    (ultimo_id, tamano_lote)
+                ).fetchall()
+            if not filas:
+                return
+            ultimo_id = filas[-1][0]
+            lote = []
+            for id_diario, texto in filas:
+                datos = _deserializar(texto)
+                datos['id_diario'] = id_diario
+                lote.append(datos)
+            yield lote
+
+    def eliminar(self, ids: List[int]):
+        """Quita del diario las entradas ya enviadas al servidor"""
+        with self._lock:
+            self._conn.executemany("DELETE FROM pendientes WHERE id = ?", [(i,) for i in ids])
+            self._conn.commit()
+
+    def marcar_error(self, errores: Dict[int, str]):
+        """Anota el error del último intento de cada entrada que sigue pendiente"""
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE pendientes SET intentos = intentos + 1, ultimo_error = ? WHERE id = ?",
+                [(error, i) for i, error in errores.items()]
+            )
+            self._conn.commit()
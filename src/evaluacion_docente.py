@@ -1,15 +1,395 @@
 import pandas as pd
-import pyodbc
 from datetime import datetime
 import os
+import time
 import logging
-from typing import Optional, List, Dict, Tuple
-from tkinter import messagebox
+from typing import Optional, List, Dict, Tuple, Callable, Iterator
+from contextlib import contextmanager
+
+from catalogos import CatalogoCache, clave_exacta
+from cumplimiento import calcular_cumplimiento, cumplimiento_evaluacion
+from diario_local import DiarioIngesta
+from lector_excel import LibroConsolidado, iterar_evaluaciones_libro, leer_libro_evaluacion
+from manifiesto import ManifiestoIngesta, calcular_hash, hash_evaluacion
+from metricas import RegistroMetricas, medir
+from pool_conexiones import PoolConexiones
+from prevalidacion import prevalidar_evaluacion
+from registro_grupal import RegistroGrupal
+from resolvedor_nombres import ResolvedorReferencias
+from resumen_cumplimiento import SQL_ACUMULAR_RESUMEN, SQL_APLICAR_RESUMEN, SQL_CREAR_DELTAS_RESUMEN
+
+try:
+    import pyodbc
+except ImportError:
+    # Sin controlador ODBC instalado solo se puede usar una fabrica_conexion propia
+    pyodbc = None
+
+# Estados válidos para la evaluación
+ESTADOS_VALIDOS = [
+    'Cumplimiento satisfactorio',
+    'Cumplimiento parcial',
+    'Incumplimiento',
+    'No Aplica'
+]
+
+# Campos obligatorios de la hoja DATOS_GENERALES (fila -> campo, columna B)
+CAMPOS_REQUERIDOS = {
+    2: "Periodo Académico",
+    3: "Facultad",
+    4: "Carrera",
+    5: "Revisado Por",
+    6: "Asignatura",
+    7: "Nombre del Docente"
+}
+
+# Segundos sin volver a intentar la conexión tras encontrar el servidor inaccesible
+ESPERA_RECONEXION = 60.0
+
+
+# Tabla temporal de carga de resultados (una fila por ítem y evaluación)
+SQL_CREAR_CARGA_RESULTADOS = """
+    IF OBJECT_ID('tempdb..#ResultadosCarga') IS NOT NULL DROP TABLE #ResultadosCarga;
+    CREATE TABLE #ResultadosCarga (
+        EvaluacionID INT NOT NULL,
+        Fila INT NOT NULL,
+        ItemNombre NVARCHAR(500) NOT NULL,
+        Estado NVARCHAR(100) NOT NULL,
+        FechaRevision DATETIME NULL,
+        Observaciones NVARCHAR(MAX) NULL,
+        ItemID INT NULL
+    );
+    IF OBJECT_ID('tempdb..#CumplimientoCarga') IS NOT NULL DROP TABLE #CumplimientoCarga;
+    CREATE TABLE #CumplimientoCarga (
+        EvaluacionID INT NOT NULL PRIMARY KEY,
+        Porcentaje DECIMAL(5, 2) NOT NULL
+    );
+"""
+
+# Registro de los resultados de #ResultadosCarga en un único lote. No es una
+# escritura por conjuntos: el servidor sigue ejecutando
+# sp_RegistrarResultadosEvaluacion una vez por fila, así que las reglas
+# (búsqueda del ítem, duplicados y sus mensajes de error) no cambian; lo que se
+# ahorra son los viajes de ida y vuelta del cliente. Un INSERT ... SELECT
+# exigiría copiar la validación del procedimiento, cuya definición no forma
+# parte de este repositorio. THROW relanza el primer error del procedimiento con
+# su mensaje original y detiene el lote.
+# Se completa con uno de los dos bloques de cumplimiento siguientes.
+SQL_REGISTRAR_RESULTADOS_LOTE = """
+    SET NOCOUNT ON;
+    DECLARE @EvaluacionCarga INT, @ItemNombre NVARCHAR(500), @Estado NVARCHAR(100),
+            @FechaRevision DATETIME, @Observaciones NVARCHAR(MAX);
+
+    DECLARE resultados_carga CURSOR LOCAL FAST_FORWARD FOR
+        SELECT EvaluacionID, ItemNombre, Estado, FechaRevision, Observaciones
+        FROM #ResultadosCarga ORDER BY EvaluacionID, Fila;
+    OPEN resultados_carga;
+    BEGIN TRY
+        FETCH NEXT FROM resultados_carga
+            INTO @EvaluacionCarga, @ItemNombre, @Estado, @FechaRevision, @Observaciones;
+        WHILE @@FETCH_STATUS = 0
+        BEGIN
+            EXEC sp_RegistrarResultadosEvaluacion
+                @EvaluacionID = @EvaluacionCarga,
+                @ItemNombre = @ItemNombre,
+                @Estado = @Estado,
+                @FechaRevision = @FechaRevision,
+                @Observaciones = @Observaciones;
+            FETCH NEXT FROM resultados_carga
+                INTO @EvaluacionCarga, @ItemNombre, @Estado, @FechaRevision, @Observaciones;
+        END
+    END TRY
+    BEGIN CATCH
+        CLOSE resultados_carga;
+        DEALLOCATE resultados_carga;
+        THROW;
+    END CATCH
+    CLOSE resultados_carga;
+    DEALLOCATE resultados_carga;
+
+"""
+
+# Cumplimiento calculado en el servidor con sp_CalcularPorcentajeCumplimiento,
+# una ejecución por evaluación de la carga dentro del mismo lote
+SQL_CUMPLIMIENTO_SERVIDOR = """
+    DECLARE @EvaluacionID INT;
+    DECLARE evaluaciones_carga CURSOR LOCAL FAST_FORWARD FOR
+        SELECT DISTINCT EvaluacionID FROM #ResultadosCarga;
+    OPEN evaluaciones_carga;
+    FETCH NEXT FROM evaluaciones_carga INTO @EvaluacionID;
+    WHILE @@FETCH_STATUS = 0
+    BEGIN
+        EXEC sp_CalcularPorcentajeCumplimiento @EvaluacionID = @EvaluacionID;
+        FETCH NEXT FROM evaluaciones_carga INTO @EvaluacionID;
+    END
+    CLOSE evaluaciones_carga;
+    DEALLOCATE evaluaciones_carga;
+
+    DROP TABLE #ResultadosCarga;
+    DROP TABLE #CumplimientoCarga;
+"""
+
+# Cumplimiento calculado en el cliente y cargado en #CumplimientoCarga
+SQL_CUMPLIMIENTO_CLIENTE = """
+    UPDATE e SET PorcentajeCumplimiento = c.Porcentaje
+    FROM Evaluaciones e
+    INNER JOIN #CumplimientoCarga c ON e.EvaluacionID = c.EvaluacionID;
+
+    DROP TABLE #ResultadosCarga;
+    DROP TABLE #CumplimientoCarga;
+"""
+
+# Evaluación activa de un periodo, docente y asignatura (IDs ya resueltos); el
+# bloqueo de la clave se mantiene hasta el commit para que dos correcciones
+# simultáneas no se mezclen
+SQL_BUSCAR_EVALUACION = """
+    SELECT EvaluacionID
+    FROM Evaluaciones WITH (UPDLOCK, HOLDLOCK)
+    WHERE DocenteID = ? AND PeriodoID = ? AND AsignaturaID = ? AND Estado = 1
+"""
+
+# Resultados almacenados de una evaluación, para compararlos con un libro corregido
+SQL_RESULTADOS_EVALUACION = """
+    SELECT r.ItemID, i.Nombre, r.Estado, r.FechaRevision, r.Observaciones
+    FROM ResultadosEvaluacion r
+    INNER JOIN ItemsEvaluacion i ON r.ItemID = i.ItemID
+    WHERE r.EvaluacionID = ?
+"""
+
+# Resultados almacenados para recalcular el cumplimiento en el cliente
+SQL_RESULTADOS_ALMACENADOS = """
+    SELECT r.EvaluacionID, c.Nombre, r.Estado, e.PorcentajeCumplimiento
+    FROM ResultadosEvaluacion r
+    INNER JOIN Evaluaciones e ON r.EvaluacionID = e.EvaluacionID
+    INNER JOIN ItemsEvaluacion i ON r.ItemID = i.ItemID
+    INNER JOIN CategoriasEvaluacion c ON i.CategoriaID = c.CategoriaID
+    WHERE e.Estado = 1 {filtro}
+    ORDER BY r.EvaluacionID
+"""
+
+
+def validar_datos_excel(df_general: pd.DataFrame, df_eval: pd.DataFrame,
+                        estados_validos: List[str] = ESTADOS_VALIDOS) -> Tuple[bool, str]:
+    """Valida los datos del Excel antes de procesarlos"""
+    try:
+        # Limpiar nombres de columnas
+        df_eval.columns = [col.strip() for col in df_eval.columns]
+        
+        # Validar que los campos no estén vacíos
+        for idx, campo in CAMPOS_REQUERIDOS.items():
+            if pd.isnull(df_general.iloc[idx, 1]):
+                return False, f"El campo {campo} es requerido"
+            if len(str(df_general.iloc[idx, 1]).strip()) == 0:
+                return False, f"El campo {campo} no puede estar vacío"
+            
+        # Validar estructura de evaluación
+        columnas_requeridas = ['CATEGORÍA', 'ÍTEM DE EVALUACIÓN', 'ESTADO', 'FECHA']
+        for columna in columnas_requeridas:
+            if columna not in df_eval.columns:
+                return False, f"La columna '{columna}' es requerida en la hoja de evaluación"
+        
+        # Validar estados y fechas por columnas completas
+        errores = []
+        estados = df_eval['ESTADO']
+        estados_limpios = estados[estados.notna()].astype(str).str.strip()
+        invalidos = estados_limpios[~estados_limpios.isin(estados_validos)]
+        if not invalidos.empty:
+            errores.append("Estados inválidos encontrados:\n" + "\n".join(
+                f"Fila {idx + 2}: {estado}" for idx, estado in invalidos.items()
+            ))
+        
+        fechas = df_eval['FECHA']
+        fechas_invalidas = fechas[fechas.notna() & pd.to_datetime(fechas, errors='coerce').isna()]
+        if not fechas_invalidas.empty:
+            errores.append("Fechas inválidas encontradas:\n" + "\n".join(
+                f"Fila {idx + 2}: {fecha}" for idx, fecha in fechas_invalidas.items()
+            ))
+        
+        if errores:
+            return False, "\n".join(errores)
+        
+        return True, ""
+        
+    except Exception as e:
+        error_msg = f"Error en validación: {str(e)}"
+        logging.getLogger(__name__).error(error_msg)
+        return False, error_msg
+
+
+def preparar_resultados(df_eval: pd.DataFrame, fecha_defecto: datetime) -> List[Tuple]:
+    """Normaliza la hoja de evaluación por columnas y devuelve las tuplas de parámetros.
+
+    Cada tupla es (item, estado, fecha, observaciones): se recortan espacios, el
+    estado vacío pasa a 'No Aplica', la fecha vacía toma fecha_defecto y las
+    observaciones vacías quedan como None. Se omiten las filas sin ítem.
+    """
+    df = df_eval[df_eval['ÍTEM DE EVALUACIÓN'].notna()]
+    if df.empty:
+        return []
+    
+    items = df['ÍTEM DE EVALUACIÓN'].astype(str).str.strip()
+    
+    estados = df['ESTADO']
+    estados = estados.astype(str).str.strip().astype(object).where(estados.notna(), 'No Aplica')
+    
+    fechas = pd.to_datetime(df['FECHA'], errors='coerce').fillna(pd.Timestamp(fecha_defecto))
+    
+    if 'OBSERVACIONES' in df.columns:
+        observaciones = df['OBSERVACIONES']
+        observaciones = observaciones.astype(str).str.strip().astype(object).where(observaciones.notna(), None)
+    else:
+        observaciones = pd.Series([None] * len(df), index=df.index, dtype=object)
+    
+    return list(zip(
+        items.tolist(),
+        estados.tolist(),
+        fechas.dt.to_pydatetime().tolist(),
+        observaciones.tolist()
+    ))
+
+
+def _normalizar_fecha(valor) -> Optional[datetime]:
+    """Fecha almacenada como datetime de Python (el controlador puede devolver texto)"""
+    if valor is None or pd.isna(valor):
+        return None
+    return pd.Timestamp(valor).to_pydatetime()
+
+
+def diferencias_resultados(almacenados: List[Tuple], resultados: List[Tuple],
+                           fecha_defecto: Optional[datetime] = None) -> Tuple[List[Tuple], List[int], List[int]]:
+    """Compara ítem por ítem los resultados almacenados con los de un libro corregido.
+
+    almacenados son filas (item_id, item, estado, fecha, observaciones) de la base
+    de datos y resultados las tuplas de preparar_resultados. Devuelve los
+    resultados nuevos o modificados, los ItemID modificados y los ItemID que ya
+    no figuran en el libro. Una fecha igual a fecha_defecto (celda vacía)
+    conserva la fecha almacenada.
+    """
+    previos = {clave_exacta(fila[1]): fila for fila in almacenados}
+    vistos = set()
+    cambios, modificados = [], []
+    for item, estado, fecha, observaciones in resultados:
+        clave = clave_exacta(item)
+        if clave in vistos:
+            raise ValueError(f"Ya existe un resultado para el ítem: {item}")
+        vistos.add(clave)
+        previo = previos.get(clave)
+        if previo is None:
+            cambios.append((item, estado, fecha, observaciones))
+            continue
+        fecha_previa = _normalizar_fecha(previo[3])
+        if fecha_defecto is not None and fecha == fecha_defecto and fecha_previa is not None:
+            fecha = fecha_previa
+        if (estado, fecha, observaciones or None) != (previo[2], fecha_previa, previo[4] or None):
+            cambios.append((item, estado, fecha, observaciones))
+            modificados.append(previo[0])
+    eliminados = [fila[0] for clave, fila in previos.items() if clave not in vistos]
+    return cambios, modificados, eliminados
+
+
+def extraer_evaluacion(ruta_archivo: str, estados_validos: List[str] = ESTADOS_VALIDOS,
+                       duraciones: Optional[Dict[str, float]] = None) -> Dict:
+    """Lee y valida un archivo Excel de evaluación sin acceder a la base de datos.
+
+    Al no depender de la conexión puede ejecutarse en un proceso hijo; el
+    resultado es un diccionario serializable listo para registrar_evaluacion.
+    Los segundos de cada etapa se acumulan en duraciones (también si falla) y
+    se devuelven en la clave 'duraciones'.
+    """
+    if duraciones is None:
+        duraciones = {}
+    
+    # Leer datos del Excel (una sola apertura del libro)
+    with medir(duraciones, 'lectura'):
+        df_general, df_eval = leer_libro_evaluacion(ruta_archivo)
+    
+    datos = _datos_evaluacion(ruta_archivo, df_general, df_eval, estados_validos, duraciones)
+    with medir(duraciones, 'hash'):
+        datos['hash_contenido'] = calcular_hash(ruta_archivo)
+    return datos
+
+
+def extraer_evaluaciones(ruta_archivo: str, estados_validos: List[str] = ESTADOS_VALIDOS) -> Iterator[Dict]:
+    """Genera las evaluaciones de un libro (simple o consolidado) de a una.
+
+    Cada elemento es el diccionario de extraer_evaluacion con la clave 'origen'
+    (hoja o filas de la evaluación) o, si esa evaluación no es válida,
+    {'archivo', 'origen', 'error', 'duraciones'}. Solo una evaluación está en
+    memoria a la vez.
+    """
+    duraciones = {}
+    with medir(duraciones, 'hash'):
+        hash_libro = calcular_hash(ruta_archivo)
+    evaluaciones = iterar_evaluaciones_libro(ruta_archivo)
+    while True:
+        with medir(duraciones, 'lectura'):
+            siguiente = next(evaluaciones, None)
+        if siguiente is None:
+            return
+        origen, df_general, df_eval, error = siguiente
+        try:
+            if error:
+                raise ValueError(error)
+            datos = _datos_evaluacion(ruta_archivo, df_general, df_eval, estados_validos, duraciones)
+        except Exception as e:
+            yield {'archivo': ruta_archivo, 'origen': origen, 'error': str(e), 'duraciones': duraciones}
+        else:
+            datos['origen'] = origen
+            datos['hash_contenido'] = hash_evaluacion(hash_libro, origen)
+            yield datos
+        duraciones = {}
+
+
+def _datos_evaluacion(ruta_archivo: str, df_general: pd.DataFrame, df_eval: pd.DataFrame,
+                      estados_validos: List[str], duraciones: Dict[str, float]) -> Dict:
+    """Valida las hojas de una evaluación y arma el diccionario para registrar_evaluacion"""
+    # Validación de datos
+    with medir(duraciones, 'validacion'):
+        es_valido, mensaje_error = validar_datos_excel(df_general, df_eval, estados_validos)
+    if not es_valido:
+        raise ValueError(mensaje_error)
+    
+    with medir(duraciones, 'preparacion'):
+        fecha_actual = datetime.now().date()
+        fecha_defecto = datetime.combine(fecha_actual, datetime.min.time())
+        fechas = pd.to_datetime(df_eval['FECHA'], errors='coerce')
+        fecha_maxima = fechas.max()
+        resultados = preparar_resultados(df_eval, fecha_defecto)
+    
+    # Cumplimiento calculado en el proceso de lectura (se guarda con cumplimiento_cliente)
+    with medir(duraciones, 'cumplimiento'):
+        porcentaje = cumplimiento_evaluacion(resultados)
+    
+    # Extraer y limpiar datos generales
+    return {
+        'archivo': ruta_archivo,
+        'hash_contenido': None,
+        'periodo_academico': str(df_general.iloc[2, 1]).strip(),
+        'facultad': str(df_general.iloc[3, 1]).strip(),
+        'carrera': str(df_general.iloc[4, 1]).strip(),
+        'revisado_por': str(df_general.iloc[5, 1]).strip(),
+        'asignatura': str(df_general.iloc[6, 1]).strip(),
+        'nombre_docente': str(df_general.iloc[7, 1]).strip(),
+        'fecha_evaluacion': fecha_maxima if not pd.isna(fecha_maxima) else fecha_actual,
+        'resultados': resultados,
+        'fecha_defecto': fecha_defecto,
+        'cumplimiento': porcentaje,
+        'duraciones': duraciones
+    }
+
 
 class EvaluacionDocenteSystem:
-    def __init__(self):
+    def __init__(self, tamano_pool: int = 4, notificador: Optional[Callable[[str, str, str], None]] = None,
+                 fabrica_conexion: Optional[Callable[[], 'pyodbc.Connection']] = None,
+                 directorio_datos: Optional[str] = None):
+        # Notificaciones al usuario (la interfaz gráfica muestra diálogos)
+        self.notificador = notificador
+        
         # Configurar logging
-        log_dir = os.path.join(os.getenv('APPDATA'), 'EvaluacionDocente', 'logs')
+        if directorio_datos is None:
+            directorio_base = os.getenv('APPDATA') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+            directorio_datos = os.path.join(directorio_base, 'EvaluacionDocente')
+        self.directorio_datos = directorio_datos
+        log_dir = os.path.join(self.directorio_datos, 'logs')
         if not os.path.exists(log_dir):
             os.makedirs(log_dir)
             
@@ -28,115 +408,336 @@ class EvaluacionDocenteSystem:
             "Trusted_Connection=yes;"
         )
         self.conn = None
+        # fabrica_conexion permite usar otra base de datos (p. ej. el sustituto SQLite de benchmarks)
+        self.pool = PoolConexiones(fabrica_conexion or self._crear_conexion, tamano_maximo=tamano_pool)
+        
+        # Tiempos por etapa en JSON lines
+        self.metricas = RegistroMetricas(os.path.join(log_dir, 'metricas.jsonl'))
+        
+        # Caché de catálogos con instantánea local
+        self.catalogos = CatalogoCache(
+            self,
+            ruta_snapshot=os.path.join(self.directorio_datos, 'cache', 'catalogos.json')
+        )
+        
+        # Manifiesto local de archivos ya cargados
+        self.manifiesto = ManifiestoIngesta(os.path.join(self.directorio_datos, 'manifiesto.db'))
+        
+        # Diario local de evaluaciones pendientes de enviar al servidor. Se usa siempre en
+        # modo sin conexión y, con diario_automatico, cuando el servidor no responde
+        self.diario = DiarioIngesta(os.path.join(self.directorio_datos, 'diario.db'))
+        self.modo_sin_conexion = False
+        self.diario_automatico = True
+        self._sin_servidor_hasta = 0.0
         
         # Estados válidos para la evaluación
-        self.estados_validos = [
-            'Cumplimiento satisfactorio',
-            'Cumplimiento parcial',
-            'Incumplimiento',
-            'No Aplica'
-        ]
+        self.estados_validos = list(ESTADOS_VALIDOS)
+        
+        # Validar contra los datos de referencia locales antes de abrir la transacción
+        self.prevalidacion = True
+        
+        # Experimental: calcular el cumplimiento en el cliente en lugar de
+        # sp_CalcularPorcentajeCumplimiento. Desactivado en la carga, los resúmenes y
+        # los informes; activar solo cuando recalcular_cumplimiento(verificar_paridad=True)
+        # no encuentre diferencias contra el procedimiento real.
+        self.cumplimiento_cliente = False
+        
+        # Corregir nombres de docente, asignatura y carrera con coincidencia inequívoca
+        self.autocorreccion = True
+        self.resolvedor = ResolvedorReferencias(self.catalogos)
 
-    def conectar_bd(self) -> bool:
-        """Establece conexión con la base de datos SQL Server"""
+    def notificar(self, nivel: str, titulo: str, mensaje: str):
+        """Envía un aviso al notificador configurado ('error', 'advertencia' o 'info')"""
+        if self.notificador:
+            try:
+                self.notificador(nivel, titulo, mensaje)
+            except Exception as e:
+                self.logger.warning(f"No se pudo notificar al usuario: {str(e)}")
+
+    def _crear_conexion(self) -> 'pyodbc.Connection':
+        """Abre una conexión nueva con SQL Server (usada por el pool)"""
+        if pyodbc is None:
+            raise ImportError("pyodbc no está disponible: instale el controlador ODBC para SQL Server")
+        conn = pyodbc.connect(self.conn_str, timeout=30)
+        conn.autocommit = False
+        return conn
+
+    def _prestar_conexion(self) -> 'pyodbc.Connection':
+        """Obtiene una conexión del pool notificando los errores de conexión"""
         try:
-            if self.conn is None or self.conn.closed:
-                self.conn = pyodbc.connect(self.conn_str, timeout=30)
-                self.conn.autocommit = False
-                self.logger.info("Conexión a base de datos establecida")
-            return True
+            return self.pool.obtener()
         except Exception as e:
             error_msg = f"Error de conexión a la base de datos: {str(e)}"
             self.logger.error(error_msg)
-            messagebox.showerror("Error de Conexión", error_msg)
+            self.notificar("error", "Error de Conexión", error_msg)
             raise ConnectionError(error_msg)
 
+    def conectar_bd(self) -> bool:
+        """Reserva una conexión del pool como conexión activa del sistema"""
+        if self.conn is None:
+            self.conn = self._prestar_conexion()
+        return True
+
+    def usar_diario(self) -> bool:
+        """Indica si las evaluaciones deben guardarse en el diario local.
+
+        Es así en modo sin conexión o si el servidor no responde; tras una falla
+        no se vuelve a intentar conectar durante ESPERA_RECONEXION segundos.
+        """
+        if self.modo_sin_conexion:
+            return True
+        if self.conn is not None or not self.diario_automatico:
+            return False
+        if time.monotonic() < self._sin_servidor_hasta:
+            return True
+        try:
+            self.conn = self.pool.obtener()
+            return False
+        except Exception as e:
+            self._sin_servidor_hasta = time.monotonic() + ESPERA_RECONEXION
+            self.logger.warning(f"Servidor no disponible, se usará el diario local: {str(e)}")
+            return True
+
+    @contextmanager
+    def conexion(self):
+        """Presta la conexión activa o, si no hay, una conexión del pool durante el bloque"""
+        if self.conn is not None:
+            yield self.conn
+            return
+        conn = self._prestar_conexion()
+        try:
+            yield conn
+        finally:
+            self.pool.devolver(conn)
+
     def validar_datos_excel(self, df_general: pd.DataFrame, df_eval: pd.DataFrame) -> Tuple[bool, str]:
         """Valida los datos del Excel antes de procesarlos"""
+        return validar_datos_excel(df_general, df_eval, self.estados_validos)
+
+    def prevalidar_evaluacion(self, datos: Dict) -> List[str]:
+        """Valida una evaluación contra la instantánea de referencia sin tocar la base de datos"""
+        errores = prevalidar_evaluacion(datos, self.catalogos, self.resolvedor)
+        antiguedad = self.catalogos.antiguedad()
+        if errores and antiguedad is not None and antiguedad > 60:
+            # Los datos locales pueden estar desactualizados: recargar y repetir
+            try:
+                self.catalogos.recargar()
+                errores = prevalidar_evaluacion(datos, self.catalogos, self.resolvedor)
+            except Exception as e:
+                self.logger.warning(f"No se pudieron recargar los datos de referencia: {str(e)}")
+        return errores
+
+    def corregir_nombres(self, datos: Dict) -> List[str]:
+        """Reemplaza en datos los nombres que no existen por su coincidencia inequívoca.
+
+        Devuelve la descripción de cada corrección aplicada.
+        """
+        correcciones = []
+        
+        facultad = self.catalogos.buscar_facultad(datos['facultad'])
+        if facultad and facultad != datos['facultad'] and not self.catalogos.existe('facultades', datos['facultad']):
+            correcciones.append(f"Facultad: '{datos['facultad']}' -> '{facultad}'")
+            datos['facultad'] = facultad
+        
+        campos = [
+            ('nombre_docente', 'docentes', 'Docente', None),
+            ('asignatura', 'asignaturas', 'Asignatura', None),
+            ('carrera', 'carreras', 'Carrera', datos['facultad'])
+        ]
+        for campo, tipo, etiqueta, facultad in campos:
+            if tipo == 'carreras':
+                existe = self.catalogos.existe_carrera(facultad, datos[campo])
+            else:
+                existe = self.catalogos.existe(tipo, datos[campo])
+            if existe:
+                continue
+            corregido = self.resolvedor.resolver(tipo, datos[campo], facultad)
+            if corregido:
+                correcciones.append(f"{etiqueta}: '{datos[campo]}' -> '{corregido}'")
+                datos[campo] = corregido
+        
+        for correccion in correcciones:
+            self.logger.warning(f"Nombre corregido en {os.path.basename(datos['archivo'])}: {correccion}")
+        return correcciones
+
+    def registrar_evaluacion(self, datos: Dict) -> Optional[int]:
+        """Registra en la base de datos una evaluación ya extraída y validada.
+
+        Sin servidor (ver usar_diario) la evaluación se guarda en el diario local,
+        se devuelve None y datos['id_diario'] indica su entrada. Los segundos de
+        cada etapa se agregan a datos['duraciones'].
+        """
+        self.preparar_registro(datos)
+        
+        if self.usar_diario():
+            with medir(datos['duraciones'], 'diario'):
+                datos['id_diario'] = self.diario.encolar(datos)
+            self.logger.info(f"Evaluación guardada en el diario local (entrada {datos['id_diario']})")
+            return None
+        
+        if not self.conn:
+            self.conectar_bd()
+        
+        duraciones = datos['duraciones']
         try:
-            # Limpiar nombres de columnas
-            df_eval.columns = [col.strip() for col in df_eval.columns]
-            
-            # Verificar datos generales
-            campos_requeridos = {
-                2: "Periodo Académico",
-                3: "Facultad",
-                4: "Carrera",
-                5: "Revisado Por",
-                6: "Asignatura",
-                7: "Nombre del Docente"
-            }
-            
-            # Validar que los campos no estén vacíos
-            for idx, campo in campos_requeridos.items():
-                if pd.isnull(df_general.iloc[idx, 1]):
-                    return False, f"El campo {campo} es requerido"
-                if len(str(df_general.iloc[idx, 1]).strip()) == 0:
-                    return False, f"El campo {campo} no puede estar vacío"
-                
-            # Validar estructura de evaluación
-            columnas_requeridas = ['CATEGORÍA', 'ÍTEM DE EVALUACIÓN', 'ESTADO', 'FECHA']
-            for columna in columnas_requeridas:
-                if columna not in df_eval.columns:
-                    return False, f"La columna '{columna}' es requerida en la hoja de evaluación"
-            
-            # Validar estados
-            estados_invalidos = []
-            for idx, row in df_eval.iterrows():
-                if pd.notna(row['ESTADO']):
-                    estado = str(row['ESTADO']).strip()
-                    if estado not in self.estados_validos:
-                        estados_invalidos.append(f"Fila {idx + 2}: {estado}")
-            
-            if estados_invalidos:
-                return False, f"Estados inválidos encontrados:\n" + "\n".join(estados_invalidos)
+            cursor = self.conn.cursor()
+            evaluacion_id = self.escribir_evaluacion(cursor, datos)
             
-            return True, ""
+            with medir(duraciones, 'commit'):
+                self.conn.commit()
+            self.logger.info(f"Archivo procesado correctamente. EvaluacionID: {evaluacion_id}")
             
-        except Exception as e:
-            error_msg = f"Error en validación: {str(e)}"
-            self.logger.error(error_msg)
-            return False, error_msg
+        except Exception:
+            if self.conn:
+                try:
+                    self.conn.rollback()
+                except Exception:
+                    # Conexión rota: no devolverla al pool
+                    self.cerrar_conexion(descartar=True)
+            raise
+        
+        with medir(duraciones, 'resumen'):
+            self.aplicar_resumen()
+        self.registrar_en_manifiesto(datos, evaluacion_id)
+        return evaluacion_id
+
+    def actualizar_evaluacion(self, datos: Dict) -> Dict:
+        """Aplica a una evaluación ya registrada las correcciones de un libro.
 
-    def procesar_archivo_excel(self, ruta_archivo: str) -> bool:
-        """Procesa un archivo Excel de evaluación docente"""
+        Las diferencias se escriben con escribir_actualizacion y se confirman en
+        una transacción; si la evaluación aún no está registrada se registra como
+        nueva. Luego se suma el resumen de BI. Devuelve {'evaluacion_id',
+        'cambios', 'eliminados', 'sin_cambios', 'nueva'}.
+        """
+        self.preparar_registro(datos, descartar_duplicados=False)
+        if self.usar_diario():
+            raise ValueError("La actualización de una evaluación requiere conexión con el servidor")
+        
+        if not self.conn:
+            self.conectar_bd()
+        
+        duraciones = datos['duraciones']
         try:
-            self.logger.info(f"Iniciando procesamiento de archivo: {os.path.basename(ruta_archivo)}")
+            actualizacion = self.escribir_actualizacion(self.conn.cursor(), datos)
             
-            # Verificar conexión
-            if not self.conn:
-                self.conectar_bd()
+            with medir(duraciones, 'commit'):
+                self.conn.commit()
             
-            # Leer datos del Excel
-            df_general = pd.read_excel(
-                ruta_archivo,
-                sheet_name='DATOS_GENERALES',
-                header=None,
-                engine='openpyxl'
+        except Exception:
+            if self.conn:
+                try:
+                    self.conn.rollback()
+                except Exception:
+                    # Conexión rota: no devolverla al pool
+                    self.cerrar_conexion(descartar=True)
+            raise
+        
+        with medir(duraciones, 'resumen'):
+            self.aplicar_resumen()
+        evaluacion_id = actualizacion['evaluacion_id']
+        if actualizacion['nueva']:
+            self.logger.info(f"Evaluación sin registro previo, registrada como nueva. EvaluacionID: {evaluacion_id}")
+        else:
+            self.logger.info(
+                f"Evaluación {evaluacion_id} actualizada: {actualizacion['cambios']} ítems nuevos o modificados, "
+                f"{actualizacion['eliminados']} eliminados"
             )
-            
-            df_eval = pd.read_excel(
-                ruta_archivo,
-                sheet_name='EVALUACION',
-                engine='openpyxl'
+        self.registrar_en_manifiesto(datos, evaluacion_id)
+        return actualizacion
+
+    def escribir_actualizacion(self, cursor: 'pyodbc.Cursor', datos: Dict) -> Dict:
+        """Escribe las correcciones de un libro en la transacción en curso, sin confirmarla.
+
+        La evaluación se busca por los IDs de docente, periodo y asignatura de la
+        caché de catálogos. Sus resultados se leen con una sola consulta y se
+        comparan ítem por ítem con los del libro (diferencias_resultados); solo
+        los nuevos o modificados se vuelven a registrar y se borran los que ya no
+        figuran. Los datos generales de la evaluación no cambian. Si no hay una
+        evaluación registrada, el libro se escribe como una nueva
+        (escribir_evaluacion) y 'nueva' es True.
+        """
+        duraciones = datos.setdefault('duraciones', {})
+        with medir(duraciones, 'diferencias'):
+            evaluacion_id = None
+            docente_id = self.obtener_id_docente(datos['nombre_docente'])
+            periodo_id = self.catalogos.id_referencia('periodos', datos['periodo_academico'], recargar=True)
+            asignatura_id = self.catalogos.id_referencia('asignaturas', datos['asignatura'], recargar=True)
+            if None not in (docente_id, periodo_id, asignatura_id):
+                cursor.execute(SQL_BUSCAR_EVALUACION, (docente_id, periodo_id, asignatura_id))
+                evaluacion_id = cursor.fetchval()
+            if evaluacion_id:
+                cursor.execute(SQL_RESULTADOS_EVALUACION, evaluacion_id)
+                almacenados = cursor.fetchall()
+                cambios, modificados, eliminados = diferencias_resultados(
+                    almacenados, datos['resultados'], datos.get('fecha_defecto')
+                )
+        
+        if not evaluacion_id:
+            return {
+                'evaluacion_id': self.escribir_evaluacion(cursor, datos),
+                'cambios': len(datos['resultados']),
+                'eliminados': 0,
+                'sin_cambios': 0,
+                'nueva': True
+            }
+        
+        if cambios or eliminados:
+            with medir(duraciones, 'resultados'):
+                self.escribir_diferencias(
+                    cursor, evaluacion_id, cambios, modificados, eliminados, datos.get('cumplimiento', 0.0)
+                )
+        return {
+            'evaluacion_id': evaluacion_id,
+            'cambios': len(cambios),
+            'eliminados': len(eliminados),
+            'sin_cambios': len(datos['resultados']) - len(cambios),
+            'nueva': False
+        }
+
+    def preparar_registro(self, datos: Dict, descartar_duplicados: bool = True):
+        """Corrige nombres, prevalida y descarta duplicados conocidos antes de escribir"""
+        duraciones = datos.setdefault('duraciones', {})
+        if self.autocorreccion:
+            try:
+                with medir(duraciones, 'correccion'):
+                    datos['correcciones'] = self.corregir_nombres(datos)
+            except Exception as e:
+                self.logger.warning(f"Corrección de nombres omitida: {str(e)}")
+        
+        if self.prevalidacion:
+            try:
+                with medir(duraciones, 'prevalidacion'):
+                    errores = self.prevalidar_evaluacion(datos)
+            except Exception as e:
+                # Sin datos de referencia la validación queda a cargo del servidor
+                self.logger.warning(f"Prevalidación omitida: {str(e)}")
+                errores = []
+            if errores:
+                raise ValueError("\n".join(errores))
+        
+        if not descartar_duplicados:
+            return
+        
+        evaluacion_existente = self.manifiesto.buscar_identidad(datos)
+        if evaluacion_existente:
+            raise ValueError(
+                "Ya existe una evaluación para este periodo, docente y asignatura "
+                f"(EvaluacionID: {evaluacion_existente})"
             )
-            
-            # Validación de datos
-            es_valido, mensaje_error = self.validar_datos_excel(df_general, df_eval)
-            if not es_valido:
-                raise ValueError(mensaje_error)
-            
-            cursor = self.conn.cursor()
-            
-            # Extraer y limpiar datos generales
-            periodo_academico = str(df_general.iloc[2, 1]).strip()
-            facultad = str(df_general.iloc[3, 1]).strip()
-            carrera = str(df_general.iloc[4, 1]).strip()
-            revisado_por = str(df_general.iloc[5, 1]).strip()
-            asignatura = str(df_general.iloc[6, 1]).strip()
-            nombre_docente = str(df_general.iloc[7, 1]).strip()
-            
-            # Registrar evaluación
+        
+        pendiente = self.diario.buscar_identidad(datos)
+        if pendiente:
+            raise ValueError(
+                "Ya existe una evaluación para este periodo, docente y asignatura "
+                f"pendiente de sincronización (diario local, entrada {pendiente})"
+            )
+
+    def escribir_evaluacion(self, cursor: 'pyodbc.Cursor', datos: Dict) -> int:
+        """Escribe la evaluación y sus resultados en la transacción en curso, sin confirmarla"""
+        duraciones = datos.setdefault('duraciones', {})
+        
+        # Registrar evaluación
+        with medir(duraciones, 'registro_evaluacion'):
             cursor.execute("""
                 DECLARE @EvaluacionID INT;
                 EXEC sp_RegistrarEvaluacion 
@@ -150,73 +751,451 @@ class EvaluacionDocenteSystem:
                     @EvaluacionID = @EvaluacionID OUTPUT;
                 SELECT @EvaluacionID;
             """, (
-                periodo_academico, nombre_docente, asignatura,
-                carrera, facultad, revisado_por,
-                df_eval['FECHA'].max() if not pd.isna(df_eval['FECHA'].max()) else datetime.now().date()
+                datos['periodo_academico'], datos['nombre_docente'], datos['asignatura'],
+                datos['carrera'], datos['facultad'], datos['revisado_por'],
+                datos['fecha_evaluacion']
             ))
-            
+        
             evaluacion_id = cursor.fetchval()
-            if not evaluacion_id:
-                raise ValueError("No se pudo obtener el ID de la evaluación")
+        if not evaluacion_id:
+            raise ValueError("No se pudo obtener el ID de la evaluación")
+        
+        self.logger.info(f"EvaluacionID generado: {evaluacion_id}")
+        
+        # Registrar resultados y calcular cumplimiento con un solo lote al servidor
+        porcentajes = None
+        if self.cumplimiento_cliente:
+            porcentajes = {evaluacion_id: datos.get('cumplimiento', 0.0)}
+        
+        with medir(duraciones, 'resultados'):
+            if datos['resultados']:
+                self.registrar_resultados_lote(
+                    cursor,
+                    [(evaluacion_id,) + tuple(resultado) for resultado in datos['resultados']],
+                    porcentajes
+                )
+            elif porcentajes:
+                cursor.execute("""
+                    UPDATE Evaluaciones SET PorcentajeCumplimiento = 0 WHERE EvaluacionID = ?
+                """, evaluacion_id)
+            else:
+                cursor.execute("""
+                    EXEC sp_CalcularPorcentajeCumplimiento @EvaluacionID = ?
+                """, evaluacion_id)
+        
+        # Aporte al resumen de BI anotado en la misma transacción (sin efecto si no se
+        # creó el resumen); aplicar_resumen lo suma después del commit
+        with medir(duraciones, 'resumen'):
+            self.acumular_resumen(cursor, 1, evaluacion_id)
+        return evaluacion_id
+
+    def registrar_en_manifiesto(self, datos: Dict, evaluacion_id: int):
+        """Agrega al manifiesto una evaluación ya confirmada; un error no revierte el registro"""
+        try:
+            with medir(datos.setdefault('duraciones', {}), 'manifiesto'):
+                self.manifiesto.registrar(datos, evaluacion_id)
+        except Exception as e:
+            self.logger.warning(f"No se pudo actualizar el manifiesto: {str(e)}")
+
+    def acumular_resumen(self, cursor: 'pyodbc.Cursor', signo: int, evaluacion_id: int):
+        """Anota en la sesión el aporte (signo 1) o el descuento (signo -1) de una evaluación.
+
+        Las temporales se crean en un lote sin parámetros para que duren toda la
+        sesión (ver SQL_CREAR_DELTAS_RESUMEN); el lote con parámetros solo las usa.
+        """
+        cursor.execute(SQL_CREAR_DELTAS_RESUMEN)
+        cursor.execute(SQL_ACUMULAR_RESUMEN, (signo, evaluacion_id))
+
+    def aplicar_resumen(self):
+        """Suma al resumen de BI los aportes anotados en la sesión desde el último commit.
+
+        Se llama después de confirmar las evaluaciones y usa su propia transacción
+        corta; un error no revierte el registro y las anotaciones quedan en la
+        sesión para el siguiente commit.
+        """
+        if not self.conn:
+            return
+        try:
+            self.conn.cursor().execute(SQL_APLICAR_RESUMEN)
+            self.conn.commit()
+        except Exception as e:
+            self.logger.warning(f"No se pudo actualizar el resumen de cumplimiento: {str(e)}")
+            try:
+                self.conn.rollback()
+            except Exception:
+                # Conexión rota: no devolverla al pool
+                self.cerrar_conexion(descartar=True)
+
+    def registrar_resultados_lote(self, cursor: 'pyodbc.Cursor', resultados: List[Tuple],
+                                  porcentajes: Optional[Dict[int, float]] = None):
+        """Registra los resultados de una o varias evaluaciones con pocos viajes al servidor.
+
+        Cada resultado es (evaluacion_id, item, estado, fecha, observaciones). Las
+        filas se envían juntas a #ResultadosCarga y un solo lote ejecuta
+        sp_RegistrarResultadosEvaluacion por cada una, por lo que las reglas del
+        procedimiento se aplican sin cambios; el número de viajes de ida y vuelta
+        no depende de la cantidad de ítems, pero el servidor sigue registrando
+        fila por fila. Si se indican porcentajes (calculados en el cliente) se
+        guardan directamente; si no, el cumplimiento se recalcula con
+        sp_CalcularPorcentajeCumplimiento.
+        """
+        if not resultados:
+            return
+        
+        cursor.execute(SQL_CREAR_CARGA_RESULTADOS)
+        cursor.fast_executemany = True
+        cursor.executemany("""
+            INSERT INTO #ResultadosCarga
+                (EvaluacionID, Fila, ItemNombre, Estado, FechaRevision, Observaciones)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            (evaluacion_id, fila, item, estado, fecha, observaciones)
+            for fila, (evaluacion_id, item, estado, fecha, observaciones) in enumerate(resultados, start=1)
+        ])
+        if porcentajes:
+            cursor.executemany(
+                "INSERT INTO #CumplimientoCarga (EvaluacionID, Porcentaje) VALUES (?, ?)",
+                list(porcentajes.items())
+            )
+        cursor.fast_executemany = False
+        
+        sql_cumplimiento = SQL_CUMPLIMIENTO_CLIENTE if porcentajes else SQL_CUMPLIMIENTO_SERVIDOR
+        cursor.execute(SQL_REGISTRAR_RESULTADOS_LOTE + sql_cumplimiento)
+
+    def escribir_diferencias(self, cursor: 'pyodbc.Cursor', evaluacion_id: int, cambios: List[Tuple],
+                             modificados: List[int], eliminados: List[int], porcentaje: float = 0.0):
+        """Escribe las diferencias de una evaluación en la transacción en curso, sin confirmarla.
+
+        Se borran los resultados de los ItemID modificados o eliminados y los
+        cambios (item, estado, fecha, observaciones) se registran con el mismo
+        lote que una evaluación nueva (registrar_resultados_lote), que
+        también recalcula el cumplimiento. El aporte de la evaluación al resumen
+        de BI se descuenta antes y se vuelve a anotar después; aplicar_resumen
+        suma la diferencia tras el commit.
+        """
+        self.acumular_resumen(cursor, -1, evaluacion_id)
+        
+        borrados = modificados + eliminados
+        if borrados:
+            cursor.execute("""
+                DELETE FROM ResultadosEvaluacion
+                WHERE EvaluacionID = ?
+                  AND ItemID IN (SELECT CAST(value AS INT) FROM STRING_SPLIT(?, ','))
+            """, (evaluacion_id, ",".join(str(i) for i in borrados)))
+        
+        porcentajes = {evaluacion_id: porcentaje} if self.cumplimiento_cliente else None
+        if cambios:
+            self.registrar_resultados_lote(
+                cursor, [(evaluacion_id,) + tuple(cambio) for cambio in cambios], porcentajes
+            )
+        elif porcentajes:
+            cursor.execute("""
+                UPDATE Evaluaciones SET PorcentajeCumplimiento = ? WHERE EvaluacionID = ?
+            """, (porcentaje, evaluacion_id))
+        else:
+            cursor.execute("""
+                EXEC sp_CalcularPorcentajeCumplimiento @EvaluacionID = ?
+            """, evaluacion_id)
+        
+        self.acumular_resumen(cursor, 1, evaluacion_id)
+
+    def recalcular_cumplimiento(self, evaluacion_ids: Optional[List[int]] = None,
+                                verificar_paridad: bool = False) -> pd.DataFrame:
+        """Recalcula en el cliente el cumplimiento de evaluaciones ya almacenadas.
+
+        Lee los resultados con una sola consulta (todas las evaluaciones activas si
+        no se indican IDs) y los calcula en una pasada vectorizada. Con
+        verificar_paridad no escribe nada y compara con el valor guardado por
+        sp_CalcularPorcentajeCumplimiento; si no, actualiza todos los porcentajes
+        en bloque, lo que solo se permite con cumplimiento_cliente activado.
+        Devuelve un DataFrame por evaluación con el porcentaje almacenado, el
+        calculado y la diferencia.
+        """
+        if not verificar_paridad and not self.cumplimiento_cliente:
+            raise ValueError(
+                "El cumplimiento en el cliente está desactivado; compruebe la paridad antes de recalcular"
+            )
+        
+        filtro, parametros = "", []
+        if evaluacion_ids is not None:
+            if not evaluacion_ids:
+                return pd.DataFrame(columns=['almacenado', 'calculado', 'diferencia'])
+            filtro = "AND r.EvaluacionID IN (SELECT CAST(value AS INT) FROM STRING_SPLIT(?, ','))"
+            parametros.append(",".join(str(i) for i in evaluacion_ids))
+        
+        with self.conexion() as conn:
+            cursor = conn.cursor()
+            cursor.execute(SQL_RESULTADOS_ALMACENADOS.format(filtro=filtro), parametros)
+            filas = cursor.fetchall()
+            resultados = pd.DataFrame(
+                [tuple(fila) for fila in filas],
+                columns=['evaluacion_id', 'categoria', 'estado', 'almacenado']
+            )
+            totales, _ = calcular_cumplimiento(resultados)
             
-            self.logger.info(f"EvaluacionID generado: {evaluacion_id}")
+            comparacion = resultados.groupby('evaluacion_id')['almacenado'].first().astype(float).to_frame()
+            comparacion['calculado'] = totales
+            comparacion['diferencia'] = (comparacion['calculado'] - comparacion['almacenado']).round(2)
             
-            # Procesar resultados de evaluación
-            for idx, row in df_eval.iterrows():
-                if pd.notna(row['ÍTEM DE EVALUACIÓN']):
-                    cursor.execute("""
-                        EXEC sp_RegistrarResultadosEvaluacion
-                            @EvaluacionID = ?,
-                            @ItemNombre = ?,
-                            @Estado = ?,
-                            @FechaRevision = ?,
-                            @Observaciones = ?
-                    """, (
-                        evaluacion_id,
-                        str(row['ÍTEM DE EVALUACIÓN']).strip(),
-                        str(row['ESTADO']).strip() if pd.notna(row['ESTADO']) else 'No Aplica',
-                        row['FECHA'] if pd.notna(row['FECHA']) else datetime.now().date(),
-                        str(row['OBSERVACIONES']).strip() if pd.notna(row['OBSERVACIONES']) else None
-                    ))
+            # Sin resultados almacenados no hay nada que comparar ni que escribir
+            if totales.empty:
+                return comparacion
+            
+            if verificar_paridad:
+                discrepancias = int((comparacion['diferencia'].abs() > 0.01).sum())
+                self.logger.info(
+                    f"Paridad de cumplimiento: {len(comparacion)} evaluaciones, {discrepancias} con diferencias"
+                )
+                return comparacion
             
-            # Calcular porcentaje de cumplimiento
             cursor.execute("""
-                EXEC sp_CalcularPorcentajeCumplimiento @EvaluacionID = ?
-            """, evaluacion_id)
+                IF OBJECT_ID('tempdb..#CumplimientoCarga') IS NOT NULL DROP TABLE #CumplimientoCarga;
+                CREATE TABLE #CumplimientoCarga (
+                    EvaluacionID INT NOT NULL PRIMARY KEY,
+                    Porcentaje DECIMAL(5, 2) NOT NULL
+                );
+            """)
+            cursor.fast_executemany = True
+            cursor.executemany(
+                "INSERT INTO #CumplimientoCarga (EvaluacionID, Porcentaje) VALUES (?, ?)",
+                [(int(i), float(p)) for i, p in totales.items()]
+            )
+            cursor.fast_executemany = False
+            cursor.execute("""
+                UPDATE e SET PorcentajeCumplimiento = c.Porcentaje
+                FROM Evaluaciones e
+                INNER JOIN #CumplimientoCarga c ON e.EvaluacionID = c.EvaluacionID;
+                DROP TABLE #CumplimientoCarga;
+            """)
+            conn.commit()
+            self.logger.info(f"Cumplimiento recalculado para {len(totales)} evaluaciones")
+            return comparacion
+
+    def cerrar_conexion(self, descartar: bool = False):
+        """Devuelve la conexión activa al pool"""
+        if self.conn:
+            self.pool.devolver(self.conn, descartar=descartar)
+            self.conn = None
+
+    def buscar_en_manifiesto(self, ruta_archivo: str, solo_firma: bool = False) -> Optional[int]:
+        """EvaluacionID de un archivo ya cargado según el manifiesto local.
+
+        Con solo_firma el archivo no se lee: se busca por ruta, tamaño y fecha de
+        modificación, y el hash queda para quien extrae el archivo
+        (buscar_hash_en_manifiesto).
+        """
+        try:
+            if solo_firma:
+                return self.manifiesto.buscar_firma(ruta_archivo)
+            return self.manifiesto.buscar_archivo(ruta_archivo)
+        except Exception as e:
+            self.logger.warning(f"No se pudo consultar el manifiesto: {str(e)}")
+            return None
+
+    def buscar_hash_en_manifiesto(self, hash_contenido: Optional[str]) -> Optional[int]:
+        """EvaluacionID asociado a un hash de contenido ya calculado"""
+        if not hash_contenido:
+            return None
+        try:
+            return self.manifiesto.buscar_hash(hash_contenido)
+        except Exception as e:
+            self.logger.warning(f"No se pudo consultar el manifiesto: {str(e)}")
+            return None
+
+    def sincronizar_diario(self, tamano_lote: int = 500) -> Dict:
+        """Envía al servidor las evaluaciones del diario local en lotes grandes.
+
+        Cada lote se escribe en una sola transacción con un punto de guardado por
+        evaluación (RegistroGrupal). Las evaluaciones confirmadas o que el
+        servidor ya tiene se quitan del diario, por lo que repetir una
+        sincronización interrumpida no duplica evaluaciones; las que fallan
+        quedan pendientes con su error.
+        """
+        if self.modo_sin_conexion:
+            raise ConnectionError("El modo sin conexión está activo")
+        inicio = time.perf_counter()
+        resumen = {'enviadas': 0, 'duplicadas': 0, 'fallidas': 0, 'errores': []}
+        try:
+            self.conectar_bd()
+            for lote in self.diario.iterar_lotes(tamano_lote):
+                grupo = RegistroGrupal(self, tamano_grupo=len(lote))
+                entradas = []
+                for datos in lote:
+                    resultado = {
+                        'archivo': datos['archivo'], 'exito': False, 'evaluacion_id': None,
+                        'duplicado': False, 'error': None
+                    }
+                    entradas.extend(grupo.agregar(datos, resultado, preparar=False))
+                entradas.extend(grupo.confirmar())
+                
+                eliminar, errores = [], {}
+                for entrada in entradas:
+                    id_diario, resultado = entrada['datos']['id_diario'], entrada['resultado']
+                    if resultado['exito'] or resultado['duplicado']:
+                        eliminar.append(id_diario)
+                        resumen['enviadas' if resultado['exito'] else 'duplicadas'] += 1
+                    else:
+                        errores[id_diario] = resultado['error']
+                        resumen['errores'].append({
+                            'archivo': os.path.basename(resultado['archivo']), 'error': resultado['error']
+                        })
+                self.diario.eliminar(eliminar)
+                self.diario.marcar_error(errores)
+                resumen['fallidas'] += len(errores)
+                self.logger.info(f"Lote del diario sincronizado: {len(eliminar)} de {len(lote)} evaluaciones")
+                if self.conn is None:
+                    # El grupo descartó la conexión tras agotar los reintentos
+                    self.logger.error("Sincronización detenida: se perdió la conexión con el servidor")
+                    break
+        finally:
+            self.cerrar_conexion()
+        
+        resumen['pendientes'] = self.diario.contar()
+        resumen['duracion'] = round(time.perf_counter() - inicio, 3)
+        self.metricas.evento('sincronizacion', **{clave: valor for clave, valor in resumen.items() if clave != 'errores'})
+        return resumen
+
+    def reverificar_manifiesto(self) -> Dict:
+        """Contrasta el manifiesto local con las evaluaciones de la base de datos"""
+        with self.conexion() as conn:
+            return self.manifiesto.reverificar(conn)
+
+    def procesar_archivo_excel(self, ruta_archivo: str, actualizar: bool = False) -> bool:
+        """Procesa un archivo Excel de evaluación docente.
+
+        Con actualizar, un libro de una evaluación ya registrada no se rechaza: se
+        aplican solo los ítems que cambiaron (ver actualizar_evaluacion).
+        """
+        duraciones = {}
+        datos = None
+        try:
+            self.logger.info(f"Iniciando procesamiento de archivo: {os.path.basename(ruta_archivo)}")
             
-            self.conn.commit()
-            self.conn.commit()
-            self.logger.info(f"Archivo procesado correctamente. EvaluacionID: {evaluacion_id}")
+            with medir(duraciones, 'manifiesto'):
+                evaluacion_existente = self.buscar_en_manifiesto(ruta_archivo, solo_firma=True)
+            if not evaluacion_existente:
+                # El hash se calcula una sola vez, al extraer el archivo
+                try:
+                    datos = extraer_evaluacion(ruta_archivo, self.estados_validos, duraciones)
+                except LibroConsolidado:
+                    return self._procesar_libro_consolidado(ruta_archivo, actualizar)
+                with medir(duraciones, 'manifiesto'):
+                    evaluacion_existente = self.buscar_hash_en_manifiesto(datos['hash_contenido'])
+            if evaluacion_existente and actualizar:
+                # El mismo contenido ya se cargó: no hay nada que actualizar
+                self.logger.info(f"Archivo sin cambios (EvaluacionID: {evaluacion_existente})")
+                return True
+            if evaluacion_existente:
+                raise ValueError(f"Ya existe una evaluación para este archivo (EvaluacionID: {evaluacion_existente})")
+            
+            if actualizar:
+                evaluacion_id = self.actualizar_evaluacion(datos)['evaluacion_id']
+            else:
+                evaluacion_id = self.registrar_evaluacion(datos)
+            self.metricas.archivo(ruta_archivo, True, duraciones, evaluacion_id, len(datos['resultados']))
+            if evaluacion_id is None:
+                self.notificar(
+                    "info", "Guardado sin conexión",
+                    "El servidor no está disponible: la evaluación quedó en el diario local "
+                    "y se enviará al sincronizar."
+                )
             return True
             
         except Exception as e:
             error_msg = f"Error procesando archivo: {str(e)}"
             self.logger.error(error_msg)
-            if self.conn:
-                self.conn.rollback()
+            self.metricas.archivo(
+                ruta_archivo, False, duraciones, filas=len(datos['resultados']) if datos else None, error=str(e)
+            )
             
             if "Ya existe una evaluación" in str(e):
-                messagebox.showwarning(
+                self.notificar(
+                    "advertencia",
                     "Evaluación Duplicada", 
                     "Esta evaluación ya ha sido registrada anteriormente."
                 )
             else:
-                messagebox.showerror("Error", error_msg)
+                self.notificar("error", "Error", error_msg)
             return False
             
         finally:
-            if self.conn:
-                self.conn.close()
-                self.conn = None
+            self.cerrar_conexion()
+
+    def procesar_libro_excel(self, ruta_archivo: str, callback: Optional[Callable[[Dict], None]] = None,
+                             actualizar: bool = False) -> List[Dict]:
+        """Registra una por una las evaluaciones de un libro consolidado.
+
+        Cada evaluación se confirma o se revierte por separado, de modo que un
+        error en una no impide registrar las demás. Devuelve un resultado por
+        evaluación (origen, exito, evaluacion_id, duplicado, error) y llama a
+        callback con cada uno a medida que se procesa. Con actualizar las
+        evaluaciones ya registradas se corrigen (ver actualizar_evaluacion) y el
+        resultado incluye 'cambios' y 'eliminados'.
+        """
+        resultados = []
+        for datos in extraer_evaluaciones(ruta_archivo, self.estados_validos):
+            archivo_metricas = f"{ruta_archivo} [{datos['origen']}]"
+            resultado = {
+                'origen': datos['origen'],
+                'docente': datos.get('nombre_docente'),
+                'asignatura': datos.get('asignatura'),
+                'exito': False,
+                'evaluacion_id': None,
+                'duplicado': False,
+                'error': datos.get('error'),
+                'correcciones': [],
+                'duraciones': datos['duraciones']
+            }
+            if resultado['error'] is None:
+                try:
+                    if actualizar:
+                        actualizacion = self.actualizar_evaluacion(datos)
+                        resultado['evaluacion_id'] = actualizacion['evaluacion_id']
+                        resultado['cambios'] = actualizacion['cambios']
+                        resultado['eliminados'] = actualizacion['eliminados']
+                    else:
+                        resultado['evaluacion_id'] = self.registrar_evaluacion(datos)
+                    resultado['exito'] = True
+                    if 'id_diario' in datos:
+                        resultado['en_diario'] = datos['id_diario']
+                except Exception as e:
+                    resultado['error'] = str(e)
+                    resultado['duplicado'] = "Ya existe una evaluación" in str(e)
+                resultado['correcciones'] = datos.get('correcciones', [])
+            
+            if resultado['error']:
+                self.logger.error(f"Error en {os.path.basename(ruta_archivo)} [{datos['origen']}]: {resultado['error']}")
+            self.metricas.archivo(
+                archivo_metricas, resultado['exito'], resultado['duraciones'], resultado['evaluacion_id'],
+                len(datos['resultados']) if 'resultados' in datos else None, resultado['error']
+            )
+            resultados.append(resultado)
+            if callback:
+                callback(resultado)
+        return resultados
+
+    def _procesar_libro_consolidado(self, ruta_archivo: str, actualizar: bool = False) -> bool:
+        """Procesa un libro consolidado y notifica un resumen de sus evaluaciones"""
+        resultados = self.procesar_libro_excel(ruta_archivo, actualizar=actualizar)
+        registradas = sum(1 for resultado in resultados if resultado['exito'])
+        duplicadas = sum(1 for resultado in resultados if resultado['duplicado'])
+        fallidas = len(resultados) - registradas - duplicadas
+        mensaje = (
+            f"{os.path.basename(ruta_archivo)}: {registradas} de {len(resultados)} evaluaciones registradas"
+            + (f", {duplicadas} duplicadas" if duplicadas else "")
+            + (f", {fallidas} con errores" if fallidas else "")
+        )
+        self.logger.info(mensaje)
+        if fallidas:
+            self.notificar("error", "Libro consolidado", mensaje)
+        elif duplicadas:
+            self.notificar("advertencia", "Libro consolidado", mensaje)
+        return bool(resultados) and registradas == len(resultados)
 
     def obtener_facultades(self) -> List[str]:
         """Obtiene la lista de facultades activas"""
         try:
-            if not self.conn:
-                self.conectar_bd()
-            cursor = self.conn.cursor()
-            cursor.execute("SELECT Nombre FROM Facultades WHERE Estado = 1")
-            return [row[0] for row in cursor.fetchall()]
+            return self.catalogos.facultades()
         except Exception as e:
             self.logger.error(f"Error obteniendo facultades: {str(e)}")
             return []
@@ -224,16 +1203,7 @@ class EvaluacionDocenteSystem:
     def obtener_carreras_por_facultad(self, facultad: str) -> List[str]:
         """Obtiene las carreras activas de una facultad específica"""
         try:
-            if not self.conn:
-                self.conectar_bd()
-            cursor = self.conn.cursor()
-            cursor.execute("""
-                SELECT c.Nombre 
-                FROM Carreras c
-                JOIN Facultades f ON c.FacultadID = f.FacultadID
-                WHERE f.Nombre = ? AND c.Estado = 1
-            """, facultad)
-            return [row[0] for row in cursor.fetchall()]
+            return self.catalogos.carreras_por_facultad(facultad)
         except Exception as e:
             self.logger.error(f"Error obteniendo carreras: {str(e)}")
             return []
@@ -241,42 +1211,59 @@ class EvaluacionDocenteSystem:
     def obtener_categorias_items(self) -> Dict[str, List[str]]:
         """Obtiene las categorías y sus items desde la base de datos"""
         try:
-            if not self.conn:
-                self.conectar_bd()
-            
-            cursor = self.conn.cursor()
-            cursor.execute("""
-                SELECT 
-                    c.Nombre as Categoria,
-                    i.Nombre as Item
-                FROM CategoriasEvaluacion c
-                INNER JOIN ItemsEvaluacion i ON c.CategoriaID = i.CategoriaID
-                WHERE c.Estado = 1 AND i.Estado = 1
-                ORDER BY c.Orden, i.Orden
-            """)
-            
-            categorias = {}
-            for row in cursor.fetchall():
-                categoria, item = row
-                if categoria not in categorias:
-                    categorias[categoria] = []
-                categorias[categoria].append(item)
-            
-            return categorias
+            return self.catalogos.categorias_items()
         except Exception as e:
             error_msg = f"Error obteniendo categorías: {str(e)}"
             self.logger.error(error_msg)
-            messagebox.showerror("Error", error_msg)
+            self.notificar("error", "Error", error_msg)
             return {}
 
-    def obtener_evaluaciones_docente(self, nombre_docente: str) -> List[Dict]:
-        """Obtiene todas las evaluaciones de un docente"""
-        try:
-            if not self.conn:
-                self.conectar_bd()
-            
-            cursor = self.conn.cursor()
-            cursor.execute("""
+    def obtener_id_docente(self, nombre_docente: str) -> Optional[int]:
+        """Resuelve el DocenteID de un nombre completo usando el índice de la caché.
+
+        Un docente aún no presente en la caché provoca una recarga de los
+        catálogos; si tampoco figura después se devuelve None. Si varios
+        docentes comparten el nombre se lanza ValueError.
+        """
+        return self.catalogos.id_referencia('docentes', nombre_docente, recargar=True)
+
+    def iterar_evaluaciones_docente(self, nombre_docente: str, periodo: Optional[str] = None,
+                                    fecha_desde: Optional[datetime] = None, fecha_hasta: Optional[datetime] = None,
+                                    pagina: Optional[int] = None, tamano_pagina: int = 50,
+                                    tamano_bloque: int = 500) -> Iterator[Dict]:
+        """Genera las evaluaciones de un docente de la más reciente a la más antigua.
+
+        Las filas se leen en bloques de tamano_bloque. Con pagina (desde 1) solo se
+        devuelve esa página de tamano_pagina filas; periodo y el rango de fechas
+        (fecha_hasta exclusiva) filtran en el servidor.
+        """
+        docente_id = self.obtener_id_docente(nombre_docente)
+        if docente_id is None:
+            return
+        
+        condiciones = ["e.DocenteID = ?", "e.Estado = 1"]
+        parametros = [docente_id]
+        if periodo:
+            periodo_id = self.catalogos.id_referencia('periodos', periodo, recargar=True)
+            if periodo_id is None:
+                return
+            condiciones.append("e.PeriodoID = ?")
+            parametros.append(periodo_id)
+        if fecha_desde:
+            condiciones.append("e.FechaEvaluacion >= ?")
+            parametros.append(fecha_desde)
+        if fecha_hasta:
+            condiciones.append("e.FechaEvaluacion < ?")
+            parametros.append(fecha_hasta)
+        
+        paginacion = ""
+        if pagina is not None:
+            paginacion = "OFFSET ? ROWS FETCH NEXT ? ROWS ONLY"
+            parametros.extend([(max(pagina, 1) - 1) * tamano_pagina, tamano_pagina])
+        
+        with self.conexion() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
                 SELECT 
                     e.EvaluacionID,
                     p.Nombre as PeriodoAcademico,
@@ -285,29 +1272,135 @@ class EvaluacionDocenteSystem:
                     e.FechaEvaluacion,
                     e.PorcentajeCumplimiento
                 FROM Evaluaciones e
-                INNER JOIN Docentes d ON e.DocenteID = d.DocenteID
                 INNER JOIN PeriodosAcademicos p ON e.PeriodoID = p.PeriodoID
                 INNER JOIN Asignaturas a ON e.AsignaturaID = a.AsignaturaID
                 INNER JOIN Carreras c ON e.CarreraID = c.CarreraID
-                WHERE d.Nombres + ' ' + d.Apellidos = ?
-                AND e.Estado = 1
-                ORDER BY e.FechaEvaluacion DESC
-            """, nombre_docente)
-            
-            evaluaciones = []
-            for row in cursor.fetchall():
-                evaluaciones.append({
-                    'evaluacion_id': row[0],
-                    'periodo': row[1],
-                    'asignatura': row[2],
-                    'carrera': row[3],
-                    'fecha': row[4],
-                    'porcentaje': row[5]
-                })
+                WHERE {" AND ".join(condiciones)}
+                ORDER BY e.FechaEvaluacion DESC, e.EvaluacionID DESC
+                {paginacion}
+            """, parametros)
             
-            return evaluaciones
+            while True:
+                filas = cursor.fetchmany(tamano_bloque)
+                if not filas:
+                    break
+                for row in filas:
+                    yield {
+                        'evaluacion_id': row[0],
+                        'periodo': row[1],
+                        'asignatura': row[2],
+                        'carrera': row[3],
+                        'fecha': row[4],
+                        'porcentaje': row[5]
+                    }
+
+    def obtener_evaluaciones_docente(self, nombre_docente: str) -> List[Dict]:
+        """Obtiene todas las evaluaciones de un docente"""
+        try:
+            return list(self.iterar_evaluaciones_docente(nombre_docente))
             
         except Exception as e:
             error_msg = f"Error obteniendo evaluaciones del docente: {str(e)}"
             self.logger.error(error_msg)
-            return []
\ No newline at end of file
+            return []
+
+    def contar_evaluaciones(self, periodo: Optional[str] = None) -> List[Tuple[str, int]]:
+        """Cantidad de evaluaciones activas por periodo o, si se indica periodo, por facultad.
+
+        Usa una conexión propia del pool para no interferir con una ingesta en curso.
+        """
+        if periodo is None:
+            sql = """
+                SELECT p.Nombre, COUNT(*)
+                FROM Evaluaciones e
+                INNER JOIN PeriodosAcademicos p ON e.PeriodoID = p.PeriodoID
+                WHERE e.Estado = 1
+                GROUP BY p.Nombre
+                ORDER BY p.Nombre DESC
+            """
+            parametros = []
+        else:
+            sql = """
+                SELECT f.Nombre, COUNT(*)
+                FROM Evaluaciones e
+                INNER JOIN PeriodosAcademicos p ON e.PeriodoID = p.PeriodoID
+                INNER JOIN Carreras c ON e.CarreraID = c.CarreraID
+                INNER JOIN Facultades f ON c.FacultadID = f.FacultadID
+                WHERE e.Estado = 1 AND p.Nombre = ?
+                GROUP BY f.Nombre
+                ORDER BY f.Nombre
+            """
+            parametros = [periodo]
+        with self.pool.conexion() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, parametros)
+            return [(row[0], row[1]) for row in cursor.fetchall()]
+
+    def pagina_evaluaciones(self, periodo: str, facultad: str, despues_de: Optional[int] = None,
+                            tamano_pagina: int = 200) -> List[Dict]:
+        """Una página de evaluaciones de un periodo y facultad, de la más reciente a la más antigua.
+
+        La paginación es por clave (EvaluacionID menor que despues_de), por lo que
+        el costo de una página no crece con las páginas anteriores.
+        """
+        periodo_id = self.catalogos.id_referencia('periodos', periodo, recargar=True)
+        if periodo_id is None:
+            return []
+        condiciones = ["e.Estado = 1", "e.PeriodoID = ?", "f.Nombre = ?"]
+        parametros = [periodo_id, facultad]
+        if despues_de is not None:
+            condiciones.append("e.EvaluacionID < ?")
+            parametros.append(despues_de)
+
+        with self.pool.conexion() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT TOP {int(tamano_pagina)}
+                    e.EvaluacionID,
+                    d.Nombres,
+                    d.Apellidos,
+                    a.Nombre,
+                    c.Nombre,
+                    e.FechaEvaluacion,
+                    e.PorcentajeCumplimiento
+                FROM Evaluaciones e
+                INNER JOIN Carreras c ON e.CarreraID = c.CarreraID
+                INNER JOIN Facultades f ON c.FacultadID = f.FacultadID
+                INNER JOIN Docentes d ON e.DocenteID = d.DocenteID
+                INNER JOIN Asignaturas a ON e.AsignaturaID = a.AsignaturaID
+                WHERE {" AND ".join(condiciones)}
+                ORDER BY e.EvaluacionID DESC
+            """, parametros)
+            return [
+                {
+                    'evaluacion_id': row[0],
+                    'docente': f"{row[1]} {row[2]}",
+                    'asignatura': row[3],
+                    'carrera': row[4],
+                    'fecha': row[5],
+                    'porcentaje': row[6]
+                }
+                for row in cursor.fetchall()
+            ]
+
+    def resultados_evaluacion(self, evaluacion_id: int) -> Dict[str, List[Dict]]:
+        """Resultados de una evaluación agrupados por categoría, en el orden del catálogo"""
+        with self.pool.conexion() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT cat.Nombre, i.Nombre, r.Estado, r.FechaRevision, r.Observaciones
+                FROM ResultadosEvaluacion r
+                INNER JOIN ItemsEvaluacion i ON r.ItemID = i.ItemID
+                INNER JOIN CategoriasEvaluacion cat ON i.CategoriaID = cat.CategoriaID
+                WHERE r.EvaluacionID = ?
+                ORDER BY cat.Orden, i.Orden
+            """, evaluacion_id)
+            categorias = {}
+            for row in cursor.fetchall():
+                categorias.setdefault(row[0], []).append({
+                    'item': row[1],
+                    'estado': row[2],
+                    'fecha': row[3],
+                    'observaciones': row[4]
+                })
+            return categorias
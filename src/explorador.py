@@ -0,0 +1,292 @@
+import queue
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk
+from typing import Callable, Dict, List, Optional
+
+# Evaluaciones que se traen por consulta al expandir una facultad o desplazarse
+TAMANO_PAGINA = 200
+# Fracción de la lista visible a partir de la cual se pide la página siguiente
+UMBRAL_DESPLAZAMIENTO = 0.9
+
+
+class ExploradorEvaluaciones:
+    """Ventana para explorar las categorías y las evaluaciones registradas.
+
+    Los árboles cargan los hijos de un nodo al expandirlo (periodo -> facultad
+    -> evaluación -> categoría -> ítem) y las evaluaciones de una facultad se
+    traen por páginas a medida que se desplaza la lista. Las consultas se
+    ejecutan de a una en un hilo de fondo, por lo que la ventana se abre sin
+    esperar a la base de datos y no se bloquea mientras carga.
+    """
+
+    def __init__(self, root: tk.Tk, obtener_sistema: Callable, registrar: Callable[[str, str], None],
+                 pestana: str = 'evaluaciones'):
+        self.obtener_sistema = obtener_sistema
+        self.registrar = registrar
+        self._consultas = ThreadPoolExecutor(max_workers=1)
+        self._cola = queue.Queue()
+        # Datos de cada nodo de los árboles: tipo, parámetros de la consulta y estado de carga
+        self._nodos: Dict[str, Dict] = {}
+        # Nodos "más evaluaciones" que todavía no pidieron su página
+        self._paginas_pendientes = set()
+
+        self.ventana = tk.Toplevel(root)
+        self.ventana.title("Explorador de Evaluaciones")
+        self.ventana.geometry("1000x650")
+        self.ventana.columnconfigure(0, weight=1)
+        self.ventana.rowconfigure(0, weight=1)
+        self.ventana.bind('<Destroy>', self._al_cerrar)
+
+        cuaderno = ttk.Notebook(self.ventana)
+        cuaderno.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=10, pady=10)
+        self.arbol_evaluaciones = self._crear_arbol(
+            cuaderno, "Evaluaciones",
+            [("#0", "Periodo / Facultad / Evaluación", 260), ("docente", "Docente / Estado", 200),
+             ("asignatura", "Asignatura / Observaciones", 180), ("carrera", "Carrera", 150),
+             ("fecha", "Fecha", 90), ("cumplimiento", "Cumplimiento", 90)]
+        )
+        self.arbol_categorias = self._crear_arbol(
+            cuaderno, "Categorías",
+            [("#0", "Categoría / Ítem de evaluación", 900)]
+        )
+        if pestana == 'categorias':
+            cuaderno.select(1)
+
+        self.estado_label = ttk.Label(self.ventana, text="")
+        self.estado_label.grid(row=1, column=0, sticky=tk.W, padx=10)
+        ttk.Button(self.ventana, text="Cerrar", command=self.ventana.destroy).grid(row=2, column=0, pady=10)
+
+        self._abierta = True
+        self.ventana.after(50, self._atender_cola)
+        self._consultar("periodos", lambda s: s.contar_evaluaciones(), self._mostrar_periodos)
+        self._consultar("categorías", lambda s: list(s.catalogos.categorias_items()), self._mostrar_categorias)
+
+    def _crear_arbol(self, cuaderno: ttk.Notebook, titulo: str, columnas: List) -> ttk.Treeview:
+        marco = ttk.Frame(cuaderno, padding="5")
+        marco.columnconfigure(0, weight=1)
+        marco.rowconfigure(0, weight=1)
+        cuaderno.add(marco, text=titulo)
+
+        arbol = ttk.Treeview(marco, columns=[columna for columna, _, _ in columnas[1:]], show="tree headings")
+        for columna, encabezado, ancho in columnas:
+            arbol.heading(columna, text=encabezado)
+            arbol.column(columna, width=ancho, stretch=columna in ("#0", "docente"))
+        scrollbar = ttk.Scrollbar(marco, orient="vertical", command=arbol.yview)
+
+        def al_desplazar(primero, ultimo):
+            scrollbar.set(primero, ultimo)
+            if float(ultimo) >= UMBRAL_DESPLAZAMIENTO:
+                self._cargar_paginas_visibles(arbol)
+
+        arbol.configure(yscrollcommand=al_desplazar)
+        arbol.bind('<<TreeviewOpen>>', lambda evento: self._al_expandir(arbol, arbol.focus()))
+        arbol.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        return arbol
+
+    # Consultas en segundo plano
+
+    def _consultar(self, descripcion: str, consulta: Callable, al_terminar: Callable,
+                   al_fallar: Optional[Callable[[], None]] = None):
+        """Ejecuta consulta(sistema) en el hilo de fondo y entrega el resultado a al_terminar.
+
+        Si la consulta falla se registra el error y se llama a al_fallar.
+        """
+        def ejecutar():
+            try:
+                self._cola.put((al_terminar, al_fallar, consulta(self.obtener_sistema()), None))
+            except Exception as e:
+                self._cola.put((al_terminar, al_fallar, None, f"Error cargando {descripcion}: {str(e)}"))
+
+        self.estado_label.config(text=f"Cargando {descripcion}...")
+        self._consultas.submit(ejecutar)
+
+    def _atender_cola(self):
+        """Entrega en el hilo de la interfaz los resultados de las consultas terminadas"""
+        if not self._abierta:
+            return
+        try:
+            while True:
+                al_terminar, al_fallar, resultado, error = self._cola.get_nowait()
+                if error:
+                    self.estado_label.config(text=error)
+                    self.registrar(error, "ERROR")
+                    if al_fallar:
+                        al_fallar()
+                else:
+                    self.estado_label.config(text="")
+                    al_terminar(resultado)
+        except queue.Empty:
+            pass
+        self.ventana.after(50, self._atender_cola)
+
+    def _al_cerrar(self, evento):
+        if evento.widget is self.ventana and self._abierta:
+            self._abierta = False
+            self._consultas.shutdown(wait=False, cancel_futures=True)
+
+    # Carga diferida de nodos
+
+    def _insertar(self, arbol: ttk.Treeview, padre: str, texto: str, valores=(), datos: Optional[Dict] = None) -> str:
+        """Inserta un nodo; si tiene datos se puede expandir y sus hijos se cargan al abrirlo"""
+        iid = arbol.insert(padre, "end", text=texto, values=valores)
+        if datos is not None:
+            self._nodos[iid] = dict(datos, estado=None)
+            # Hijo provisional para que el nodo muestre el indicador de expansión
+            arbol.insert(iid, "end", text="Cargando...")
+        return iid
+
+    def _reemplazar_hijos(self, arbol: ttk.Treeview, iid: str):
+        if arbol.exists(iid):
+            arbol.delete(*arbol.get_children(iid))
+
+    def _restablecer(self, arbol: ttk.Treeview, iid: str):
+        """Deja como sin cargar un nodo cuya consulta falló, para reintentarla al expandirlo"""
+        nodo = self._nodos.get(iid)
+        if nodo is None or not arbol.exists(iid):
+            return
+        nodo['estado'] = None
+        self._reemplazar_hijos(arbol, iid)
+        arbol.insert(iid, "end", text="Cargando...")
+        arbol.item(iid, open=False)
+
+    def _al_expandir(self, arbol: ttk.Treeview, iid: str):
+        nodo = self._nodos.get(iid)
+        if nodo is None or nodo['estado'] is not None:
+            return
+        nodo['estado'] = 'cargando'
+        tipo = nodo['tipo']
+        if tipo == 'periodo':
+            self._consultar(
+                f"facultades de {nodo['periodo']}",
+                lambda s: s.contar_evaluaciones(nodo['periodo']),
+                lambda filas: self._mostrar_facultades(iid, filas),
+                lambda: self._restablecer(arbol, iid)
+            )
+        elif tipo == 'facultad':
+            self._cargar_pagina(iid)
+        elif tipo == 'evaluacion':
+            self._consultar(
+                f"resultados de la evaluación {nodo['evaluacion_id']}",
+                lambda s: s.resultados_evaluacion(nodo['evaluacion_id']),
+                lambda categorias: self._mostrar_resultados(iid, categorias),
+                lambda: self._restablecer(arbol, iid)
+            )
+        elif tipo == 'categoria_resultados':
+            # Los resultados ya se trajeron con la evaluación
+            self._reemplazar_hijos(arbol, iid)
+            for resultado in nodo['resultados']:
+                arbol.insert(iid, "end", text=resultado['item'], values=(
+                    resultado['estado'], resultado['observaciones'] or "", "", _fecha(resultado['fecha']), ""
+                ))
+            nodo['estado'] = 'cargado'
+        elif tipo == 'categoria':
+            self._consultar(
+                f"ítems de {nodo['categoria']}",
+                lambda s: s.catalogos.items_por_categoria(nodo['categoria']),
+                lambda items: self._mostrar_items(iid, items),
+                lambda: self._restablecer(arbol, iid)
+            )
+
+    def _mostrar_periodos(self, filas):
+        arbol = self.arbol_evaluaciones
+        if not filas:
+            arbol.insert("", "end", text="No hay evaluaciones registradas")
+        for periodo, cantidad in filas:
+            self._insertar(arbol, "", f"{periodo} ({cantidad})", datos={'tipo': 'periodo', 'periodo': periodo})
+
+    def _mostrar_facultades(self, iid: str, filas):
+        arbol = self.arbol_evaluaciones
+        self._reemplazar_hijos(arbol, iid)
+        periodo = self._nodos[iid]['periodo']
+        for facultad, cantidad in filas:
+            self._insertar(arbol, iid, f"{facultad} ({cantidad})", datos={
+                'tipo': 'facultad', 'periodo': periodo, 'facultad': facultad, 'ultimo_id': None
+            })
+        self._nodos[iid]['estado'] = 'cargado'
+
+    def _cargar_pagina(self, iid: str, mas: Optional[str] = None):
+        """Pide la página siguiente de evaluaciones de una facultad (mas: su nodo "más evaluaciones")"""
+        nodo = self._nodos[iid]
+        self._consultar(
+            f"evaluaciones de {nodo['facultad']}",
+            lambda s: s.pagina_evaluaciones(nodo['periodo'], nodo['facultad'], nodo['ultimo_id'], TAMANO_PAGINA),
+            lambda evaluaciones: self._mostrar_pagina(iid, evaluaciones),
+            lambda: self._pagina_fallida(iid, mas)
+        )
+
+    def _pagina_fallida(self, iid: str, mas: Optional[str]):
+        """Permite volver a pedir una página cuya consulta falló"""
+        if mas is None:
+            self._restablecer(self.arbol_evaluaciones, iid)
+        elif self.arbol_evaluaciones.exists(mas):
+            # Se reintenta al volver a desplazar la lista
+            self._paginas_pendientes.add(mas)
+
+    def _mostrar_pagina(self, iid: str, evaluaciones: List[Dict]):
+        arbol = self.arbol_evaluaciones
+        if not arbol.exists(iid):
+            return
+        nodo = self._nodos[iid]
+        if nodo['ultimo_id'] is None:
+            self._reemplazar_hijos(arbol, iid)
+        else:
+            # Quitar el nodo "más evaluaciones" de la página anterior
+            ultimo = arbol.get_children(iid)[-1]
+            self._nodos.pop(ultimo, None)
+            self._paginas_pendientes.discard(ultimo)
+            arbol.delete(ultimo)
+        for evaluacion in evaluaciones:
+            porcentaje = evaluacion['porcentaje']
+            self._insertar(
+                arbol, iid, f"Evaluación {evaluacion['evaluacion_id']}",
+                valores=(
+                    evaluacion['docente'], evaluacion['asignatura'], evaluacion['carrera'],
+                    _fecha(evaluacion['fecha']), f"{float(porcentaje):.1f}%" if porcentaje is not None else ""
+                ),
+                datos={'tipo': 'evaluacion', 'evaluacion_id': evaluacion['evaluacion_id']}
+            )
+        if evaluaciones:
+            nodo['ultimo_id'] = evaluaciones[-1]['evaluacion_id']
+        if len(evaluaciones) == TAMANO_PAGINA:
+            mas = arbol.insert(iid, "end", text="Más evaluaciones (desplácese para cargar)...")
+            self._nodos[mas] = {'tipo': 'mas', 'facultad_iid': iid, 'estado': None}
+            self._paginas_pendientes.add(mas)
+        nodo['estado'] = 'cargado'
+
+    def _cargar_paginas_visibles(self, arbol: ttk.Treeview):
+        """Carga la página siguiente de las facultades cuyo final está a la vista"""
+        for iid in list(self._paginas_pendientes):
+            if not arbol.exists(iid):
+                self._paginas_pendientes.discard(iid)
+            elif arbol.bbox(iid):
+                self._paginas_pendientes.discard(iid)
+                self._cargar_pagina(self._nodos[iid]['facultad_iid'], iid)
+
+    def _mostrar_resultados(self, iid: str, categorias: Dict[str, List[Dict]]):
+        arbol = self.arbol_evaluaciones
+        self._reemplazar_hijos(arbol, iid)
+        for categoria, resultados in categorias.items():
+            self._insertar(arbol, iid, f"{categoria} ({len(resultados)} ítems)", datos={
+                'tipo': 'categoria_resultados', 'resultados': resultados
+            })
+        self._nodos[iid]['estado'] = 'cargado'
+
+    def _mostrar_categorias(self, categorias: List[str]):
+        for categoria in categorias:
+            self._insertar(self.arbol_categorias, "", categoria, datos={'tipo': 'categoria', 'categoria': categoria})
+
+    def _mostrar_items(self, iid: str, items: List[str]):
+        arbol = self.arbol_categorias
+        self._reemplazar_hijos(arbol, iid)
+        for item in items:
+            arbol.insert(iid, "end", text=item)
+        self._nodos[iid]['estado'] = 'cargado'
+
+
+def _fecha(valor) -> str:
+    """Fecha de la base de datos como texto (AAAA-MM-DD)"""
+    if valor is None:
+        return ""
+    return valor.strftime('%Y-%m-%d') if hasattr(valor, 'strftime') else str(valor)[:10]
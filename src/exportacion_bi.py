@@ -0,0 +1,321 @@
+import os
+import json
+import time
+import logging
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Firma de cada partición (periodo, facultad): la anterior cubre lo ya exportado
+# (EvaluacionID <= marca) y la nueva todo lo que se exporta en esta ejecución.
+# Incluye el Estado para detectar bajas lógicas y los resultados de cada evaluación.
+# Es una heurística: recorre todo el historial en cada ejecución y dos contenidos
+# distintos pueden dar la misma firma. Se suman los BINARY_CHECKSUM como BIGINT
+# junto con la cantidad de filas en lugar de CHECKSUM_AGG, cuyo XOR se anula con
+# valores repetidos; exportar(completa=True) reescribe todo ante cualquier duda.
+SQL_FIRMAS_PARTICIONES = """
+    SELECT
+        e.PeriodoID,
+        c.FacultadID,
+        p.Nombre,
+        f.Nombre,
+        CASE WHEN COUNT_BIG(CASE WHEN e.EvaluacionID <= ? THEN 1 END) > 0 THEN CONCAT(
+            COUNT_BIG(CASE WHEN e.EvaluacionID <= ? THEN 1 END), ':',
+            SUM(CASE WHEN e.EvaluacionID <= ? THEN CAST(x.Firma AS BIGINT) END)
+        ) END,
+        CONCAT(COUNT_BIG(*), ':', SUM(CAST(x.Firma AS BIGINT)))
+    FROM Evaluaciones e
+    INNER JOIN PeriodosAcademicos p ON e.PeriodoID = p.PeriodoID
+    INNER JOIN Carreras c ON e.CarreraID = c.CarreraID
+    INNER JOIN Facultades f ON c.FacultadID = f.FacultadID
+    OUTER APPLY (
+        SELECT
+            COUNT_BIG(*) AS Cantidad,
+            SUM(CAST(BINARY_CHECKSUM(r.ItemID, r.Estado, r.FechaRevision, r.Observaciones) AS BIGINT)) AS Suma
+        FROM ResultadosEvaluacion r
+        WHERE r.EvaluacionID = e.EvaluacionID
+    ) res
+    CROSS APPLY (
+        SELECT BINARY_CHECKSUM(e.EvaluacionID, e.Estado, e.DocenteID, e.AsignaturaID, e.CarreraID,
+                               e.FechaEvaluacion, e.PorcentajeCumplimiento, res.Cantidad, res.Suma) AS Firma
+    ) x
+    WHERE e.EvaluacionID <= ?
+    GROUP BY e.PeriodoID, c.FacultadID, p.Nombre, f.Nombre
+"""
+
+# Evaluaciones nuevas (entre la marca anterior y la actual) o de particiones a reescribir
+SQL_FILTRO_EXPORTACION = """
+    e.Estado = 1 AND e.EvaluacionID <= ? AND (
+        e.EvaluacionID > ?
+        OR CONCAT(e.PeriodoID, '-', c.FacultadID) IN (SELECT value FROM STRING_SPLIT(?, ','))
+    )
+"""
+
+SQL_EXPORTAR_EVALUACIONES = """
+    SELECT
+        e.EvaluacionID,
+        p.Nombre,
+        f.Nombre,
+        c.Nombre,
+        d.Nombres + ' ' + d.Apellidos,
+        a.Nombre,
+        e.FechaEvaluacion,
+        e.PorcentajeCumplimiento
+    FROM Evaluaciones e
+    INNER JOIN PeriodosAcademicos p ON e.PeriodoID = p.PeriodoID
+    INNER JOIN Carreras c ON e.CarreraID = c.CarreraID
+    INNER JOIN Facultades f ON c.FacultadID = f.FacultadID
+    INNER JOIN Docentes d ON e.DocenteID = d.DocenteID
+    INNER JOIN Asignaturas a ON e.AsignaturaID = a.AsignaturaID
+    WHERE {filtro}
+    ORDER BY e.EvaluacionID
+"""
+
+SQL_EXPORTAR_RESULTADOS = """
+    SELECT
+        r.EvaluacionID,
+        p.Nombre,
+        f.Nombre,
+        cat.Nombre,
+        i.Nombre,
+        r.Estado,
+        r.FechaRevision,
+        r.Observaciones
+    FROM ResultadosEvaluacion r
+    INNER JOIN Evaluaciones e ON r.EvaluacionID = e.EvaluacionID
+    INNER JOIN PeriodosAcademicos p ON e.PeriodoID = p.PeriodoID
+    INNER JOIN Carreras c ON e.CarreraID = c.CarreraID
+    INNER JOIN Facultades f ON c.FacultadID = f.FacultadID
+    INNER JOIN ItemsEvaluacion i ON r.ItemID = i.ItemID
+    INNER JOIN CategoriasEvaluacion cat ON i.CategoriaID = cat.CategoriaID
+    WHERE {filtro}
+    ORDER BY r.EvaluacionID, cat.Orden, i.Orden
+"""
+
+
+def _esquemas() -> Dict:
+    """Esquemas fijos de las tablas exportadas (sin las columnas de partición)"""
+    return {
+        'evaluaciones': pa.schema([
+            ('evaluacion_id', pa.int64()),
+            ('carrera', pa.string()),
+            ('docente', pa.string()),
+            ('asignatura', pa.string()),
+            ('fecha_evaluacion', pa.timestamp('ms')),
+            ('porcentaje_cumplimiento', pa.float64())
+        ]),
+        'resultados': pa.schema([
+            ('evaluacion_id', pa.int64()),
+            ('categoria', pa.string()),
+            ('item', pa.string()),
+            ('estado', pa.string()),
+            ('fecha_revision', pa.timestamp('ms')),
+            ('observaciones', pa.string())
+        ])
+    }
+
+
+def _valor(valor):
+    """Convierte los DECIMAL de pyodbc a float para Arrow"""
+    return float(valor) if isinstance(valor, Decimal) else valor
+
+
+class _EscritorParticiones:
+    """Un ParquetWriter abierto por partición durante la exportación de una tabla.
+
+    Cada bloque se escribe como un grupo de filas, por lo que la memoria no
+    depende del tamaño total. Los archivos quedan como temporales hasta publicar().
+    """
+
+    def __init__(self, directorio: str, esquema, nombre_archivo: str):
+        self.directorio = directorio
+        self.esquema = esquema
+        self.nombre_archivo = nombre_archivo
+        self._escritores: Dict[Tuple[str, str], Tuple[str, object]] = {}
+        self.filas = 0
+
+    def ruta_particion(self, periodo: str, facultad: str) -> str:
+        return os.path.join(
+            self.directorio, f"periodo={quote(periodo, safe='')}", f"facultad={quote(facultad, safe='')}"
+        )
+
+    def escribir(self, filas: List[Tuple]):
+        """Escribe un bloque de filas (id, periodo, facultad, columnas...)"""
+        grupos: Dict[Tuple[str, str], List[Tuple]] = {}
+        for fila in filas:
+            grupos.setdefault((fila[1], fila[2]), []).append((fila[0],) + tuple(fila[3:]))
+
+        for particion, grupo in grupos.items():
+            if particion not in self._escritores:
+                ruta = self.ruta_particion(*particion)
+                os.makedirs(ruta, exist_ok=True)
+                temporal = os.path.join(ruta, self.nombre_archivo + '.tmp')
+                self._escritores[particion] = (temporal, pq.ParquetWriter(temporal, self.esquema))
+            columnas = [[_valor(v) for v in columna] for columna in zip(*grupo)]
+            self._escritores[particion][1].write_table(pa.Table.from_arrays(
+                [pa.array(columna, type=campo.type) for columna, campo in zip(columnas, self.esquema)],
+                schema=self.esquema
+            ))
+            self.filas += len(grupo)
+
+    def cerrar(self):
+        for _, escritor in self._escritores.values():
+            escritor.close()
+
+    def descartar(self):
+        """Cierra y elimina los temporales de una exportación fallida"""
+        for temporal, escritor in self._escritores.values():
+            try:
+                escritor.close()
+                os.remove(temporal)
+            except OSError:
+                pass
+        self._escritores = {}
+
+    def publicar(self, reescribir: List[Tuple[str, str]]):
+        """Reemplaza las particiones a reescribir y renombra los temporales"""
+        for particion in reescribir:
+            ruta = self.ruta_particion(*particion)
+            if os.path.isdir(ruta):
+                for nombre in os.listdir(ruta):
+                    if nombre.endswith('.parquet'):
+                        os.remove(os.path.join(ruta, nombre))
+        for temporal, _ in self._escritores.values():
+            os.replace(temporal, temporal[:-len('.tmp')])
+
+
+class ExportadorParquet:
+    """Exportación incremental de evaluaciones y resultados a Parquet particionado.
+
+    Los datos se escriben en <directorio>/evaluaciones y <directorio>/resultados
+    con particiones periodo=<...>/facultad=<...>. Cada ejecución agrega las
+    evaluaciones con EvaluacionID mayor que la marca de agua guardada; las
+    particiones cuya firma cambió se reescriben completas, lo que cubre
+    modificaciones, bajas lógicas y evaluaciones confirmadas tarde. La firma es
+    una suma de checksums (ver SQL_FIRMAS_PARTICIONES): un cambio puede pasar
+    inadvertido, y exportar(completa=True) reescribe todas las particiones.
+    """
+
+    def __init__(self, sistema, directorio: str, tamano_bloque: int = 5000):
+        if pa is None:
+            raise ImportError("La exportación a Parquet requiere pyarrow (pip install pyarrow)")
+        self.sistema = sistema
+        self.directorio = directorio
+        self.tamano_bloque = tamano_bloque
+        self.ruta_estado = os.path.join(directorio, '_estado_exportacion.json')
+        self.logger = logging.getLogger(__name__)
+
+    def leer_estado(self) -> Dict:
+        """Marca de agua y firmas de la última exportación completa"""
+        try:
+            with open(self.ruta_estado, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'ultimo_id': 0, 'ultima_fecha': None, 'particiones': {}}
+
+    def _guardar_estado(self, estado: Dict):
+        temporal = self.ruta_estado + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(estado, f, ensure_ascii=False, default=str)
+        os.replace(temporal, self.ruta_estado)
+
+    def _exportar_tabla(self, cursor, consulta: str, parametros: List, escritor: _EscritorParticiones):
+        """Lee la consulta por bloques y los escribe en sus particiones"""
+        cursor.execute(consulta, parametros)
+        while True:
+            filas = cursor.fetchmany(self.tamano_bloque)
+            if not filas:
+                break
+            escritor.escribir(filas)
+
+    def exportar(self, completa: bool = False) -> Dict:
+        """Exporta lo nuevo o modificado desde la última ejecución y devuelve un resumen.
+
+        Con completa se ignoran la marca de agua y las firmas guardadas y se
+        reescriben todas las particiones.
+        """
+        inicio = time.perf_counter()
+        estado = self.leer_estado()
+        if completa:
+            estado = {'ultimo_id': 0, 'particiones': {}, 'nombres': estado.get('nombres', {})}
+        ultimo_id = estado['ultimo_id']
+        os.makedirs(self.directorio, exist_ok=True)
+
+        with self.sistema.conexion() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT ISNULL(MAX(EvaluacionID), 0), MAX(FechaEvaluacion) FROM Evaluaciones")
+            tope, ultima_fecha = cursor.fetchone()
+
+            cursor.execute(SQL_FIRMAS_PARTICIONES, [ultimo_id, ultimo_id, ultimo_id, tope])
+            firmas, nombres, reescribir = {}, {}, []
+            for periodo_id, facultad_id, periodo, facultad, firma_anterior, firma_nueva in cursor.fetchall():
+                clave = f"{periodo_id}-{facultad_id}"
+                firmas[clave] = firma_nueva
+                nombres[clave] = (periodo, facultad)
+                if completa or estado['particiones'].get(clave) != firma_anterior:
+                    reescribir.append(clave)
+            # Particiones que ya no tienen evaluaciones
+            eliminadas = [nombres_previos for clave, nombres_previos in estado.get('nombres', {}).items()
+                          if clave not in firmas]
+
+            nombre_archivo = f"part-{ultimo_id + 1:010d}.parquet"
+            esquemas = _esquemas()
+            escritores = {
+                tabla: _EscritorParticiones(os.path.join(self.directorio, tabla), esquemas[tabla], nombre_archivo)
+                for tabla in esquemas
+            }
+            parametros = [tope, ultimo_id, ",".join(reescribir)]
+            try:
+                self._exportar_tabla(
+                    cursor, SQL_EXPORTAR_EVALUACIONES.format(filtro=SQL_FILTRO_EXPORTACION),
+                    parametros, escritores['evaluaciones']
+                )
+                self._exportar_tabla(
+                    cursor, SQL_EXPORTAR_RESULTADOS.format(filtro=SQL_FILTRO_EXPORTACION),
+                    parametros, escritores['resultados']
+                )
+                for escritor in escritores.values():
+                    escritor.cerrar()
+            except Exception:
+                for escritor in escritores.values():
+                    escritor.descartar()
+                raise
+
+        # Publicar los archivos y luego avanzar la marca de agua; si el proceso se
+        # interrumpe antes, la próxima ejecución repite el mismo rango y reemplaza
+        # los archivos con el mismo nombre.
+        particiones_reescritas = [tuple(nombres[clave]) for clave in reescribir]
+        particiones_reescritas += [tuple(particion) for particion in eliminadas]
+        for escritor in escritores.values():
+            escritor.publicar(particiones_reescritas)
+
+        self._guardar_estado({
+            'ultimo_id': tope,
+            'ultima_fecha': ultima_fecha,
+            'particiones': firmas,
+            'nombres': nombres,
+            'exportado_en': datetime.now().isoformat(timespec='seconds')
+        })
+
+        resumen = {
+            'directorio': os.path.abspath(self.directorio),
+            'desde_id': ultimo_id,
+            'hasta_id': tope,
+            'evaluaciones': escritores['evaluaciones'].filas,
+            'resultados': escritores['resultados'].filas,
+            'particiones_reescritas': len(particiones_reescritas),
+            'duracion': round(time.perf_counter() - inicio, 3)
+        }
+        self.logger.info(
+            f"Exportación BI: {resumen['evaluaciones']} evaluaciones y {resumen['resultados']} resultados "
+            f"(EvaluacionID {ultimo_id + 1} a {tope}, {len(particiones_reescritas)} particiones reescritas)"
+        )
+        return resumen
@@ -0,0 +1,322 @@
+import os
+import re
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from cumplimiento import acumular_estado, porcentaje_acumulado
+
+try:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+except ImportError:
+    SimpleDocTemplate = None
+
+FORMATOS_INFORME = ('xlsx', 'pdf')
+
+# Evaluaciones y resultados de todos los docentes en una sola consulta, ordenada
+# por docente para agruparlos a medida que llegan las filas
+SQL_INFORME_DOCENTES = """
+    SELECT
+        e.DocenteID,
+        d.Nombres + ' ' + d.Apellidos,
+        e.EvaluacionID,
+        p.Nombre,
+        f.Nombre,
+        c.Nombre,
+        a.Nombre,
+        e.FechaEvaluacion,
+        e.PorcentajeCumplimiento,
+        cat.Nombre,
+        i.Nombre,
+        r.Estado,
+        r.FechaRevision,
+        r.Observaciones
+    FROM Evaluaciones e
+    INNER JOIN PeriodosAcademicos p ON e.PeriodoID = p.PeriodoID
+    INNER JOIN Carreras c ON e.CarreraID = c.CarreraID
+    INNER JOIN Facultades f ON c.FacultadID = f.FacultadID
+    INNER JOIN Docentes d ON e.DocenteID = d.DocenteID
+    INNER JOIN Asignaturas a ON e.AsignaturaID = a.AsignaturaID
+    LEFT JOIN ResultadosEvaluacion r ON r.EvaluacionID = e.EvaluacionID
+    LEFT JOIN ItemsEvaluacion i ON r.ItemID = i.ItemID
+    LEFT JOIN CategoriasEvaluacion cat ON i.CategoriaID = cat.CategoriaID
+    WHERE {filtro}
+    ORDER BY e.DocenteID, e.FechaEvaluacion, e.EvaluacionID, cat.Orden, i.Orden
+"""
+
+
+def _nombre_archivo(docente: Dict) -> str:
+    """Nombre de archivo seguro para el informe de un docente (sin extensión)"""
+    nombre = re.sub(r'[^\w\- ]', '_', docente['nombre']).strip() or 'docente'
+    return f"{nombre}_{docente['docente_id']}"
+
+
+def _fecha(valor) -> str:
+    """Fecha de la base de datos como texto (AAAA-MM-DD)"""
+    if valor is None:
+        return ""
+    return valor.strftime('%Y-%m-%d') if hasattr(valor, 'strftime') else str(valor)[:10]
+
+
+def _cumplimiento_categorias(docente: Dict) -> List[Tuple[str, float, int]]:
+    """(categoría, porcentaje, ítems aplicables) sobre todas las evaluaciones del docente"""
+    sumas: Dict[str, List[float]] = {}
+    for evaluacion in docente['evaluaciones']:
+        for categoria, _, estado, _, _ in evaluacion['resultados']:
+            acumular_estado(sumas.setdefault(categoria, [0.0, 0]), estado)
+    return [
+        (categoria, porcentaje_acumulado(acumulado), acumulado[1])
+        for categoria, acumulado in sumas.items()
+    ]
+
+
+def _escribir_excel(docente: Dict, ruta: str, titulo: str, categorias: List[Tuple[str, float, int]]):
+    from openpyxl import Workbook
+
+    # Modo de solo escritura: las filas se vuelcan al archivo sin mantener celdas en memoria
+    libro = Workbook(write_only=True)
+    resumen = libro.create_sheet("Resumen")
+    resumen.append(["Informe de evaluación docente"])
+    resumen.append(["Docente", docente['nombre']])
+    resumen.append(["Alcance", titulo])
+    resumen.append(["Evaluaciones", len(docente['evaluaciones'])])
+    resumen.append(["Cumplimiento promedio (%)", docente['promedio']])
+    resumen.append([])
+    resumen.append(["Periodo", "Facultad", "Carrera", "Asignatura", "Fecha", "Cumplimiento (%)"])
+    for evaluacion in docente['evaluaciones']:
+        resumen.append([
+            evaluacion['periodo'], evaluacion['facultad'], evaluacion['carrera'], evaluacion['asignatura'],
+            evaluacion['fecha'], evaluacion['porcentaje']
+        ])
+    resumen.append([])
+    resumen.append(["Categoría", "Cumplimiento (%)", "Ítems aplicables"])
+    for fila in categorias:
+        resumen.append(list(fila))
+
+    detalle = libro.create_sheet("Detalle")
+    detalle.append([
+        "EvaluacionID", "Asignatura", "Categoría", "Ítem", "Estado", "Fecha de revisión", "Observaciones"
+    ])
+    for evaluacion in docente['evaluaciones']:
+        for categoria, item, estado, fecha, observaciones in evaluacion['resultados']:
+            detalle.append([
+                evaluacion['evaluacion_id'], evaluacion['asignatura'], categoria, item, estado, fecha, observaciones
+            ])
+    libro.save(ruta)
+
+
+def _escribir_pdf(docente: Dict, ruta: str, titulo: str, categorias: List[Tuple[str, float, int]]):
+    if SimpleDocTemplate is None:
+        raise ImportError("Los informes en PDF requieren reportlab (pip install reportlab)")
+
+    estilos = getSampleStyleSheet()
+    estilo_tabla = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('ALIGN', (-1, 1), (-1, -1), 'RIGHT')
+    ])
+    evaluaciones = [["Periodo", "Carrera", "Asignatura", "Fecha", "Cumplimiento"]] + [
+        [
+            evaluacion['periodo'], evaluacion['carrera'], evaluacion['asignatura'],
+            _fecha(evaluacion['fecha']),
+            f"{evaluacion['porcentaje']:.2f}%" if evaluacion['porcentaje'] is not None else ""
+        ]
+        for evaluacion in docente['evaluaciones']
+    ]
+    por_categoria = [["Categoría", "Ítems aplicables", "Cumplimiento"]] + [
+        [categoria, cantidad, f"{porcentaje:.2f}%"] for categoria, porcentaje, cantidad in categorias
+    ]
+    promedio = f"{docente['promedio']:.2f}%" if docente['promedio'] is not None else "-"
+    SimpleDocTemplate(ruta, pagesize=A4, title=f"Informe de {docente['nombre']}").build([
+        Paragraph(f"Informe de evaluación docente: {docente['nombre']}", estilos['Title']),
+        Paragraph(titulo, estilos['Normal']),
+        Paragraph(f"{len(docente['evaluaciones'])} evaluaciones, cumplimiento promedio {promedio}", estilos['Normal']),
+        Spacer(1, 12),
+        Table(evaluaciones, repeatRows=1, style=estilo_tabla),
+        Spacer(1, 12),
+        Table(por_categoria, repeatRows=1, style=estilo_tabla)
+    ])
+
+
+def _generar_informe(docente: Dict, directorio: str, formatos: Tuple[str, ...], titulo: str) -> Dict:
+    """Escribe los informes de un docente; se ejecuta en un proceso del pool"""
+    resultado = {
+        'docente': docente['nombre'],
+        'evaluaciones': len(docente['evaluaciones']),
+        'archivos': [],
+        'error': None
+    }
+    try:
+        porcentajes = [e['porcentaje'] for e in docente['evaluaciones'] if e['porcentaje'] is not None]
+        docente['promedio'] = round(sum(porcentajes) / len(porcentajes), 2) if porcentajes else None
+        categorias = _cumplimiento_categorias(docente)
+        base = os.path.join(directorio, _nombre_archivo(docente))
+        for formato in formatos:
+            ruta = f"{base}.{formato}"
+            if formato == 'pdf':
+                _escribir_pdf(docente, ruta, titulo, categorias)
+            else:
+                _escribir_excel(docente, ruta, titulo, categorias)
+            resultado['archivos'].append(ruta)
+    except Exception as e:
+        resultado['error'] = str(e)
+    return resultado
+
+
+def _valor(valor):
+    """Convierte los DECIMAL de pyodbc a float (serializables para Excel y el pool)"""
+    return float(valor) if isinstance(valor, Decimal) else valor
+
+
+class GeneradorInformes:
+    """Informes de fin de periodo por docente, en Excel y/o PDF.
+
+    Las evaluaciones y resultados del periodo o facultad se leen con una sola
+    consulta ordenada por docente, en bloques de tamano_bloque filas; cada
+    docente completo se envía a un proceso del pool para escribir sus archivos.
+    Solo se mantienen en memoria el docente que se está leyendo y una ventana
+    acotada de docentes en cola.
+    """
+
+    def __init__(self, sistema, directorio: str, formatos: Tuple[str, ...] = ('xlsx',),
+                 max_workers: Optional[int] = None, tamano_bloque: int = 5000):
+        desconocidos = [formato for formato in formatos if formato not in FORMATOS_INFORME]
+        if desconocidos or not formatos:
+            raise ValueError(f"Formatos de informe no soportados: {', '.join(desconocidos) or 'ninguno'}")
+        if 'pdf' in formatos and SimpleDocTemplate is None:
+            raise ImportError("Los informes en PDF requieren reportlab (pip install reportlab)")
+        self.sistema = sistema
+        self.directorio = directorio
+        self.formatos = tuple(formatos)
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.tamano_bloque = tamano_bloque
+        self.logger = logging.getLogger(__name__)
+
+    def iterar_docentes(self, periodo: Optional[str] = None, facultad: Optional[str] = None) -> Iterator[Dict]:
+        """Genera cada docente con sus evaluaciones y resultados, leyendo la consulta por bloques"""
+        condiciones = ["e.Estado = 1"]
+        parametros = []
+        if periodo:
+            condiciones.append("p.Nombre = ?")
+            parametros.append(periodo)
+        if facultad:
+            condiciones.append("f.Nombre = ?")
+            parametros.append(facultad)
+
+        with self.sistema.conexion() as conn:
+            cursor = conn.cursor()
+            cursor.execute(SQL_INFORME_DOCENTES.format(filtro=" AND ".join(condiciones)), parametros)
+            docente = None
+            evaluacion = None
+            while True:
+                filas = cursor.fetchmany(self.tamano_bloque)
+                if not filas:
+                    break
+                for fila in filas:
+                    if docente is None or docente['docente_id'] != fila[0]:
+                        if docente is not None:
+                            yield docente
+                        docente = {'docente_id': fila[0], 'nombre': fila[1], 'evaluaciones': []}
+                        evaluacion = None
+                    if evaluacion is None or evaluacion['evaluacion_id'] != fila[2]:
+                        evaluacion = {
+                            'evaluacion_id': fila[2],
+                            'periodo': fila[3],
+                            'facultad': fila[4],
+                            'carrera': fila[5],
+                            'asignatura': fila[6],
+                            'fecha': fila[7],
+                            'porcentaje': _valor(fila[8]),
+                            'resultados': []
+                        }
+                        docente['evaluaciones'].append(evaluacion)
+                    if fila[10] is not None:
+                        evaluacion['resultados'].append((fila[9], fila[10], fila[11], fila[12], fila[13]))
+            if docente is not None:
+                yield docente
+
+    def _informes_en_orden(self, docentes: Iterator[Dict], titulo: str):
+        """Genera los resultados por docente con una ventana acotada de trabajos en el pool"""
+        if self.max_workers == 1:
+            for docente in docentes:
+                yield _generar_informe(docente, self.directorio, self.formatos, titulo)
+            return
+
+        ventana = self.max_workers * 2
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            pendientes: deque = deque()
+            try:
+                for docente in docentes:
+                    pendientes.append(executor.submit(
+                        _generar_informe, docente, self.directorio, self.formatos, titulo
+                    ))
+                    if len(pendientes) >= ventana:
+                        yield pendientes.popleft().result()
+                while pendientes:
+                    yield pendientes.popleft().result()
+            finally:
+                for futuro in pendientes:
+                    futuro.cancel()
+
+    def generar(self, periodo: Optional[str] = None, facultad: Optional[str] = None,
+                callback: Optional[Callable[[Dict], None]] = None,
+                cancelar: Optional[threading.Event] = None) -> Dict:
+        """Escribe los informes de todos los docentes del alcance y devuelve el resumen con el rendimiento"""
+        titulo = " · ".join(
+            parte for parte in (f"Periodo {periodo}" if periodo else None, facultad) if parte
+        ) or "Todos los periodos"
+        os.makedirs(self.directorio, exist_ok=True)
+        self.logger.info(f"Generando informes por docente ({titulo}) con {self.max_workers} procesos")
+        inicio = time.perf_counter()
+        resultados = []
+
+        informes = self._informes_en_orden(self.iterar_docentes(periodo, facultad), titulo)
+        try:
+            for resultado in informes:
+                resultados.append(resultado)
+                if resultado['error']:
+                    self.logger.error(f"Error en el informe de {resultado['docente']}: {resultado['error']}")
+                if callback:
+                    callback(resultado)
+                if cancelar is not None and cancelar.is_set():
+                    self.logger.info("Generación de informes cancelada por el usuario")
+                    break
+        finally:
+            informes.close()
+
+        duracion = time.perf_counter() - inicio
+        generados = sum(1 for r in resultados if not r['error'])
+        docentes_por_segundo = len(resultados) / duracion if duracion > 0 else 0.0
+        resumen = {
+            'directorio': os.path.abspath(self.directorio),
+            'periodo': periodo,
+            'facultad': facultad,
+            'docentes': len(resultados),
+            'generados': generados,
+            'evaluaciones': sum(r['evaluaciones'] for r in resultados),
+            'archivos': sum(len(r['archivos']) for r in resultados),
+            'cancelado': cancelar is not None and cancelar.is_set(),
+            'duracion': round(duracion, 3),
+            'docentes_por_segundo': round(docentes_por_segundo, 3),
+            'errores': [{'docente': r['docente'], 'error': r['error']} for r in resultados if r['error']]
+        }
+        self.logger.info(
+            f"Informes generados: {generados}/{len(resultados)} docentes, {resumen['evaluaciones']} evaluaciones "
+            f"en {duracion:.2f}s ({docentes_por_segundo:.2f} docentes/s)"
+        )
+        self.sistema.metricas.evento(
+            'informes',
+            docentes=len(resultados),
+            generados=generados,
+            procesos=self.max_workers,
+            duracion_ms=round(duracion * 1000, 2)
+        )
+        return resumen
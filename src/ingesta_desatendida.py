@@ -0,0 +1,301 @@
+import os
+import sys
+import json
+import time
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from evaluacion_docente import EvaluacionDocenteSystem
+from ingesta_lote import MotorIngestaLote
+
+# Códigos de salida del modo desatendido
+SALIDA_EXITO = 0
+SALIDA_ERRORES_ARCHIVOS = 1
+SALIDA_ERROR_FATAL = 2
+SALIDA_INTERRUMPIDO = 130
+
+EXTENSIONES_EVALUACION = ('.xlsm', '.xlsx')
+
+
+def listar_archivos(directorio: str) -> List[str]:
+    """Libros de evaluación de un directorio, en orden alfabético"""
+    return sorted(
+        os.path.join(directorio, nombre)
+        for nombre in os.listdir(directorio)
+        # Los archivos ~$ son bloqueos temporales de Excel
+        if nombre.lower().endswith(EXTENSIONES_EVALUACION) and not nombre.startswith('~$')
+    )
+
+
+def escribir_resumen(ruta_resumen: Optional[str], resumen: Dict, anexar: bool = False):
+    """Escribe el resumen en JSON (una línea por ciclo si se anexa) y lo imprime en la salida"""
+    linea = json.dumps(resumen, ensure_ascii=False, default=str)
+    print(linea, flush=True)
+    if ruta_resumen:
+        with open(ruta_resumen, 'a' if anexar else 'w', encoding='utf-8') as f:
+            f.write(linea + '\n')
+
+
+def _resumir(modo: str, directorio: str, resultado_lote: Dict) -> Dict:
+    """Resumen serializable de un lote procesado o verificado"""
+    resumen = {
+        'modo': modo,
+        'directorio': os.path.abspath(directorio),
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'total': resultado_lote['total'],
+        'duracion': round(resultado_lote['duracion'], 3),
+        'archivos': []
+    }
+    if modo == 'verificar':
+        resumen['validos'] = resultado_lote['validos']
+        resumen['archivos'] = [
+            {'archivo': os.path.basename(r['archivo']), 'valido': r['valido'], 'errores': r['errores']}
+            for r in resultado_lote['resultados']
+        ]
+    else:
+        resumen['procesados'] = resultado_lote['procesados']
+        resumen['duplicados'] = sum(1 for r in resultado_lote['resultados'] if r['duplicado'])
+        resumen['en_diario'] = sum(1 for r in resultado_lote['resultados'] if r.get('en_diario'))
+        resumen['archivos_por_segundo'] = round(resultado_lote['archivos_por_segundo'], 3)
+        resumen['tiempos'] = resultado_lote['tiempos']
+        resumen['archivos'] = [_resumir_archivo(r) for r in resultado_lote['resultados']]
+    return resumen
+
+
+def _resumir_archivo(resultado: Dict) -> Dict:
+    """Resultado de un archivo; los libros consolidados incluyen el detalle por evaluación"""
+    archivo = {
+        'archivo': os.path.basename(resultado['archivo']),
+        'exito': resultado['exito'],
+        'evaluacion_id': resultado['evaluacion_id'],
+        'duplicado': resultado['duplicado'],
+        'error': resultado['error']
+    }
+    if resultado.get('en_diario'):
+        archivo['en_diario'] = resultado['en_diario']
+    if 'cambios' in resultado:
+        archivo['cambios'] = resultado['cambios']
+        archivo['eliminados'] = resultado['eliminados']
+    if 'evaluaciones' in resultado:
+        archivo['evaluaciones'] = [
+            {
+                clave: evaluacion[clave]
+                for clave in ('origen', 'exito', 'evaluacion_id', 'duplicado', 'error', 'cambios', 'eliminados')
+                if clave in evaluacion
+            }
+            for evaluacion in resultado['evaluaciones']
+        ]
+    return archivo
+
+
+def _codigo_salida(resumen: Dict) -> int:
+    """Éxito si ningún archivo falló; los duplicados ya cargados no cuentan como error"""
+    if resumen['modo'] == 'verificar':
+        return SALIDA_EXITO if resumen['validos'] == resumen['total'] else SALIDA_ERRORES_ARCHIVOS
+    fallidos = resumen['total'] - resumen['procesados'] - resumen['duplicados']
+    return SALIDA_EXITO if fallidos == 0 else SALIDA_ERRORES_ARCHIVOS
+
+
+def configurar_log_consola():
+    """Agrega la salida de errores estándar al log del sistema"""
+    if sys.stderr is None:
+        # Ejecutable sin consola
+        return
+    manejador = logging.StreamHandler(sys.stderr)
+    manejador.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    logging.getLogger().addHandler(manejador)
+
+
+def ejecutar_lote(directorio: str, max_workers: Optional[int] = None, ruta_resumen: Optional[str] = None,
+                  solo_verificar: bool = False, reverificar: bool = False, tamano_grupo: Optional[int] = None,
+                  sin_conexion: bool = False, actualizar: bool = False) -> int:
+    """Ingresa (o verifica) todos los libros de un directorio y devuelve el código de salida.
+
+    Con actualizar, los libros de evaluaciones ya registradas se aplican como correcciones.
+    """
+    try:
+        sistema = EvaluacionDocenteSystem()
+        sistema.modo_sin_conexion = sin_conexion
+        configurar_log_consola()
+        if reverificar:
+            sistema.reverificar_manifiesto()
+
+        motor = MotorIngestaLote(
+            sistema, max_workers=max_workers, tamano_grupo=tamano_grupo, actualizar=actualizar
+        )
+        archivos = listar_archivos(directorio)
+        if solo_verificar:
+            resumen = _resumir('verificar', directorio, motor.verificar(archivos))
+        else:
+            resumen = _resumir('lote', directorio, motor.procesar(archivos))
+        escribir_resumen(ruta_resumen, resumen)
+        return _codigo_salida(resumen)
+    except KeyboardInterrupt:
+        return SALIDA_INTERRUMPIDO
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Error fatal en el modo desatendido: {str(e)}")
+        escribir_resumen(ruta_resumen, {'modo': 'lote', 'error': str(e)})
+        return SALIDA_ERROR_FATAL
+
+
+def ejecutar_sincronizacion(ruta_resumen: Optional[str] = None, tamano_lote: int = 500) -> int:
+    """Envía al servidor las evaluaciones del diario local y devuelve el código de salida"""
+    try:
+        sistema = EvaluacionDocenteSystem()
+        configurar_log_consola()
+        resumen = sistema.sincronizar_diario(tamano_lote=tamano_lote)
+        escribir_resumen(ruta_resumen, dict({'modo': 'sincronizar'}, **resumen))
+        return SALIDA_EXITO if resumen['pendientes'] == 0 else SALIDA_ERRORES_ARCHIVOS
+    except KeyboardInterrupt:
+        return SALIDA_INTERRUMPIDO
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Error en la sincronización del diario local: {str(e)}")
+        escribir_resumen(ruta_resumen, {'modo': 'sincronizar', 'error': str(e)})
+        return SALIDA_ERROR_FATAL
+
+
+def ejecutar_exportacion(directorio: str, ruta_resumen: Optional[str] = None, tamano_bloque: int = 5000,
+                         completa: bool = False) -> int:
+    """Exporta a Parquet las evaluaciones nuevas o modificadas y devuelve el código de salida"""
+    try:
+        from exportacion_bi import ExportadorParquet
+        sistema = EvaluacionDocenteSystem()
+        configurar_log_consola()
+        resumen = ExportadorParquet(sistema, directorio, tamano_bloque=tamano_bloque).exportar(completa=completa)
+        escribir_resumen(ruta_resumen, dict({'modo': 'exportar'}, **resumen))
+        return SALIDA_EXITO
+    except KeyboardInterrupt:
+        return SALIDA_INTERRUMPIDO
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Error en la exportación BI: {str(e)}")
+        escribir_resumen(ruta_resumen, {'modo': 'exportar', 'error': str(e)})
+        return SALIDA_ERROR_FATAL
+
+
+def ejecutar_informes(directorio: str, periodo: Optional[str] = None, facultad: Optional[str] = None,
+                      formatos: Optional[List[str]] = None, max_workers: Optional[int] = None,
+                      ruta_resumen: Optional[str] = None) -> int:
+    """Genera los informes por docente de un periodo o facultad y devuelve el código de salida"""
+    try:
+        from informes_docentes import GeneradorInformes
+        sistema = EvaluacionDocenteSystem()
+        configurar_log_consola()
+        generador = GeneradorInformes(sistema, directorio, formatos=tuple(formatos or ['xlsx']),
+                                      max_workers=max_workers)
+        resumen = generador.generar(periodo=periodo, facultad=facultad)
+        escribir_resumen(ruta_resumen, dict({'modo': 'informes'}, **resumen))
+        return SALIDA_EXITO if not resumen['errores'] else SALIDA_ERRORES_ARCHIVOS
+    except KeyboardInterrupt:
+        return SALIDA_INTERRUMPIDO
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Error generando los informes por docente: {str(e)}")
+        escribir_resumen(ruta_resumen, {'modo': 'informes', 'error': str(e)})
+        return SALIDA_ERROR_FATAL
+
+
+def ejecutar_agregados(accion: str, ruta_resumen: Optional[str] = None) -> int:
+    """Reconstruye o verifica el resumen de cumplimiento para BI y devuelve el código de salida"""
+    try:
+        from resumen_cumplimiento import ResumenCumplimiento
+        sistema = EvaluacionDocenteSystem()
+        configurar_log_consola()
+        agregados = ResumenCumplimiento(sistema)
+        if accion == 'reconstruir':
+            resumen = agregados.reconstruir()
+            codigo = SALIDA_EXITO
+        else:
+            resumen = agregados.verificar()
+            codigo = SALIDA_EXITO if resumen['consistente'] else SALIDA_ERRORES_ARCHIVOS
+        escribir_resumen(ruta_resumen, dict({'modo': f'agregados_{accion}'}, **resumen))
+        return codigo
+    except KeyboardInterrupt:
+        return SALIDA_INTERRUMPIDO
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Error en el resumen de cumplimiento ({accion}): {str(e)}")
+        escribir_resumen(ruta_resumen, {'modo': f'agregados_{accion}', 'error': str(e)})
+        return SALIDA_ERROR_FATAL
+
+
+def ejecutar_plantillas(ruta_asignaciones: str, directorio: Optional[str] = None, periodo: Optional[str] = None,
+                       max_workers: Optional[int] = None, ruta_resumen: Optional[str] = None) -> int:
+    """Genera las plantillas prellenadas de una lista de asignaciones y devuelve el código de salida"""
+    try:
+        from plantillas import GeneradorPlantillas, leer_asignaciones
+        sistema = EvaluacionDocenteSystem()
+        configurar_log_consola()
+        directorio = directorio or os.path.join(os.path.dirname(os.path.abspath(ruta_asignaciones)), 'plantillas')
+        generador = GeneradorPlantillas(sistema, directorio, max_workers=max_workers)
+        resumen = generador.generar(leer_asignaciones(ruta_asignaciones), periodo=periodo)
+        escribir_resumen(ruta_resumen, dict({'modo': 'plantillas'}, **resumen))
+        return SALIDA_EXITO if not resumen['errores'] else SALIDA_ERRORES_ARCHIVOS
+    except KeyboardInterrupt:
+        return SALIDA_INTERRUMPIDO
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Error generando las plantillas: {str(e)}")
+        escribir_resumen(ruta_resumen, {'modo': 'plantillas', 'error': str(e)})
+        return SALIDA_ERROR_FATAL
+
+
+def vigilar_directorio(directorio: str, max_workers: Optional[int] = None, ruta_resumen: Optional[str] = None,
+                       intervalo: float = 10.0, ciclos: Optional[int] = None,
+                       tamano_grupo: Optional[int] = None, sin_conexion: bool = False,
+                       actualizar: bool = False) -> int:
+    """Ingresa los libros que aparecen en un directorio a medida que llegan.
+
+    Un archivo se procesa cuando su tamaño y fecha de modificación no cambian
+    entre dos revisiones (copia terminada). Los archivos modificados después de
+    procesarse se vuelven a intentar; con actualizar, sus correcciones se aplican
+    a la evaluación ya registrada. Cada ciclo con archivos anexa una línea JSON
+    al resumen.
+    """
+    logger = logging.getLogger(__name__)
+    try:
+        sistema = EvaluacionDocenteSystem()
+        sistema.modo_sin_conexion = sin_conexion
+        configurar_log_consola()
+        motor = MotorIngestaLote(
+            sistema, max_workers=max_workers, tamano_grupo=tamano_grupo, actualizar=actualizar
+        )
+    except Exception as e:
+        logger.error(f"Error fatal en el modo desatendido: {str(e)}")
+        return SALIDA_ERROR_FATAL
+
+    vistos = {}
+    procesados = {}
+    hubo_errores = False
+    ciclo = 0
+    logger.info(f"Vigilando el directorio {os.path.abspath(directorio)} cada {intervalo}s")
+    try:
+        while ciclos is None or ciclo < ciclos:
+            ciclo += 1
+            listos = []
+            for archivo in listar_archivos(directorio):
+                try:
+                    estado = os.stat(archivo)
+                except OSError:
+                    continue
+                firma = (estado.st_size, estado.st_mtime)
+                if procesados.get(archivo) == firma:
+                    continue
+                if vistos.get(archivo) == firma:
+                    listos.append(archivo)
+                vistos[archivo] = firma
+
+            if listos:
+                resumen = _resumir('vigilancia', directorio, motor.procesar(listos))
+                escribir_resumen(ruta_resumen, resumen, anexar=True)
+                hubo_errores = hubo_errores or _codigo_salida(resumen) != SALIDA_EXITO
+                for archivo in listos:
+                    procesados[archivo] = vistos[archivo]
+
+            if ciclos is None or ciclo < ciclos:
+                time.sleep(intervalo)
+    except KeyboardInterrupt:
+        logger.info("Vigilancia detenida por el usuario")
+        return SALIDA_INTERRUMPIDO
+    except Exception as e:
+        logger.error(f"Error fatal en el modo desatendido: {str(e)}")
+        return SALIDA_ERROR_FATAL
+
+    return SALIDA_ERRORES_ARCHIVOS if hubo_errores else SALIDA_EXITO
@@ -0,0 +1,359 @@
+import os
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from evaluacion_docente import EvaluacionDocenteSystem, extraer_evaluacion, extraer_evaluaciones
+from lector_excel import LibroConsolidado
+from metricas import resumir_tiempos
+from registro_grupal import RegistroGrupal
+
+
+def _extraer_archivo(ruta_archivo: str, estados_validos: List[str]) -> Dict:
+    """Extrae un archivo en un proceso hijo devolviendo el error como texto.
+
+    Los libros consolidados no se extraen aquí: se marcan para leerlos de a una
+    evaluación en el proceso principal.
+    """
+    duraciones = {}
+    try:
+        return {
+            'archivo': ruta_archivo,
+            'datos': extraer_evaluacion(ruta_archivo, estados_validos, duraciones),
+            'error': None,
+            'duraciones': duraciones
+        }
+    except LibroConsolidado:
+        return {'archivo': ruta_archivo, 'datos': None, 'error': None, 'duraciones': duraciones, 'consolidado': True}
+    except Exception as e:
+        return {'archivo': ruta_archivo, 'datos': None, 'error': str(e), 'duraciones': duraciones}
+
+
+class MotorIngestaLote:
+    """Ingesta de lotes de archivos: lectura en paralelo y un único escritor a la base de datos.
+
+    La lectura y validación de cada libro (openpyxl) se reparte en un pool de
+    procesos; los resultados se consumen en el mismo orden de los archivos y se
+    registran secuencialmente con la conexión del sistema. Con tamano_grupo,
+    varios archivos comparten una transacción (ver RegistroGrupal) y sus
+    resultados se informan al confirmarse el grupo. Con actualizar, los libros de
+    evaluaciones ya registradas se aplican como correcciones (solo los ítems que
+    cambiaron) en lugar de rechazarse como duplicados, y los de evaluaciones aún
+    no registradas se registran como nuevas.
+    """
+
+    def __init__(self, sistema: EvaluacionDocenteSystem, max_workers: Optional[int] = None,
+                 tamano_grupo: Optional[int] = None, actualizar: bool = False):
+        self.sistema = sistema
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.tamano_grupo = tamano_grupo if tamano_grupo and tamano_grupo > 1 else None
+        self.actualizar = actualizar
+        self.logger = logging.getLogger(__name__)
+
+    def _omitir_conocido(self, ruta_archivo: str) -> Optional[Dict]:
+        """Extracción ya resuelta para un archivo presente en el manifiesto.
+
+        Solo se compara la firma (ruta, tamaño y fecha) para no leer el archivo en
+        el hilo que reparte los trabajos; el hash lo calcula el proceso hijo al
+        extraerlo y se contrasta en _omitir_por_hash.
+        """
+        evaluacion_id = self.sistema.buscar_en_manifiesto(ruta_archivo, solo_firma=True)
+        if not evaluacion_id:
+            return None
+        return self._omitido(ruta_archivo, evaluacion_id)
+
+    def _omitir_por_hash(self, extraccion: Dict) -> Dict:
+        """Marca como conocida una extracción cuyo hash de contenido ya figura en el manifiesto"""
+        datos = extraccion.get('datos')
+        if not datos:
+            return extraccion
+        evaluacion_id = self.sistema.buscar_hash_en_manifiesto(datos.get('hash_contenido'))
+        if not evaluacion_id:
+            return extraccion
+        return self._omitido(extraccion['archivo'], evaluacion_id)
+
+    def _omitido(self, ruta_archivo: str, evaluacion_id: int) -> Dict:
+        return {
+            'archivo': ruta_archivo,
+            'datos': None,
+            'error': f"Ya existe una evaluación para este archivo (EvaluacionID: {evaluacion_id})",
+            'evaluacion_id': evaluacion_id,
+            'omitido': True
+        }
+
+    def _extraer_en_orden(self, archivos: List[str]):
+        """Genera las extracciones en el orden de entrada con una ventana acotada de trabajos"""
+        estados = self.sistema.estados_validos
+        if self.max_workers == 1 or len(archivos) == 1:
+            for archivo in archivos:
+                yield self._omitir_conocido(archivo) or self._omitir_por_hash(_extraer_archivo(archivo, estados))
+            return
+
+        # Ventana acotada para no acumular en memoria libros ya leídos
+        ventana = self.max_workers * 2
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            pendientes = deque()
+            try:
+                for archivo in archivos:
+                    omitido = self._omitir_conocido(archivo)
+                    if omitido:
+                        # Los archivos conocidos no se leen, pero conservan su lugar en el orden
+                        futuro = Future()
+                        futuro.set_result(omitido)
+                        pendientes.append(futuro)
+                    else:
+                        pendientes.append(executor.submit(_extraer_archivo, archivo, estados))
+                    if len(pendientes) >= ventana:
+                        yield self._omitir_por_hash(pendientes.popleft().result())
+                while pendientes:
+                    yield self._omitir_por_hash(pendientes.popleft().result())
+            finally:
+                # Al cancelar o cerrar el generador no se inician los trabajos en cola
+                for futuro in pendientes:
+                    futuro.cancel()
+
+    def _resultado_inicial(self, extraccion: Dict) -> Dict:
+        return {
+            'archivo': extraccion['archivo'],
+            'exito': False,
+            'evaluacion_id': None,
+            'duplicado': False,
+            'error': extraccion['error'],
+            'duraciones': extraccion.get('duraciones', {})
+        }
+
+    def _registrar(self, extraccion: Dict) -> Dict:
+        """Registra una extracción y construye el resultado por archivo"""
+        resultado = self._resultado_inicial(extraccion)
+        if extraccion.get('omitido'):
+            resultado['evaluacion_id'] = extraccion['evaluacion_id']
+            if self.actualizar:
+                # El mismo contenido ya se cargó: la corrección no tiene cambios
+                resultado['error'] = None
+                resultado['exito'] = True
+                resultado['cambios'] = resultado['eliminados'] = 0
+                self.logger.info(f"Archivo sin cambios: {os.path.basename(extraccion['archivo'])}")
+                return resultado
+            resultado['duplicado'] = True
+            self.logger.info(f"Archivo omitido, ya registrado: {os.path.basename(extraccion['archivo'])}")
+            return resultado
+        if extraccion.get('consolidado'):
+            return self._registrar_consolidado(resultado)
+        if extraccion['datos'] is None:
+            self.logger.error(f"Error procesando archivo {os.path.basename(extraccion['archivo'])}: {extraccion['error']}")
+            self.sistema.metricas.archivo(extraccion['archivo'], False, resultado['duraciones'], error=resultado['error'])
+            return resultado
+
+        datos = extraccion['datos']
+        resultado['duraciones'] = datos.setdefault('duraciones', resultado['duraciones'])
+        try:
+            if self.actualizar:
+                actualizacion = self.sistema.actualizar_evaluacion(datos)
+                resultado['evaluacion_id'] = actualizacion['evaluacion_id']
+                resultado['cambios'] = actualizacion['cambios']
+                resultado['eliminados'] = actualizacion['eliminados']
+            else:
+                resultado['evaluacion_id'] = self.sistema.registrar_evaluacion(datos)
+            resultado['exito'] = True
+            resultado['correcciones'] = datos.get('correcciones', [])
+            if 'id_diario' in datos:
+                resultado['en_diario'] = datos['id_diario']
+        except Exception as e:
+            resultado['error'] = str(e)
+            resultado['duplicado'] = "Ya existe una evaluación" in str(e)
+            self.logger.error(f"Error procesando archivo {os.path.basename(extraccion['archivo'])}: {str(e)}")
+        self.sistema.metricas.archivo(
+            extraccion['archivo'], resultado['exito'], resultado['duraciones'],
+            resultado['evaluacion_id'], len(datos['resultados']), resultado['error']
+        )
+        return resultado
+
+    def _registrar_en_grupo(self, grupo: RegistroGrupal, extraccion: Dict) -> List[Dict]:
+        """Agrega una extracción al grupo y devuelve los resultados que quedaron resueltos"""
+        if extraccion.get('consolidado'):
+            # Los libros consolidados confirman cada evaluación por separado: antes se cierra el grupo
+            return self._resolver_grupo(grupo.confirmar()) + [self._registrar(extraccion)]
+        if extraccion['datos'] is None or self.sistema.usar_diario():
+            # Sin servidor la evaluación va al diario local, fuera del grupo
+            return [self._registrar(extraccion)]
+        datos = extraccion['datos']
+        resultado = self._resultado_inicial(extraccion)
+        resultado['duraciones'] = datos.setdefault('duraciones', resultado['duraciones'])
+        return self._resolver_grupo(grupo.agregar(datos, resultado, actualizar=self.actualizar))
+
+    def _resolver_grupo(self, entradas: List[Dict]) -> List[Dict]:
+        """Resultados por archivo de las entradas de un grupo ya confirmado o revertido"""
+        resultados = []
+        for entrada in entradas:
+            resultado = entrada['resultado']
+            if resultado['error']:
+                self.logger.error(f"Error procesando archivo {os.path.basename(resultado['archivo'])}: {resultado['error']}")
+            self.sistema.metricas.archivo(
+                resultado['archivo'], resultado['exito'], resultado['duraciones'],
+                resultado['evaluacion_id'], len(entrada['datos']['resultados']), resultado['error']
+            )
+            resultados.append(resultado)
+        return resultados
+
+    def _registrar_consolidado(self, resultado: Dict) -> Dict:
+        """Registra las evaluaciones de un libro consolidado; el libro es un único resultado.
+
+        El resultado incluye la lista 'evaluaciones' con el detalle de cada una; el
+        libro es exitoso si ninguna evaluación falló y al menos una se registró.
+        """
+        try:
+            evaluaciones = self.sistema.procesar_libro_excel(resultado['archivo'], actualizar=self.actualizar)
+        except Exception as e:
+            resultado['error'] = str(e)
+            self.logger.error(f"Error procesando archivo {os.path.basename(resultado['archivo'])}: {str(e)}")
+            return resultado
+        registradas = sum(1 for evaluacion in evaluaciones if evaluacion['exito'])
+        fallidas = [e for e in evaluaciones if not e['exito'] and not e['duplicado']]
+        resultado['evaluaciones'] = evaluaciones
+        resultado['exito'] = registradas > 0 and not fallidas
+        resultado['duplicado'] = bool(evaluaciones) and not registradas and not fallidas
+        if not evaluaciones:
+            resultado['error'] = "El libro no contiene evaluaciones"
+        elif fallidas:
+            resultado['error'] = f"{len(fallidas)} de {len(evaluaciones)} evaluaciones con errores"
+        for evaluacion in evaluaciones:
+            for etapa, segundos in evaluacion['duraciones'].items():
+                resultado['duraciones'][etapa] = resultado['duraciones'].get(etapa, 0.0) + segundos
+        return resultado
+
+    def _verificar_consolidado(self, ruta_archivo: str) -> Dict:
+        """Verificación en seco de cada evaluación de un libro consolidado"""
+        errores, correcciones = [], []
+        for datos in extraer_evaluaciones(ruta_archivo, self.sistema.estados_validos):
+            if datos.get('error'):
+                errores.append(f"[{datos['origen']}] {datos['error']}")
+                continue
+            try:
+                if self.sistema.autocorreccion:
+                    correcciones.extend(f"[{datos['origen']}] {c}" for c in self.sistema.corregir_nombres(datos))
+                errores.extend(f"[{datos['origen']}] {error}" for error in self.sistema.prevalidar_evaluacion(datos))
+            except Exception as e:
+                errores.append(f"[{datos['origen']}] No se pudieron consultar los datos de referencia: {str(e)}")
+        return {'errores': errores, 'correcciones': correcciones}
+
+    def verificar(self, archivos: List[str], callback: Optional[Callable[[Dict], None]] = None,
+                  cancelar: Optional[threading.Event] = None) -> Dict:
+        """Ejecuta una verificación en seco del lote sin escribir en la base de datos.
+
+        Cada archivo se lee, valida y comprueba contra los datos de referencia
+        locales; el resumen incluye un informe consolidado de errores.
+        """
+        inicio = time.perf_counter()
+        resultados = []
+        extracciones = self._extraer_en_orden(list(archivos))
+        for extraccion in extracciones:
+            if cancelar is not None and cancelar.is_set():
+                extracciones.close()
+                break
+            errores = [extraccion['error']] if extraccion['error'] else []
+            correcciones = []
+            if extraccion.get('consolidado'):
+                try:
+                    consolidado = self._verificar_consolidado(extraccion['archivo'])
+                    errores, correcciones = consolidado['errores'], consolidado['correcciones']
+                except Exception as e:
+                    errores = [str(e)]
+            elif extraccion['datos'] is not None:
+                try:
+                    if self.sistema.autocorreccion:
+                        correcciones = self.sistema.corregir_nombres(extraccion['datos'])
+                    errores = self.sistema.prevalidar_evaluacion(extraccion['datos'])
+                except Exception as e:
+                    errores = [f"No se pudieron consultar los datos de referencia: {str(e)}"]
+            resultado = {
+                'archivo': extraccion['archivo'],
+                'valido': not errores,
+                'errores': errores,
+                'correcciones': correcciones
+            }
+            resultados.append(resultado)
+            if callback:
+                callback(resultado)
+
+        informe = "\n".join(
+            f"{os.path.basename(r['archivo'])}:\n" + "\n".join(f"  - {error}" for error in r['errores'])
+            for r in resultados if not r['valido']
+        )
+        duracion = time.perf_counter() - inicio
+        validos = sum(1 for r in resultados if r['valido'])
+        self.logger.info(f"Verificación finalizada: {validos}/{len(resultados)} archivos válidos en {duracion:.2f}s")
+        return {
+            'resultados': resultados,
+            'validos': validos,
+            'total': len(resultados),
+            'cancelado': len(resultados) < len(archivos),
+            'duracion': duracion,
+            'informe': informe
+        }
+
+    def procesar(self, archivos: List[str], callback: Optional[Callable[[Dict], None]] = None,
+                 cancelar: Optional[threading.Event] = None) -> Dict:
+        """Procesa un lote de archivos y devuelve los resultados por archivo y el rendimiento.
+
+        Si se activa el evento cancelar, el lote se detiene tras el archivo en curso.
+        """
+        self.logger.info(f"Iniciando lote de {len(archivos)} archivos con {self.max_workers} procesos")
+        inicio = time.perf_counter()
+        resultados = []
+        grupo = RegistroGrupal(self.sistema, self.tamano_grupo) if self.tamano_grupo else None
+        
+        def informar(resueltos: List[Dict]):
+            for resultado in resueltos:
+                resultados.append(resultado)
+                if callback:
+                    callback(resultado)
+        
+        try:
+            extracciones = self._extraer_en_orden(list(archivos))
+            for extraccion in extracciones:
+                if cancelar is not None and cancelar.is_set():
+                    extracciones.close()
+                    self.logger.info("Lote cancelado por el usuario")
+                    break
+                if grupo:
+                    informar(self._registrar_en_grupo(grupo, extraccion))
+                else:
+                    informar([self._registrar(extraccion)])
+            if grupo:
+                # Al terminar (o cancelar) se confirma lo que ya se escribió
+                informar(self._resolver_grupo(grupo.confirmar()))
+        except BaseException:
+            if grupo:
+                grupo.descartar()
+            raise
+        finally:
+            self.sistema.cerrar_conexion()
+
+        duracion = time.perf_counter() - inicio
+        procesados = sum(1 for r in resultados if r['exito'])
+        archivos_por_segundo = len(resultados) / duracion if duracion > 0 else 0.0
+        self.logger.info(
+            f"Lote finalizado: {procesados}/{len(resultados)} archivos en {duracion:.2f}s "
+            f"({archivos_por_segundo:.2f} archivos/s)"
+        )
+        tiempos = resumir_tiempos(resultados)
+        self.sistema.metricas.evento(
+            'lote',
+            archivos=len(resultados),
+            procesados=procesados,
+            procesos=self.max_workers,
+            duracion_ms=round(duracion * 1000, 2),
+            **tiempos
+        )
+        return {
+            'resultados': resultados,
+            'procesados': procesados,
+            'total': len(resultados),
+            'cancelado': len(resultados) < len(archivos),
+            'duracion': duracion,
+            'archivos_por_segundo': archivos_por_segundo,
+            'tiempos': tiempos
+        }
@@ -0,0 +1,237 @@
+import pandas as pd
+from openpyxl import load_workbook
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Filas leídas de DATOS_GENERALES (los campos están en las filas 3 a 8 de la columna B)
+FILAS_DATOS_GENERALES = 8
+COLUMNAS_DATOS_GENERALES = 2
+
+# Libros consolidados: varios pares DATOS_GENERALES_<n> / EVALUACION_<n>, o una
+# hoja EVALUACIONES con una fila por ítem y los datos generales en columnas
+HOJA_DATOS_GENERALES = 'DATOS_GENERALES'
+HOJA_EVALUACION = 'EVALUACION'
+HOJA_TABLA_CONSOLIDADA = 'EVALUACIONES'
+
+# Columnas de datos generales de la tabla consolidada, en el orden de las filas 3 a 8
+COLUMNAS_GENERALES_TABLA = [
+    'PERIODO ACADÉMICO',
+    'FACULTAD',
+    'CARRERA',
+    'REVISADO POR',
+    'ASIGNATURA',
+    'NOMBRE DEL DOCENTE'
+]
+
+
+class LibroConsolidado(Exception):
+    """El libro contiene varias evaluaciones; se lee con iterar_evaluaciones_libro"""
+
+
+def _convertir_celda(valor: Any) -> Any:
+    """Convierte el valor de una celda igual que pandas.read_excel"""
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    return valor
+
+
+def _leer_datos_generales(hoja) -> pd.DataFrame:
+    """Lee solo el bloque fijo de encabezado de la hoja DATOS_GENERALES"""
+    filas = [
+        [_convertir_celda(valor) for valor in fila]
+        for fila in hoja.iter_rows(
+            min_row=1,
+            max_row=FILAS_DATOS_GENERALES,
+            min_col=1,
+            max_col=COLUMNAS_DATOS_GENERALES,
+            values_only=True
+        )
+    ]
+    # Completar filas ausentes para conservar las posiciones de iloc
+    while len(filas) < FILAS_DATOS_GENERALES:
+        filas.append([None] * COLUMNAS_DATOS_GENERALES)
+    return pd.DataFrame(filas)
+
+
+def _nombres_columnas(encabezado: Tuple) -> List[str]:
+    """Genera los nombres de columna igual que pandas para encabezados vacíos"""
+    return [
+        str(_convertir_celda(valor)) if valor is not None else f"Unnamed: {idx}"
+        for idx, valor in enumerate(encabezado)
+    ]
+
+
+def _leer_evaluacion(hoja) -> pd.DataFrame:
+    """Lee la tabla de evaluación en una sola pasada por las filas de la hoja"""
+    filas = hoja.iter_rows(values_only=True)
+    encabezado = next(filas, ())
+
+    # Descartar columnas sin encabezado al final de la tabla
+    ancho = len(encabezado)
+    while ancho > 0 and encabezado[ancho - 1] is None:
+        ancho -= 1
+    columnas = _nombres_columnas(encabezado[:ancho])
+
+    datos = []
+    indices = []
+    for numero_fila, fila in enumerate(filas, start=2):
+        valores = [_convertir_celda(valor) for valor in fila[:ancho]]
+        if not any(valor is not None for valor in valores):
+            continue
+        valores.extend([None] * (ancho - len(valores)))
+        datos.append(valores)
+        # El índice + 2 corresponde al número de fila de la hoja de cálculo
+        indices.append(numero_fila - 2)
+
+    return pd.DataFrame(datos, columns=columnas, index=indices)
+
+
+def _pares_de_hojas(nombres_hojas: List[str]) -> List[Tuple[Optional[str], Optional[str]]]:
+    """Pares (hoja de datos generales, hoja de evaluación) emparejados por el sufijo del nombre"""
+    def sufijo(nombre: str, prefijo: str) -> Optional[str]:
+        clave = nombre.strip().upper()
+        if not clave.startswith(prefijo) or clave == HOJA_TABLA_CONSOLIDADA:
+            return None
+        return clave[len(prefijo):].strip(' _-')
+
+    generales: Dict[str, str] = {}
+    evaluaciones: Dict[str, str] = {}
+    for nombre in nombres_hojas:
+        for prefijo, hojas in ((HOJA_DATOS_GENERALES, generales), (HOJA_EVALUACION, evaluaciones)):
+            clave = sufijo(nombre, prefijo)
+            if clave is not None:
+                hojas.setdefault(clave, nombre)
+                break
+    sufijos = list(generales) + [clave for clave in evaluaciones if clave not in generales]
+    return [(generales.get(clave), evaluaciones.get(clave)) for clave in sufijos]
+
+
+def es_libro_consolidado(nombres_hojas: List[str]) -> bool:
+    """Indica si un libro tiene la tabla consolidada o más de un par de hojas"""
+    if any(nombre.strip().upper() == HOJA_TABLA_CONSOLIDADA for nombre in nombres_hojas):
+        return True
+    return len(_pares_de_hojas(nombres_hojas)) > 1
+
+
+def _datos_generales_desde_valores(valores: List[Any]) -> pd.DataFrame:
+    """DataFrame con la forma de DATOS_GENERALES a partir de los seis campos de la tabla"""
+    filas = [[None, None], [None, None]]
+    filas.extend([etiqueta, valor] for etiqueta, valor in zip(COLUMNAS_GENERALES_TABLA, valores))
+    return pd.DataFrame(filas)
+
+
+def _iterar_tabla_consolidada(hoja) -> Iterator[Tuple[str, Optional[pd.DataFrame], Optional[pd.DataFrame], Optional[str]]]:
+    """Genera las evaluaciones de la tabla consolidada de a una.
+
+    Las filas de cada evaluación deben ser contiguas; una fila con todos los
+    datos generales vacíos continúa la evaluación anterior (celdas combinadas).
+    """
+    filas = hoja.iter_rows(values_only=True)
+    encabezado = next(filas, ())
+    ancho = len(encabezado)
+    while ancho > 0 and encabezado[ancho - 1] is None:
+        ancho -= 1
+    columnas = _nombres_columnas(encabezado[:ancho])
+    claves = [columna.strip().upper() for columna in columnas]
+
+    faltantes = [columna for columna in COLUMNAS_GENERALES_TABLA if columna not in claves]
+    if faltantes:
+        yield hoja.title, None, None, f"Faltan las columnas {', '.join(faltantes)} en la hoja {hoja.title}"
+        return
+    posiciones_generales = [claves.index(columna) for columna in COLUMNAS_GENERALES_TABLA]
+    posiciones_evaluacion = [i for i in range(ancho) if i not in posiciones_generales]
+    columnas_evaluacion = [columnas[i] for i in posiciones_evaluacion]
+
+    def construir(valores_generales, datos, indices):
+        origen = f"{hoja.title} (filas {indices[0] + 2}-{indices[-1] + 2})"
+        return (
+            origen,
+            _datos_generales_desde_valores(valores_generales),
+            pd.DataFrame(datos, columns=columnas_evaluacion, index=indices),
+            None
+        )
+
+    vistas = set()
+    actual, descartar = None, True
+    valores_generales, datos, indices = None, [], []
+    for numero_fila, fila in enumerate(filas, start=2):
+        valores = [_convertir_celda(valor) for valor in fila[:ancho]]
+        valores.extend([None] * (ancho - len(valores)))
+        if not any(valor is not None for valor in valores):
+            continue
+        generales = [valores[i] for i in posiciones_generales]
+        clave = tuple(str(valor).strip().casefold() if valor is not None else '' for valor in generales)
+        if any(clave) and clave != actual:
+            if datos:
+                yield construir(valores_generales, datos, indices)
+            datos, indices = [], []
+            actual, valores_generales = clave, generales
+            # Evaluación repartida en bloques separados: se descartan las filas del bloque
+            descartar = clave in vistas
+            vistas.add(clave)
+            if descartar:
+                yield (
+                    f"{hoja.title} (fila {numero_fila})", None, None,
+                    f"Las filas de la evaluación de {generales[5]} / {generales[4]} no son contiguas "
+                    f"(fila {numero_fila})"
+                )
+        if descartar:
+            continue
+        datos.append([valores[i] for i in posiciones_evaluacion])
+        # El índice + 2 corresponde al número de fila de la hoja de cálculo
+        indices.append(numero_fila - 2)
+    if datos:
+        yield construir(valores_generales, datos, indices)
+
+
+def iterar_evaluaciones_libro(ruta_archivo: str) -> Iterator[Tuple[str, Optional[pd.DataFrame],
+                                                                   Optional[pd.DataFrame], Optional[str]]]:
+    """Genera (origen, df_general, df_eval, error) por cada evaluación de un libro.
+
+    Admite el libro de una evaluación, los libros con varios pares de hojas y la
+    tabla consolidada EVALUACIONES. Las evaluaciones se leen de a una, por lo que
+    la memoria usada no depende de cuántas tenga el libro. Si una evaluación no
+    puede leerse se genera con df_general y df_eval en None y el mensaje de error.
+    """
+    libro = load_workbook(ruta_archivo, read_only=True, data_only=True, keep_links=False)
+    try:
+        tablas = [nombre for nombre in libro.sheetnames if nombre.strip().upper() == HOJA_TABLA_CONSOLIDADA]
+        for nombre in tablas:
+            hoja = libro[nombre]
+            hoja.reset_dimensions()
+            yield from _iterar_tabla_consolidada(hoja)
+
+        for hoja_datos, hoja_evaluacion in _pares_de_hojas(libro.sheetnames):
+            origen = hoja_evaluacion or hoja_datos
+            if hoja_datos is None or hoja_evaluacion is None:
+                yield origen, None, None, f"La hoja {origen} no tiene su par DATOS_GENERALES/EVALUACION"
+                continue
+            hoja_general = libro[hoja_datos]
+            hoja_general.reset_dimensions()
+            hoja_eval = libro[hoja_evaluacion]
+            hoja_eval.reset_dimensions()
+            yield origen, _leer_datos_generales(hoja_general), _leer_evaluacion(hoja_eval), None
+    finally:
+        libro.close()
+
+
+def leer_libro_evaluacion(ruta_archivo: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Abre el libro una sola vez en modo de solo lectura y devuelve (df_general, df_eval).
+
+    Produce las mismas estructuras que las dos llamadas a pd.read_excel: la hoja
+    DATOS_GENERALES sin encabezado y la hoja EVALUACION con la primera fila como
+    nombres de columna. Los libros con varias evaluaciones generan LibroConsolidado.
+    """
+    libro = load_workbook(ruta_archivo, read_only=True, data_only=True, keep_links=False)
+    try:
+        if es_libro_consolidado(libro.sheetnames):
+            raise LibroConsolidado(f"El libro {ruta_archivo} contiene varias evaluaciones")
+        hoja_general = libro['DATOS_GENERALES']
+        hoja_general.reset_dimensions()
+        df_general = _leer_datos_generales(hoja_general)
+
+        hoja_eval = libro['EVALUACION']
+        hoja_eval.reset_dimensions()
+        df_eval = _leer_evaluacion(hoja_eval)
+        return df_general, df_eval
+    finally:
+        libro.close()
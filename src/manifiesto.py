@@ -0,0 +1,148 @@
+import os
+import sqlite3
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+from catalogos import clave_exacta
+
+
+def calcular_hash(ruta_archivo: str) -> str:
+    """Hash SHA-256 del contenido de un archivo"""
+    h = hashlib.sha256()
+    with open(ruta_archivo, 'rb') as f:
+        for bloque in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def hash_evaluacion(hash_libro: str, origen: str) -> str:
+    """Hash de una evaluación dentro de un libro consolidado (libro + hoja o filas)"""
+    return hashlib.sha256(f"{hash_libro}:{origen}".encode('utf-8')).hexdigest()
+
+
+class ManifiestoIngesta:
+    """Registro local de los libros ya cargados.
+
+    Cada entrada guarda el hash del contenido, la identidad de la evaluación
+    (periodo, docente, asignatura) y el EvaluacionID resultante. Las búsquedas
+    por ruta usan el tamaño y la fecha de modificación para evitar leer el archivo.
+    """
+
+    def __init__(self, ruta_bd: str):
+        self.ruta_bd = ruta_bd
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(ruta_bd), exist_ok=True)
+        self._conn = sqlite3.connect(ruta_bd, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS manifiesto (
+                hash TEXT PRIMARY KEY,
+                ruta TEXT,
+                tamano INTEGER,
+                modificado REAL,
+                periodo TEXT NOT NULL,
+                docente TEXT NOT NULL,
+                asignatura TEXT NOT NULL,
+                evaluacion_id INTEGER NOT NULL,
+                registrado_en TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_manifiesto_ruta
+                ON manifiesto (ruta, tamano, modificado);
+            CREATE INDEX IF NOT EXISTS ix_manifiesto_identidad
+                ON manifiesto (periodo, docente, asignatura);
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def _identidad(datos: Dict):
+        """Identidad normalizada de una evaluación"""
+        return (
+            clave_exacta(datos['periodo_academico']),
+            clave_exacta(datos['nombre_docente']),
+            clave_exacta(datos['asignatura'])
+        )
+
+    def buscar_firma(self, ruta_archivo: str) -> Optional[int]:
+        """EvaluacionID de un archivo por ruta, tamaño y fecha de modificación, sin leerlo"""
+        estado = os.stat(ruta_archivo)
+        with self._lock:
+            fila = self._conn.execute(
+                "SELECT evaluacion_id FROM manifiesto WHERE ruta = ? AND tamano = ? AND modificado = ?",
+                (os.path.abspath(ruta_archivo), estado.st_size, estado.st_mtime)
+            ).fetchone()
+        return fila[0] if fila else None
+
+    def buscar_archivo(self, ruta_archivo: str) -> Optional[int]:
+        """EvaluacionID de un archivo ya cargado, o None si no figura en el manifiesto"""
+        evaluacion_id = self.buscar_firma(ruta_archivo)
+        if evaluacion_id:
+            return evaluacion_id
+        return self.buscar_hash(calcular_hash(ruta_archivo))
+
+    def buscar_hash(self, hash_contenido: str) -> Optional[int]:
+        """EvaluacionID asociado a un hash de contenido"""
+        with self._lock:
+            fila = self._conn.execute(
+                "SELECT evaluacion_id FROM manifiesto WHERE hash = ?", (hash_contenido,)
+            ).fetchone()
+        return fila[0] if fila else None
+
+    def buscar_identidad(self, datos: Dict) -> Optional[int]:
+        """EvaluacionID registrado para el mismo periodo, docente y asignatura"""
+        with self._lock:
+            fila = self._conn.execute(
+                "SELECT evaluacion_id FROM manifiesto WHERE periodo = ? AND docente = ? AND asignatura = ?",
+                self._identidad(datos)
+            ).fetchone()
+        return fila[0] if fila else None
+
+    def registrar(self, datos: Dict, evaluacion_id: int):
+        """Agrega al manifiesto un archivo registrado correctamente"""
+        ruta_archivo = os.path.abspath(datos['archivo'])
+        try:
+            estado = os.stat(ruta_archivo)
+            tamano, modificado = estado.st_size, estado.st_mtime
+        except OSError:
+            tamano, modificado = None, None
+        hash_contenido = datos.get('hash_contenido') or calcular_hash(ruta_archivo)
+        if datos.get('origen'):
+            # Evaluación de un libro consolidado: el libro completo no queda marcado como cargado
+            ruta_archivo = f"{ruta_archivo}#{datos['origen']}"
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO manifiesto VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (hash_contenido, ruta_archivo, tamano, modificado) + self._identidad(datos) +
+                (evaluacion_id, datetime.now().isoformat(timespec='seconds'))
+            )
+            self._conn.commit()
+
+    def reverificar(self, conn) -> Dict:
+        """Contrasta el manifiesto con la base de datos en una sola consulta.
+
+        Elimina las entradas cuya evaluación ya no existe o fue anulada.
+        """
+        with self._lock:
+            ids = [fila[0] for fila in self._conn.execute("SELECT DISTINCT evaluacion_id FROM manifiesto")]
+        if not ids:
+            return {'verificadas': 0, 'eliminadas': 0}
+
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT e.EvaluacionID
+            FROM Evaluaciones e
+            INNER JOIN STRING_SPLIT(?, ',') s ON e.EvaluacionID = CAST(s.value AS INT)
+            WHERE e.Estado = 1
+        """, ",".join(str(i) for i in ids))
+        existentes = {fila[0] for fila in cursor.fetchall()}
+        faltantes = [i for i in ids if i not in existentes]
+
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM manifiesto WHERE evaluacion_id = ?", [(i,) for i in faltantes]
+            )
+            self._conn.commit()
+        self.logger.info(f"Manifiesto reverificado: {len(ids)} evaluaciones, {len(faltantes)} eliminadas")
+        return {'verificadas': len(ids), 'eliminadas': len(faltantes)}
@@ -0,0 +1,128 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+@contextmanager
+def medir(duraciones: Dict[str, float], etapa: str):
+    """Suma a duraciones[etapa] los segundos que tarda el bloque"""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        duraciones[etapa] = duraciones.get(etapa, 0.0) + time.perf_counter() - inicio
+
+
+def _percentil(valores: List[float], percentil: float) -> float:
+    """Percentil con interpolación lineal (como numpy.percentile) sin importar numpy"""
+    ordenados = sorted(valores)
+    posicion = (len(ordenados) - 1) * percentil / 100
+    inferior = int(posicion)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (posicion - inferior)
+
+
+def _milisegundos(duraciones: Dict[str, float]) -> Dict[str, float]:
+    return {etapa: round(segundos * 1000, 2) for etapa, segundos in duraciones.items()}
+
+
+class RegistroMetricas:
+    """Registro estructurado de tiempos en formato JSON lines (un evento por línea).
+
+    Cada línea tiene la fecha, el tipo de evento y sus datos; las duraciones se
+    guardan en milisegundos.
+    """
+
+    def __init__(self, ruta_archivo: str):
+        self.ruta_archivo = ruta_archivo
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(ruta_archivo), exist_ok=True)
+
+    def evento(self, tipo: str, **datos):
+        """Agrega una línea al registro; los errores de escritura no interrumpen la ingesta"""
+        linea = json.dumps(
+            dict({'fecha': datetime.now().isoformat(timespec='milliseconds'), 'evento': tipo}, **datos),
+            ensure_ascii=False, default=str
+        )
+        try:
+            with self._lock, open(self.ruta_archivo, 'a', encoding='utf-8') as f:
+                f.write(linea + '\n')
+        except OSError:
+            pass
+
+    def archivo(self, ruta_archivo: str, exito: bool, duraciones: Dict[str, float],
+                evaluacion_id: Optional[int] = None, filas: Optional[int] = None, error: Optional[str] = None):
+        """Registra los tiempos por etapa de un archivo procesado"""
+        self.evento(
+            'archivo',
+            archivo=os.path.basename(ruta_archivo),
+            exito=exito,
+            evaluacion_id=evaluacion_id,
+            filas=filas,
+            duraciones_ms=_milisegundos(duraciones),
+            total_ms=round(sum(duraciones.values()) * 1000, 2),
+            error=error
+        )
+
+    def consulta(self, nombre: str, duraciones: Dict[str, float], **datos):
+        """Registra los tiempos de un grupo de consultas (p. ej. la carga de catálogos)"""
+        self.evento('consulta', nombre=nombre, duraciones_ms=_milisegundos(duraciones), **datos)
+
+
+def resumir_tiempos(resultados: List[Dict], lentos: int = 5) -> Dict:
+    """Percentiles 50 y 95 por etapa (ms) y los archivos más lentos de un lote.
+
+    Usa la clave 'duraciones' (segundos por etapa) de cada resultado por archivo.
+    """
+    por_etapa: Dict[str, List[float]] = {}
+    totales = []
+    for resultado in resultados:
+        duraciones = resultado.get('duraciones')
+        if not duraciones:
+            continue
+        for etapa, segundos in duraciones.items():
+            por_etapa.setdefault(etapa, []).append(segundos * 1000)
+        totales.append((sum(duraciones.values()) * 1000, resultado['archivo']))
+
+    etapas = {
+        etapa: {
+            'p50': round(_percentil(valores, 50), 2),
+            'p95': round(_percentil(valores, 95), 2),
+            'total': round(sum(valores), 2),
+            'archivos': len(valores)
+        }
+        for etapa, valores in por_etapa.items()
+    }
+    if totales:
+        valores = [total for total, _ in totales]
+        etapas['total'] = {
+            'p50': round(_percentil(valores, 50), 2),
+            'p95': round(_percentil(valores, 95), 2),
+            'total': round(sum(valores), 2),
+            'archivos': len(valores)
+        }
+    return {
+        'etapas': etapas,
+        'mas_lentos': [
+            {'archivo': os.path.basename(archivo), 'total_ms': round(total, 2)}
+            for total, archivo in sorted(totales, reverse=True)[:lentos]
+        ]
+    }
+
+
+def formatear_resumen(resumen: Dict) -> List[str]:
+    """Líneas de texto del resumen de tiempos para el registro de operaciones"""
+    if not resumen['etapas']:
+        return []
+    lineas = ["Tiempos por etapa (ms): p50 / p95"]
+    for etapa, datos in resumen['etapas'].items():
+        lineas.append(f"  {etapa}: {datos['p50']:.1f} / {datos['p95']:.1f}")
+    if resumen['mas_lentos']:
+        lineas.append("Archivos más lentos: " + ", ".join(
+            f"{lento['archivo']} ({lento['total_ms']:.0f} ms)" for lento in resumen['mas_lentos']
+        ))
+    return lineas
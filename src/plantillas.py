@@ -0,0 +1,277 @@
+import io
+import os
+import re
+import time
+import zipfile
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from lector_excel import COLUMNAS_GENERALES_TABLA, HOJA_DATOS_GENERALES, HOJA_EVALUACION
+
+# Encabezado de la hoja EVALUACION que espera validar_datos_excel
+ENCABEZADO_EVALUACION = ['CATEGORÍA', 'ÍTEM DE EVALUACIÓN', 'ESTADO', 'FECHA', 'OBSERVACIONES']
+
+# Campos de datos generales en el orden de las filas 3 a 8 (columna B) de DATOS_GENERALES
+CAMPOS_PLANTILLA = ['periodo_academico', 'facultad', 'carrera', 'revisado_por', 'asignatura', 'nombre_docente']
+ETIQUETAS_PLANTILLA = [
+    "Periodo Académico", "Facultad", "Carrera", "Revisado Por", "Asignatura", "Nombre del Docente"
+]
+
+# Plantillas que escribe cada trabajo del pool (reparte el costo de enviar los datos)
+PLANTILLAS_POR_TRABAJO = 50
+
+# Texto provisional de cada dato general en el libro base
+MARCADOR = '__PLANTILLA_{}__'
+
+# Libro base compartido por todas las plantillas de una generación; cada proceso
+# del pool lo arma una sola vez (ver _iniciar_proceso)
+_comunes: Dict = {}
+
+
+def _iniciar_proceso(items: Dict[str, List[str]], estados: List[str]):
+    _comunes['base'] = _libro_base(items, estados)
+
+
+def _nombre_archivo(datos: Dict) -> str:
+    """Nombre de archivo seguro para la plantilla de una asignación"""
+    partes = (datos['periodo_academico'], datos['nombre_docente'], datos['asignatura'])
+    return re.sub(r'[^\w\- ]', '_', "_".join(partes)).strip() + ".xlsx"
+
+
+def _escribir_plantilla(destino, datos: Dict, items: Dict[str, List[str]], estados: List[str]):
+    """Escribe una plantilla con los datos generales completos y un ítem por fila"""
+    from openpyxl import Workbook
+    from openpyxl.worksheet.datavalidation import DataValidation
+
+    libro = Workbook(write_only=True)
+    hoja_general = libro.create_sheet(HOJA_DATOS_GENERALES)
+    hoja_general.column_dimensions['A'].width = 25
+    hoja_general.column_dimensions['B'].width = 50
+    hoja_general.append(['EVALUACIÓN DOCENTE'])
+    hoja_general.append([])
+    for etiqueta, campo in zip(ETIQUETAS_PLANTILLA, CAMPOS_PLANTILLA):
+        hoja_general.append([etiqueta, datos[campo]])
+
+    hoja_eval = libro.create_sheet(HOJA_EVALUACION)
+    for columna, ancho in zip('ABCDE', (30, 60, 28, 14, 50)):
+        hoja_eval.column_dimensions[columna].width = ancho
+    filas = sum(len(nombres) for nombres in items.values())
+    if filas:
+        # Lista desplegable con los estados válidos (vacío se registra como 'No Aplica')
+        validacion = DataValidation(
+            type='list', formula1='"' + ",".join(estados) + '"', allow_blank=True,
+            showErrorMessage=True, errorTitle="Estado no válido", error="Seleccione un estado de la lista"
+        )
+        validacion.add(f"C2:C{filas + 1}")
+        hoja_eval.data_validations.dataValidation.append(validacion)
+    hoja_eval.append(ENCABEZADO_EVALUACION)
+    for categoria, nombres in items.items():
+        for item in nombres:
+            hoja_eval.append([categoria, item, None, None, None])
+    libro.save(destino)
+
+
+def _libro_base(items: Dict[str, List[str]], estados: List[str]) -> List[Tuple[zipfile.ZipInfo, bytes]]:
+    """Partes del libro (.xlsx) con marcadores en lugar de los datos generales.
+
+    La hoja EVALUACION es igual en todas las plantillas: se serializa una vez y
+    cada plantilla solo reemplaza los marcadores (ver _estampar_plantilla).
+    """
+    contenido = io.BytesIO()
+    _escribir_plantilla(contenido, {campo: MARCADOR.format(campo) for campo in CAMPOS_PLANTILLA}, items, estados)
+    with zipfile.ZipFile(contenido) as libro:
+        return [(parte, libro.read(parte)) for parte in libro.infolist()]
+
+
+def _estampar_plantilla(ruta: str, base: List[Tuple[zipfile.ZipInfo, bytes]], datos: Dict):
+    """Copia el libro base reemplazando los marcadores por los datos generales de la asignación"""
+    reemplazos = [
+        (MARCADOR.format(campo).encode('utf-8'), escape(datos[campo]).encode('utf-8'))
+        for campo in CAMPOS_PLANTILLA
+    ]
+    with zipfile.ZipFile(ruta, 'w', zipfile.ZIP_DEFLATED) as libro:
+        for parte, contenido in base:
+            if b'__PLANTILLA_' in contenido:
+                for marcador, valor in reemplazos:
+                    contenido = contenido.replace(marcador, valor)
+            libro.writestr(parte, contenido)
+
+
+def _escribir_lote(directorio: str, lote: List[Dict]) -> List[Dict]:
+    """Escribe las plantillas de un lote de asignaciones; se ejecuta en un proceso del pool"""
+    resultados = []
+    for datos in lote:
+        ruta = os.path.join(directorio, _nombre_archivo(datos))
+        resultado = {'asignacion': datos['fila'], 'archivo': ruta, 'exito': False, 'error': None}
+        try:
+            _estampar_plantilla(ruta, _comunes['base'], datos)
+            resultado['exito'] = True
+        except Exception as e:
+            resultado['error'] = str(e)
+        resultados.append(resultado)
+    return resultados
+
+
+def leer_asignaciones(ruta_archivo: str) -> List[Dict]:
+    """Lee la lista de asignaciones docente/asignatura de un CSV o de la primera hoja de un Excel.
+
+    Las columnas usan los mismos encabezados que la tabla consolidada
+    (COLUMNAS_GENERALES_TABLA); PERIODO ACADÉMICO y REVISADO POR son opcionales.
+    """
+    import pandas as pd
+
+    if ruta_archivo.lower().endswith('.csv'):
+        df = pd.read_csv(ruta_archivo, dtype=str, keep_default_na=False, encoding='utf-8-sig')
+    else:
+        df = pd.read_excel(ruta_archivo, dtype=str, keep_default_na=False)
+    df.columns = [str(columna).strip().upper() for columna in df.columns]
+
+    requeridas = ['FACULTAD', 'CARRERA', 'ASIGNATURA', 'NOMBRE DEL DOCENTE']
+    faltantes = [columna for columna in requeridas if columna not in df.columns]
+    if faltantes:
+        raise ValueError(f"Faltan columnas en la lista de asignaciones: {', '.join(faltantes)}")
+
+    asignaciones = []
+    for numero, fila in enumerate(df.itertuples(index=False), start=2):
+        valores = dict(zip(df.columns, fila))
+        if not any(str(valor).strip() for valor in valores.values()):
+            continue
+        asignacion = {'fila': numero}
+        for columna, campo in zip(COLUMNAS_GENERALES_TABLA, CAMPOS_PLANTILLA):
+            asignacion[campo] = str(valores.get(columna, '')).strip()
+        asignaciones.append(asignacion)
+    return asignaciones
+
+
+class GeneradorPlantillas:
+    """Plantillas de evaluación con los datos generales ya completos, una por asignación.
+
+    Los nombres de cada asignación se validan y corrigen contra los catálogos
+    de referencia (igual que en la ingesta), por lo que las plantillas llevan
+    los nombres oficiales. Cada proceso del pool escribe una vez el libro base
+    con openpyxl en modo de solo escritura y lo copia para cada asignación con
+    sus datos generales, por lotes de PLANTILLAS_POR_TRABAJO.
+    """
+
+    def __init__(self, sistema, directorio: str, max_workers: Optional[int] = None):
+        self.sistema = sistema
+        self.directorio = directorio
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.logger = logging.getLogger(__name__)
+
+    def validar(self, asignaciones: List[Dict], periodo: Optional[str] = None,
+                revisado_por: str = "") -> Tuple[List[Dict], List[Dict]]:
+        """Separa las asignaciones válidas (con nombres oficiales) de las rechazadas"""
+        validas, rechazadas, vistas = [], [], set()
+        for asignacion in asignaciones:
+            datos = dict(asignacion, archivo=f"asignación fila {asignacion['fila']}", resultados=[])
+            datos['periodo_academico'] = datos['periodo_academico'] or periodo or ""
+            datos['revisado_por'] = datos['revisado_por'] or revisado_por
+            correcciones = self.sistema.corregir_nombres(datos)
+            errores = self.sistema.prevalidar_evaluacion(datos)
+
+            identidad = tuple(
+                datos[campo].casefold() for campo in ('periodo_academico', 'nombre_docente', 'asignatura')
+            )
+            if not errores and identidad in vistas:
+                errores = ["Asignación repetida para este periodo, docente y asignatura"]
+            if errores:
+                rechazadas.append({'asignacion': asignacion['fila'], 'archivo': None, 'exito': False,
+                                   'error': "; ".join(errores)})
+                continue
+            vistas.add(identidad)
+            datos['correcciones'] = correcciones
+            validas.append(datos)
+        return validas, rechazadas
+
+    def _lotes_en_orden(self, lotes: List[List[Dict]], items: Dict[str, List[str]]) -> Iterator[List[Dict]]:
+        """Genera los resultados de cada lote con una ventana acotada de trabajos en el pool"""
+        estados = list(self.sistema.estados_validos)
+        if self.max_workers == 1 or len(lotes) == 1:
+            _iniciar_proceso(items, estados)
+            for lote in lotes:
+                yield _escribir_lote(self.directorio, lote)
+            return
+
+        ventana = self.max_workers * 2
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_iniciar_proceso,
+                                 initargs=(items, estados)) as executor:
+            pendientes = deque()
+            try:
+                for lote in lotes:
+                    pendientes.append(executor.submit(_escribir_lote, self.directorio, lote))
+                    if len(pendientes) >= ventana:
+                        yield pendientes.popleft().result()
+                while pendientes:
+                    yield pendientes.popleft().result()
+            finally:
+                for futuro in pendientes:
+                    futuro.cancel()
+
+    def generar(self, asignaciones: List[Dict], periodo: Optional[str] = None, revisado_por: str = "",
+                callback: Optional[Callable[[Dict], None]] = None,
+                cancelar: Optional[threading.Event] = None) -> Dict:
+        """Escribe una plantilla por asignación válida y devuelve el resumen con el rendimiento.
+
+        periodo y revisado_por se usan en las asignaciones que no los indican.
+        """
+        inicio = time.perf_counter()
+        os.makedirs(self.directorio, exist_ok=True)
+        items = self.sistema.obtener_categorias_items()
+        if not items:
+            raise ValueError("No hay categorías ni ítems de evaluación en los catálogos")
+
+        validas, resultados = self.validar(asignaciones, periodo, revisado_por)
+        for resultado in resultados:
+            self.logger.warning(f"Asignación rechazada (fila {resultado['asignacion']}): {resultado['error']}")
+            if callback:
+                callback(resultado)
+        self.logger.info(
+            f"Generando {len(validas)} plantillas ({len(resultados)} asignaciones rechazadas) "
+            f"con {self.max_workers} procesos"
+        )
+
+        lotes = [validas[i:i + PLANTILLAS_POR_TRABAJO] for i in range(0, len(validas), PLANTILLAS_POR_TRABAJO)]
+        escrituras = self._lotes_en_orden(lotes, items)
+        try:
+            for lote in escrituras:
+                for resultado in lote:
+                    resultados.append(resultado)
+                    if callback:
+                        callback(resultado)
+                if cancelar is not None and cancelar.is_set():
+                    self.logger.info("Generación de plantillas cancelada por el usuario")
+                    break
+        finally:
+            escrituras.close()
+
+        duracion = time.perf_counter() - inicio
+        generadas = sum(1 for r in resultados if r['exito'])
+        plantillas_por_segundo = generadas / duracion if duracion > 0 else 0.0
+        resumen = {
+            'directorio': os.path.abspath(self.directorio),
+            'asignaciones': len(asignaciones),
+            'generadas': generadas,
+            'rechazadas': sum(1 for r in resultados if not r['exito']),
+            'correcciones': sum(len(datos['correcciones']) for datos in validas),
+            'cancelado': cancelar is not None and cancelar.is_set(),
+            'duracion': round(duracion, 3),
+            'plantillas_por_segundo': round(plantillas_por_segundo, 3),
+            'errores': [{'fila': r['asignacion'], 'error': r['error']} for r in resultados if r['error']]
+        }
+        self.logger.info(
+            f"Plantillas generadas: {generadas} de {len(asignaciones)} asignaciones en {duracion:.2f}s "
+            f"({plantillas_por_segundo:.1f} plantillas/s)"
+        )
+        self.sistema.metricas.evento(
+            'plantillas',
+            asignaciones=len(asignaciones),
+            generadas=generadas,
+            procesos=self.max_workers,
+            duracion_ms=round(duracion * 1000, 2)
+        )
+        return resumen
@@ -0,0 +1,151 @@
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable
+
+
+class PoolConexiones:
+    """Pool de conexiones reutilizables a la base de datos.
+
+    Solo las conexiones libres durante más de verificar_tras segundos se
+    verifican antes de prestarse (y se reemplazan si fallan); las usadas hace
+    poco se prestan sin consulta adicional, y una conexión que falla en uso se
+    devuelve con descartar=True. Un hilo cierra cada intervalo_expulsion
+    segundos las que superan el tiempo máximo de inactividad. Como máximo hay
+    tamano_maximo conexiones abiertas a la vez.
+    """
+
+    def __init__(self, fabrica_conexion: Callable[[], Any], tamano_maximo: int = 4,
+                 inactividad_maxima: float = 300.0, espera_maxima: float = 30.0,
+                 consulta_verificacion: str = "SELECT 1", verificar_tras: float = 30.0,
+                 intervalo_expulsion: float = 60.0):
+        self.fabrica_conexion = fabrica_conexion
+        self.tamano_maximo = max(1, tamano_maximo)
+        self.inactividad_maxima = inactividad_maxima
+        self.espera_maxima = espera_maxima
+        self.consulta_verificacion = consulta_verificacion
+        self.verificar_tras = verificar_tras
+        self.intervalo_expulsion = intervalo_expulsion
+        self.logger = logging.getLogger(__name__)
+
+        # Conexiones libres como (conexión, instante del último uso)
+        self._libres = deque()
+        self._abiertas = 0
+        self._condicion = threading.Condition()
+        self._detener = threading.Event()
+        threading.Thread(target=self._expulsar_periodicamente, daemon=True).start()
+
+    def _cerrar(self, conn):
+        """Cierra una conexión ignorando errores de una conexión ya rota"""
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _verificar(self, conn) -> bool:
+        """Comprueba que una conexión libre sigue siendo utilizable"""
+        if getattr(conn, 'closed', False):
+            return False
+        try:
+            cursor = conn.cursor()
+            cursor.execute(self.consulta_verificacion)
+            cursor.fetchone()
+            cursor.close()
+            return True
+        except Exception as e:
+            self.logger.warning(f"Conexión descartada por verificación fallida: {str(e)}")
+            return False
+
+    def _expulsar_inactivas(self):
+        """Cierra las conexiones libres inactivas (se llama con el lock tomado)"""
+        limite = time.monotonic() - self.inactividad_maxima
+        # Las más antiguas están al inicio de la cola
+        while self._libres and self._libres[0][1] < limite:
+            conn, _ = self._libres.popleft()
+            self._abiertas -= 1
+            self._cerrar(conn)
+
+    def _expulsar_periodicamente(self):
+        """Cierra las conexiones inactivas aunque nadie pida conexiones"""
+        while not self._detener.wait(self.intervalo_expulsion):
+            with self._condicion:
+                self._expulsar_inactivas()
+
+    def obtener(self):
+        """Presta una conexión, reutilizando una libre o abriendo una nueva"""
+        limite = time.monotonic() + self.espera_maxima
+        while True:
+            with self._condicion:
+                self._expulsar_inactivas()
+                conn = None
+                if self._libres:
+                    # Reutilizar la usada más recientemente
+                    conn, ultimo_uso = self._libres.pop()
+                elif self._abiertas < self.tamano_maximo:
+                    self._abiertas += 1
+                else:
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        raise TimeoutError("No hay conexiones disponibles en el pool")
+                    self._condicion.wait(restante)
+                    continue
+
+            if conn is None:
+                try:
+                    conn = self.fabrica_conexion()
+                    self.logger.info("Conexión a base de datos establecida")
+                    return conn
+                except Exception:
+                    with self._condicion:
+                        self._abiertas -= 1
+                        self._condicion.notify()
+                    raise
+
+            if time.monotonic() - ultimo_uso < self.verificar_tras or self._verificar(conn):
+                return conn
+
+            # Reconexión transparente: liberar el cupo y volver a intentar
+            self._cerrar(conn)
+            with self._condicion:
+                self._abiertas -= 1
+                self._condicion.notify()
+
+    def devolver(self, conn, descartar: bool = False):
+        """Devuelve una conexión al pool, o la cierra si está rota o se pide descartarla"""
+        if not descartar and not getattr(conn, 'closed', False):
+            try:
+                # Terminar cualquier transacción pendiente antes de reutilizarla
+                conn.rollback()
+            except Exception:
+                descartar = True
+        else:
+            descartar = True
+
+        with self._condicion:
+            if descartar:
+                self._abiertas -= 1
+                self._cerrar(conn)
+            else:
+                self._libres.append((conn, time.monotonic()))
+            self._condicion.notify()
+
+    @contextmanager
+    def conexion(self):
+        """Presta una conexión durante el bloque y la devuelve al terminar"""
+        conn = self.obtener()
+        try:
+            yield conn
+        finally:
+            self.devolver(conn)
+
+    def cerrar(self):
+        """Cierra todas las conexiones libres del pool y detiene la expulsión periódica"""
+        self._detener.set()
+        with self._condicion:
+            while self._libres:
+                conn, _ = self._libres.pop()
+                self._abiertas -= 1
+                self._cerrar(conn)
+            self._condicion.notify_all()
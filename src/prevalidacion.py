@@ -0,0 +1,46 @@
+from typing import Dict, List, Optional
+
+from catalogos import CatalogoCache
+from resolvedor_nombres import ResolvedorReferencias
+
+
+def prevalidar_evaluacion(datos: Dict, catalogos: CatalogoCache,
+                          resolvedor: Optional[ResolvedorReferencias] = None) -> List[str]:
+    """Comprueba una evaluación extraída contra los datos de referencia locales.
+
+    Devuelve la lista de errores que el servidor rechazaría (vacía si la
+    evaluación es válida) sin abrir ninguna transacción. Con un resolvedor, los
+    nombres no encontrados incluyen sugerencias.
+    """
+    def sugerir(tipo: str, nombre: str, facultad: Optional[str] = None) -> str:
+        if resolvedor is None:
+            return ""
+        sugerencias = resolvedor.sugerencias(tipo, nombre, facultad)
+        return f" (¿quiso decir: {', '.join(sugerencias)}?)" if sugerencias else ""
+
+    errores = []
+
+    if not catalogos.existe('periodos', datos['periodo_academico']):
+        errores.append(f"Periodo académico no encontrado: {datos['periodo_academico']}")
+
+    if not catalogos.existe('facultades', datos['facultad']):
+        errores.append(f"La facultad '{datos['facultad']}' no existe en el sistema")
+    elif not catalogos.existe_carrera(datos['facultad'], datos['carrera']):
+        errores.append(
+            f"Carrera no encontrada en la facultad {datos['facultad']}: {datos['carrera']}"
+            + sugerir('carreras', datos['carrera'], datos['facultad'])
+        )
+
+    if not catalogos.existe('docentes', datos['nombre_docente']):
+        errores.append(f"Docente no encontrado: {datos['nombre_docente']}" + sugerir('docentes', datos['nombre_docente']))
+
+    if not catalogos.existe('asignaturas', datos['asignatura']):
+        errores.append(f"Asignatura no encontrada: {datos['asignatura']}" + sugerir('asignaturas', datos['asignatura']))
+
+    items_faltantes = []
+    for item, _, _, _ in datos['resultados']:
+        if not catalogos.existe('items', item) and item not in items_faltantes:
+            items_faltantes.append(item)
+    errores.extend(f"Ítem no encontrado: {item}" for item in items_faltantes)
+
+    return errores
@@ -0,0 +1,227 @@
+import time
+import random
+import logging
+from collections import deque
+from typing import Dict, List
+
+# Punto de guardado por archivo dentro de la transacción del grupo. Con
+# autocommit desactivado la transacción puede no haber empezado todavía.
+SQL_ABRIR_PUNTO_GUARDADO = """
+    IF @@TRANCOUNT = 0 BEGIN TRANSACTION;
+    SAVE TRANSACTION {nombre};
+"""
+
+# Revierte solo el archivo con errores. Devuelve 1 si la transacción del grupo
+# sigue utilizable; algunos errores del servidor la invalidan por completo.
+SQL_REVERTIR_PUNTO_GUARDADO = """
+    IF XACT_STATE() = 1
+    BEGIN
+        ROLLBACK TRANSACTION {nombre};
+        SELECT 1;
+    END
+    ELSE
+        SELECT 0;
+"""
+
+# SQLSTATE de errores que se resuelven repitiendo la transacción: interbloqueo,
+# tiempo de espera agotado y conexión perdida
+SQLSTATE_TRANSITORIOS = {'40001', '40P01', 'HYT00', 'HYT01', '08S01'}
+# Números de error de SQL Server: interbloqueo y espera de bloqueo agotada
+ERRORES_TRANSITORIOS = ('(1205)', '(1222)')
+# Clase SQLSTATE de las excepciones de conexión (08S01: enlace de comunicación caído)
+CLASE_ERROR_CONEXION = '08'
+
+
+def es_error_transitorio(error: Exception) -> bool:
+    """Indica si un error de la base de datos puede resolverse reintentando"""
+    estado = error.args[0] if error.args else None
+    if isinstance(estado, str) and estado in SQLSTATE_TRANSITORIOS:
+        return True
+    return any(numero in str(error) for numero in ERRORES_TRANSITORIOS)
+
+
+def es_error_de_conexion(error: Exception) -> bool:
+    """Indica si el error dejó inutilizable la conexión (no solo la transacción)"""
+    estado = error.args[0] if error.args else None
+    return isinstance(estado, str) and estado.startswith(CLASE_ERROR_CONEXION)
+
+
+class _GrupoRevertido(Exception):
+    """La transacción del grupo se perdió por el error de un archivo y debe reescribirse"""
+
+
+class RegistroGrupal:
+    """Registro de evaluaciones con commit en grupo.
+
+    Las evaluaciones de varios archivos se escriben en una misma transacción,
+    cada una protegida por un punto de guardado: un archivo con errores revierte
+    solo sus cambios. El grupo se confirma al llegar a tamano_grupo evaluaciones
+    escritas o al llamar a confirmar. Ante un error transitorio (interbloqueo,
+    tiempo de espera, conexión perdida) se revierte el grupo, se espera con
+    retroceso exponencial y se vuelven a escribir sus evaluaciones; la conexión
+    solo se descarta si el error es de conexión o si falla el rollback.
+
+    agregar y confirmar devuelven las entradas ya resueltas, en el orden en que
+    se agregaron, como {'datos', 'resultado'}; el resultado solo es definitivo
+    después del commit. Las correcciones de evaluaciones ya registradas
+    (agregar con actualizar) comparten el mismo grupo y agregan 'cambios' y
+    'eliminados' a su resultado.
+    """
+
+    def __init__(self, sistema, tamano_grupo: int = 20, reintentos: int = 3, espera_inicial: float = 0.5):
+        self.sistema = sistema
+        self.tamano_grupo = max(1, tamano_grupo)
+        self.reintentos = reintentos
+        self.espera_inicial = espera_inicial
+        self.logger = logging.getLogger(__name__)
+
+        # Entradas agregadas desde el último commit y las escritas en la transacción
+        self._pendientes: List[Dict] = []
+        self._escritas: List[Dict] = []
+        self._contador = 0
+
+    def agregar(self, datos: Dict, resultado: Dict, preparar: bool = True,
+                actualizar: bool = False) -> List[Dict]:
+        """Escribe una evaluación en el grupo; confirma el grupo si está completo.
+
+        Con preparar=False se omiten la corrección de nombres, la prevalidación y
+        la búsqueda de duplicados locales (evaluaciones ya preparadas del diario).
+        Con actualizar se escriben solo las diferencias con la evaluación ya
+        registrada, o la evaluación completa si no existe (ver
+        escribir_actualizacion).
+        """
+        entrada = {'datos': datos, 'resultado': resultado, 'fallida': False, 'actualizar': actualizar}
+        self._pendientes.append(entrada)
+        try:
+            if preparar:
+                self.sistema.preparar_registro(datos, descartar_duplicados=not actualizar)
+            self._con_reintentos(lambda: self._escribir(entrada))
+        except Exception as e:
+            if es_error_transitorio(e):
+                # Reintentos agotados: se pierde el grupo completo
+                self._revertir(descartar=es_error_de_conexion(e))
+                self._fallar_grupo(e)
+            else:
+                self._fallar(entrada, e)
+        if len(self._escritas) >= self.tamano_grupo:
+            return self.confirmar()
+        return []
+
+    def confirmar(self) -> List[Dict]:
+        """Confirma el grupo en curso y devuelve sus entradas resueltas"""
+        if self._escritas:
+            inicio = time.perf_counter()
+            try:
+                self._con_reintentos(lambda: self.sistema.conn.commit())
+            except Exception as e:
+                self._revertir(descartar=es_error_de_conexion(e))
+                self._fallar_grupo(e)
+            else:
+                # El costo del commit se reparte entre los archivos del grupo
+                duracion = (time.perf_counter() - inicio) / len(self._escritas)
+                for entrada in self._escritas:
+                    duraciones = entrada['datos'].setdefault('duraciones', {})
+                    duraciones['commit'] = duraciones.get('commit', 0.0) + duracion
+                    entrada['resultado']['evaluacion_id'] = entrada['evaluacion_id']
+                    entrada['resultado']['exito'] = True
+                    if entrada['actualizar']:
+                        entrada['resultado']['cambios'] = entrada['actualizacion']['cambios']
+                        entrada['resultado']['eliminados'] = entrada['actualizacion']['eliminados']
+                    self.sistema.registrar_en_manifiesto(entrada['datos'], entrada['evaluacion_id'])
+                # Un solo MERGE del resumen de BI por grupo, fuera de su transacción
+                self.sistema.aplicar_resumen()
+                self.logger.info(f"Grupo confirmado: {len(self._escritas)} evaluaciones")
+        resueltas, self._pendientes, self._escritas = self._pendientes, [], []
+        for entrada in resueltas:
+            entrada['resultado']['correcciones'] = entrada['datos'].get('correcciones', [])
+        return resueltas
+
+    def descartar(self):
+        """Revierte el grupo en curso sin confirmarlo (p. ej. ante un error fatal)"""
+        if self._escritas:
+            self._revertir()
+        self._pendientes, self._escritas = [], []
+
+    def _con_reintentos(self, accion):
+        """Ejecuta accion; si la transacción se pierde la reescribe y repite accion"""
+        reescribir = deque()
+        intento = 0
+        while True:
+            try:
+                while reescribir:
+                    self._escribir(reescribir[0])
+                    reescribir.popleft()
+                return accion()
+            except _GrupoRevertido:
+                pass
+            except Exception as e:
+                if not es_error_transitorio(e) or intento >= self.reintentos:
+                    raise
+                espera = self.espera_inicial * 2 ** intento * random.uniform(1.0, 1.5)
+                intento += 1
+                self.logger.warning(
+                    f"Error transitorio en el grupo ({str(e)}); reintento {intento} de {self.reintentos} "
+                    f"en {espera:.1f}s"
+                )
+                self._revertir(descartar=es_error_de_conexion(e))
+                time.sleep(espera)
+            # Las evaluaciones ya escritas se perdieron con la transacción
+            reescribir = deque(self._escritas + list(reescribir))
+            self._escritas = []
+
+    def _escribir(self, entrada: Dict):
+        """Escribe una evaluación bajo su propio punto de guardado"""
+        if entrada['fallida']:
+            return
+        if not self.sistema.conn:
+            self.sistema.conectar_bd()
+        self._contador += 1
+        nombre = f"archivo_{self._contador}"
+        cursor = self.sistema.conn.cursor()
+        cursor.execute(SQL_ABRIR_PUNTO_GUARDADO.format(nombre=nombre))
+        try:
+            if entrada['actualizar']:
+                entrada['actualizacion'] = self.sistema.escribir_actualizacion(cursor, entrada['datos'])
+                entrada['evaluacion_id'] = entrada['actualizacion']['evaluacion_id']
+            else:
+                entrada['evaluacion_id'] = self.sistema.escribir_evaluacion(cursor, entrada['datos'])
+        except Exception as e:
+            if es_error_transitorio(e):
+                raise
+            self._fallar(entrada, e)
+            cursor.execute(SQL_REVERTIR_PUNTO_GUARDADO.format(nombre=nombre))
+            if not cursor.fetchval():
+                self.logger.warning("La transacción del grupo quedó invalidada; se reescriben sus evaluaciones")
+                self._revertir()
+                raise _GrupoRevertido()
+            return
+        self._escritas.append(entrada)
+
+    def _revertir(self, descartar: bool = False):
+        """Revierte la transacción; una conexión rota no vuelve al pool.
+
+        Tras un interbloqueo o una espera agotada basta el rollback y la conexión
+        se reutiliza; se descarta con descartar o si el propio rollback falla.
+        """
+        if not self.sistema.conn:
+            return
+        try:
+            self.sistema.conn.rollback()
+        except Exception:
+            descartar = True
+        if descartar:
+            self.sistema.cerrar_conexion(descartar=True)
+
+    def _fallar(self, entrada: Dict, error: Exception):
+        entrada['fallida'] = True
+        entrada['resultado']['error'] = str(error)
+        entrada['resultado']['duplicado'] = "Ya existe una evaluación" in str(error)
+        if entrada in self._escritas:
+            self._escritas.remove(entrada)
+
+    def _fallar_grupo(self, error: Exception):
+        """Marca como fallidas las evaluaciones del grupo que no llegaron a confirmarse"""
+        self.logger.error(f"No se pudo confirmar el grupo: {str(error)}")
+        for entrada in self._pendientes:
+            if not entrada['fallida']:
+                self._fallar(entrada, error)
@@ -0,0 +1,124 @@
+import heapq
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from catalogos import CatalogoCache, normalizar_nombre
+
+
+def _ngramas(clave: str, n: int = 3) -> Set[str]:
+    """N-gramas de cada palabra (con relleno), independientes del orden de las palabras"""
+    ngramas = set()
+    for palabra in clave.split():
+        texto = f"{' ' * (n - 1)}{palabra} "
+        ngramas.update(texto[i:i + n] for i in range(len(texto) - n + 1))
+    return ngramas
+
+
+def _clave_ordenada(clave: str) -> str:
+    """Clave con las palabras ordenadas ("avila luis" == "luis avila")"""
+    return ' '.join(sorted(clave.split()))
+
+
+class ResolvedorNombres:
+    """Índice en memoria para resolver nombres escritos a mano contra una tabla de referencia.
+
+    Las coincidencias exactas (sin tildes, mayúsculas ni orden de palabras) se
+    resuelven con un diccionario; las aproximadas con un índice invertido de
+    trigramas y la similitud de Dice.
+    """
+
+    def __init__(self, nombres: Iterable[str], n: int = 3):
+        self.n = n
+        self.nombres = list(dict.fromkeys(nombres))
+        self._exactos: Dict[str, List[int]] = {}
+        self._indice: Dict[str, List[int]] = {}
+        self._tamanos: List[int] = []
+        for idx, nombre in enumerate(self.nombres):
+            clave = normalizar_nombre(nombre)
+            for variante in {clave, _clave_ordenada(clave)}:
+                self._exactos.setdefault(variante, []).append(idx)
+            ngramas = _ngramas(clave, n)
+            self._tamanos.append(len(ngramas))
+            for ngrama in ngramas:
+                self._indice.setdefault(ngrama, []).append(idx)
+
+    def exactos(self, nombre: str) -> List[str]:
+        """Nombres que coinciden ignorando tildes, mayúsculas, espacios y orden de palabras"""
+        clave = normalizar_nombre(nombre)
+        indices = self._exactos.get(clave) or self._exactos.get(_clave_ordenada(clave), [])
+        return [self.nombres[idx] for idx in dict.fromkeys(indices)]
+
+    def sugerencias(self, nombre: str, limite: int = 5, umbral: float = 0.5) -> List[Tuple[str, float]]:
+        """Nombres más parecidos con su similitud (0 a 1), de mayor a menor"""
+        consulta = _ngramas(normalizar_nombre(nombre), self.n)
+        if not consulta:
+            return []
+        coincidencias = Counter()
+        for ngrama in consulta:
+            coincidencias.update(self._indice.get(ngrama, ()))
+        puntajes = (
+            (2.0 * comunes / (len(consulta) + self._tamanos[idx]), idx)
+            for idx, comunes in coincidencias.items()
+        )
+        return [
+            (self.nombres[idx], round(puntaje, 3))
+            for puntaje, idx in heapq.nlargest(limite, puntajes)
+            if puntaje >= umbral
+        ]
+
+    def resolver(self, nombre: str, umbral: float = 0.85, margen: float = 0.1) -> Optional[str]:
+        """Nombre oficial si la coincidencia es inequívoca, o None.
+
+        Se acepta una coincidencia exacta única o una aproximada con similitud
+        mayor o igual al umbral y con ventaja suficiente sobre la segunda.
+        """
+        exactos = self.exactos(nombre)
+        if len(exactos) == 1:
+            return exactos[0]
+        if exactos:
+            return None
+        candidatos = self.sugerencias(nombre, limite=2, umbral=0.0)
+        if not candidatos or candidatos[0][1] < umbral:
+            return None
+        if len(candidatos) > 1 and candidatos[0][1] - candidatos[1][1] < margen:
+            return None
+        return candidatos[0][0]
+
+
+class ResolvedorReferencias:
+    """Resolvedores de docentes, asignaturas y carreras construidos desde la caché de catálogos.
+
+    Los índices se construyen al primer uso y se reconstruyen cuando los
+    catálogos se recargan.
+    """
+
+    def __init__(self, catalogos: CatalogoCache):
+        self.catalogos = catalogos
+        self._version = None
+        self._resolvedores: Dict[Tuple[str, Optional[str]], ResolvedorNombres] = {}
+
+    def _obtener(self, tipo: str, facultad: Optional[str] = None) -> ResolvedorNombres:
+        """Resolvedor vigente para un tipo de referencia (y facultad, en carreras)"""
+        version = self.catalogos.version()
+        if version is None or version != self._version:
+            self._resolvedores = {}
+        
+        clave = (tipo, normalizar_nombre(facultad) if facultad else None)
+        resolvedor = self._resolvedores.get(clave)
+        if resolvedor is None:
+            if tipo == 'carreras':
+                nombres = self.catalogos.carreras_por_facultad(facultad) if facultad else self.catalogos.carreras()
+            else:
+                nombres = self.catalogos.nombres_referencia(tipo)
+            self._version = self.catalogos.version()
+            resolvedor = self._resolvedores[clave] = ResolvedorNombres(nombres)
+        return resolvedor
+
+    def resolver(self, tipo: str, nombre: str, facultad: Optional[str] = None) -> Optional[str]:
+        """Nombre oficial inequívoco para 'docentes', 'asignaturas' o 'carreras'"""
+        return self._obtener(tipo, facultad).resolver(nombre)
+
+    def sugerencias(self, tipo: str, nombre: str, facultad: Optional[str] = None,
+                    limite: int = 3) -> List[str]:
+        """Nombres oficiales más parecidos, para mensajes de error"""
+        return [candidato for candidato, _ in self._obtener(tipo, facultad).sugerencias(nombre, limite=limite)]
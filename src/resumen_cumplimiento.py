@@ -0,0 +1,322 @@
+import time
+import logging
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from cumplimiento import acumular_estado, porcentaje_acumulado
+
+# Tablas de resumen para los tableros de BI. ResumenEvaluaciones lleva la
+# cantidad de evaluaciones y la suma de PorcentajeCumplimiento por periodo,
+# facultad y carrera; ResumenCumplimiento, la cantidad de ítems en cada estado
+# por periodo, facultad, carrera y categoría.
+SQL_CREAR_RESUMEN = """
+    IF OBJECT_ID('dbo.ResumenEvaluaciones', 'U') IS NULL
+        CREATE TABLE dbo.ResumenEvaluaciones (
+            PeriodoID INT NOT NULL,
+            FacultadID INT NOT NULL,
+            CarreraID INT NOT NULL,
+            Evaluaciones INT NOT NULL,
+            SumaPorcentaje DECIMAL(18, 2) NOT NULL,
+            CONSTRAINT PK_ResumenEvaluaciones PRIMARY KEY (PeriodoID, FacultadID, CarreraID)
+        );
+    IF OBJECT_ID('dbo.ResumenCumplimiento', 'U') IS NULL
+        CREATE TABLE dbo.ResumenCumplimiento (
+            PeriodoID INT NOT NULL,
+            FacultadID INT NOT NULL,
+            CarreraID INT NOT NULL,
+            CategoriaID INT NOT NULL,
+            Estado NVARCHAR(100) NOT NULL,
+            Items INT NOT NULL,
+            CONSTRAINT PK_ResumenCumplimiento PRIMARY KEY (PeriodoID, FacultadID, CarreraID, CategoriaID, Estado)
+        );
+"""
+
+# Agregados calculados desde el historial (reconstrucción y verificación)
+SQL_AGREGAR_EVALUACIONES = """
+    SELECT e.PeriodoID, c.FacultadID, e.CarreraID, COUNT(*), SUM(ISNULL(e.PorcentajeCumplimiento, 0))
+    FROM Evaluaciones e
+    INNER JOIN Carreras c ON e.CarreraID = c.CarreraID
+    WHERE {filtro}
+    GROUP BY e.PeriodoID, c.FacultadID, e.CarreraID
+"""
+
+SQL_AGREGAR_RESULTADOS = """
+    SELECT e.PeriodoID, c.FacultadID, e.CarreraID, i.CategoriaID, r.Estado, COUNT(*)
+    FROM ResultadosEvaluacion r
+    INNER JOIN Evaluaciones e ON r.EvaluacionID = e.EvaluacionID
+    INNER JOIN Carreras c ON e.CarreraID = c.CarreraID
+    INNER JOIN ItemsEvaluacion i ON r.ItemID = i.ItemID
+    WHERE {filtro}
+    GROUP BY e.PeriodoID, c.FacultadID, e.CarreraID, i.CategoriaID, r.Estado
+"""
+
+# Tablas temporales de la sesión donde se anotan los aportes al resumen. Deben
+# crearse en un lote sin parámetros: pyodbc envía los lotes con parámetros por
+# sp_prepexec/sp_executesql y una #tabla creada ahí se elimina al volver de la
+# llamada. También se eliminan si se revierte la transacción que las creó, por
+# eso se comprueban antes de cada anotación.
+SQL_CREAR_DELTAS_RESUMEN = """
+    IF OBJECT_ID('dbo.ResumenCumplimiento', 'U') IS NOT NULL
+    BEGIN
+        IF OBJECT_ID('tempdb..#DeltaEvaluaciones') IS NULL
+            CREATE TABLE #DeltaEvaluaciones (
+                PeriodoID INT NOT NULL,
+                FacultadID INT NOT NULL,
+                CarreraID INT NOT NULL,
+                Evaluaciones INT NOT NULL,
+                SumaPorcentaje DECIMAL(18, 2) NOT NULL,
+                PRIMARY KEY (PeriodoID, FacultadID, CarreraID)
+            );
+        IF OBJECT_ID('tempdb..#DeltaCumplimiento') IS NULL
+            CREATE TABLE #DeltaCumplimiento (
+                PeriodoID INT NOT NULL,
+                FacultadID INT NOT NULL,
+                CarreraID INT NOT NULL,
+                CategoriaID INT NOT NULL,
+                Estado NVARCHAR(100) NOT NULL,
+                Items INT NOT NULL,
+                PRIMARY KEY (PeriodoID, FacultadID, CarreraID, CategoriaID, Estado)
+            );
+    END
+"""
+
+# Anota (@Signo = 1) o descuenta (@Signo = -1) el aporte de una evaluación en
+# las tablas de SQL_CREAR_DELTAS_RESUMEN, dentro de la transacción que la
+# registra. No toca las filas compartidas del resumen, así que no hace esperar a
+# las otras sesiones, y si la transacción o el punto de guardado del archivo se
+# revierten la anotación se revierte con ellos. No hace nada mientras no se
+# hayan creado las tablas de resumen (ver ResumenCumplimiento.reconstruir).
+SQL_ACUMULAR_RESUMEN = """
+    DECLARE @Signo INT = ?, @EvaluacionID INT = ?;
+    IF OBJECT_ID('tempdb..#DeltaEvaluaciones') IS NOT NULL
+    BEGIN
+        MERGE #DeltaEvaluaciones AS destino
+        USING ({evaluaciones}) AS origen (PeriodoID, FacultadID, CarreraID, Evaluaciones, SumaPorcentaje)
+            ON destino.PeriodoID = origen.PeriodoID AND destino.FacultadID = origen.FacultadID
+               AND destino.CarreraID = origen.CarreraID
+        WHEN MATCHED THEN UPDATE SET
+            Evaluaciones = destino.Evaluaciones + @Signo * origen.Evaluaciones,
+            SumaPorcentaje = destino.SumaPorcentaje + @Signo * origen.SumaPorcentaje
+        WHEN NOT MATCHED THEN
+            INSERT (PeriodoID, FacultadID, CarreraID, Evaluaciones, SumaPorcentaje)
+            VALUES (origen.PeriodoID, origen.FacultadID, origen.CarreraID,
+                    @Signo * origen.Evaluaciones, @Signo * origen.SumaPorcentaje);
+
+        MERGE #DeltaCumplimiento AS destino
+        USING ({resultados}) AS origen (PeriodoID, FacultadID, CarreraID, CategoriaID, Estado, Items)
+            ON destino.PeriodoID = origen.PeriodoID AND destino.FacultadID = origen.FacultadID
+               AND destino.CarreraID = origen.CarreraID AND destino.CategoriaID = origen.CategoriaID
+               AND destino.Estado = origen.Estado
+        WHEN MATCHED THEN UPDATE SET Items = destino.Items + @Signo * origen.Items
+        WHEN NOT MATCHED THEN
+            INSERT (PeriodoID, FacultadID, CarreraID, CategoriaID, Estado, Items)
+            VALUES (origen.PeriodoID, origen.FacultadID, origen.CarreraID, origen.CategoriaID,
+                    origen.Estado, @Signo * origen.Items);
+    END
+""".format(
+    evaluaciones=SQL_AGREGAR_EVALUACIONES.format(filtro="e.EvaluacionID = @EvaluacionID"),
+    resultados=SQL_AGREGAR_RESULTADOS.format(filtro="e.EvaluacionID = @EvaluacionID")
+)
+
+# Lleva al resumen lo anotado por SQL_ACUMULAR_RESUMEN desde el último commit,
+# en una transacción corta propia que se ejecuta después de confirmar: un MERGE
+# por tabla con las diferencias ya agrupadas (una vez por grupo en el commit en
+# grupo). Las temporales tienen la clave primaria del resumen, de modo que se
+# recorren y bloquean las filas compartidas en el orden de la clave.
+SQL_APLICAR_RESUMEN = """
+    IF OBJECT_ID('tempdb..#DeltaEvaluaciones') IS NOT NULL
+    BEGIN
+        MERGE dbo.ResumenEvaluaciones WITH (HOLDLOCK) AS destino
+        USING (
+            SELECT PeriodoID, FacultadID, CarreraID, Evaluaciones, SumaPorcentaje
+            FROM #DeltaEvaluaciones
+            WHERE Evaluaciones <> 0 OR SumaPorcentaje <> 0
+        ) AS origen
+            ON destino.PeriodoID = origen.PeriodoID AND destino.FacultadID = origen.FacultadID
+               AND destino.CarreraID = origen.CarreraID
+        WHEN MATCHED AND destino.Evaluaciones + origen.Evaluaciones = 0 THEN DELETE
+        WHEN MATCHED THEN UPDATE SET
+            Evaluaciones = destino.Evaluaciones + origen.Evaluaciones,
+            SumaPorcentaje = destino.SumaPorcentaje + origen.SumaPorcentaje
+        WHEN NOT MATCHED THEN
+            INSERT (PeriodoID, FacultadID, CarreraID, Evaluaciones, SumaPorcentaje)
+            VALUES (origen.PeriodoID, origen.FacultadID, origen.CarreraID,
+                    origen.Evaluaciones, origen.SumaPorcentaje);
+        DELETE FROM #DeltaEvaluaciones;
+    END
+    IF OBJECT_ID('tempdb..#DeltaCumplimiento') IS NOT NULL
+    BEGIN
+        MERGE dbo.ResumenCumplimiento WITH (HOLDLOCK) AS destino
+        USING (
+            SELECT PeriodoID, FacultadID, CarreraID, CategoriaID, Estado, Items
+            FROM #DeltaCumplimiento
+            WHERE Items <> 0
+        ) AS origen
+            ON destino.PeriodoID = origen.PeriodoID AND destino.FacultadID = origen.FacultadID
+               AND destino.CarreraID = origen.CarreraID AND destino.CategoriaID = origen.CategoriaID
+               AND destino.Estado = origen.Estado
+        WHEN MATCHED AND destino.Items + origen.Items = 0 THEN DELETE
+        WHEN MATCHED THEN UPDATE SET Items = destino.Items + origen.Items
+        WHEN NOT MATCHED THEN
+            INSERT (PeriodoID, FacultadID, CarreraID, CategoriaID, Estado, Items)
+            VALUES (origen.PeriodoID, origen.FacultadID, origen.CarreraID, origen.CategoriaID,
+                    origen.Estado, origen.Items);
+        DELETE FROM #DeltaCumplimiento;
+    END
+"""
+
+# Reemplaza el resumen completo; el bloqueo exclusivo hace esperar a las
+# ingestas concurrentes hasta el commit
+SQL_RECONSTRUIR_RESUMEN = """
+    DELETE FROM dbo.ResumenEvaluaciones WITH (TABLOCKX);
+    DELETE FROM dbo.ResumenCumplimiento WITH (TABLOCKX);
+    INSERT INTO dbo.ResumenEvaluaciones (PeriodoID, FacultadID, CarreraID, Evaluaciones, SumaPorcentaje)
+    {evaluaciones};
+    INSERT INTO dbo.ResumenCumplimiento (PeriodoID, FacultadID, CarreraID, CategoriaID, Estado, Items)
+    {resultados};
+""".format(
+    evaluaciones=SQL_AGREGAR_EVALUACIONES.format(filtro="e.Estado = 1"),
+    resultados=SQL_AGREGAR_RESULTADOS.format(filtro="e.Estado = 1")
+)
+
+SQL_CONSULTAR_RESUMEN = """
+    SELECT p.Nombre, f.Nombre, c.Nombre, cat.Nombre, rc.Estado, rc.Items, re.Evaluaciones, re.SumaPorcentaje
+    FROM ResumenCumplimiento rc
+    INNER JOIN ResumenEvaluaciones re
+        ON re.PeriodoID = rc.PeriodoID AND re.FacultadID = rc.FacultadID AND re.CarreraID = rc.CarreraID
+    INNER JOIN PeriodosAcademicos p ON rc.PeriodoID = p.PeriodoID
+    INNER JOIN Facultades f ON rc.FacultadID = f.FacultadID
+    INNER JOIN Carreras c ON rc.CarreraID = c.CarreraID
+    INNER JOIN CategoriasEvaluacion cat ON rc.CategoriaID = cat.CategoriaID
+    WHERE {filtro}
+    ORDER BY p.Nombre, f.Nombre, c.Nombre, cat.Orden
+"""
+
+
+def _numero(valor) -> float:
+    return float(valor) if isinstance(valor, Decimal) else valor
+
+
+class ResumenCumplimiento:
+    """Agregados de cumplimiento mantenidos en la ingesta para los tableros de BI.
+
+    escribir_evaluacion anota el aporte de cada evaluación en su misma
+    transacción (SQL_ACUMULAR_RESUMEN), así nunca se cuentan evaluaciones
+    revertidas, y EvaluacionDocenteSystem.aplicar_resumen lo suma al resumen
+    después del commit. Si esa segunda transacción falla, o coincide con una
+    reconstrucción, el resumen puede quedar desfasado: verificar compara el
+    resumen con el historial sin modificarlo y reconstruir, que además crea las
+    tablas la primera vez, lo recalcula desde el historial.
+    """
+
+    def __init__(self, sistema):
+        self.sistema = sistema
+        self.logger = logging.getLogger(__name__)
+
+    def reconstruir(self) -> Dict:
+        """Crea las tablas de resumen si faltan y las recalcula desde el historial"""
+        inicio = time.perf_counter()
+        with self.sistema.conexion() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(SQL_CREAR_RESUMEN)
+                cursor.execute(SQL_RECONSTRUIR_RESUMEN)
+                cursor.execute("SELECT COUNT(*) FROM ResumenEvaluaciones")
+                combinaciones = cursor.fetchval()
+                cursor.execute("SELECT COUNT(*) FROM ResumenCumplimiento")
+                filas = cursor.fetchval()
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        resumen = {
+            'combinaciones': combinaciones,
+            'filas_estado': filas,
+            'duracion': round(time.perf_counter() - inicio, 3)
+        }
+        self.logger.info(
+            f"Resumen de cumplimiento reconstruido: {combinaciones} combinaciones periodo/carrera, "
+            f"{filas} filas por categoría y estado en {resumen['duracion']:.2f}s"
+        )
+        return resumen
+
+    def _leer(self, cursor, consulta: str, claves: int) -> Dict[Tuple, Tuple]:
+        cursor.execute(consulta)
+        return {tuple(fila[:claves]): tuple(_numero(v) for v in fila[claves:]) for fila in cursor.fetchall()}
+
+    def verificar(self, max_diferencias: int = 50) -> Dict:
+        """Compara el resumen almacenado con los agregados calculados desde el historial"""
+        inicio = time.perf_counter()
+        diferencias = []
+        with self.sistema.conexion() as conn:
+            cursor = conn.cursor()
+            comparaciones = [
+                ('evaluaciones', 3,
+                 "SELECT PeriodoID, FacultadID, CarreraID, Evaluaciones, SumaPorcentaje FROM ResumenEvaluaciones",
+                 SQL_AGREGAR_EVALUACIONES.format(filtro="e.Estado = 1")),
+                ('resultados', 5,
+                 "SELECT PeriodoID, FacultadID, CarreraID, CategoriaID, Estado, Items FROM ResumenCumplimiento",
+                 SQL_AGREGAR_RESULTADOS.format(filtro="e.Estado = 1"))
+            ]
+            total = 0
+            for tabla, claves, consulta_resumen, consulta_historial in comparaciones:
+                almacenado = self._leer(cursor, consulta_resumen, claves)
+                calculado = self._leer(cursor, consulta_historial, claves)
+                total += len(calculado)
+                for clave in sorted(set(almacenado) | set(calculado), key=str):
+                    esperado, actual = calculado.get(clave), almacenado.get(clave)
+                    if esperado is None or actual is None or any(
+                        abs(a - b) > 0.01 for a, b in zip(esperado, actual)
+                    ):
+                        diferencias.append({'tabla': tabla, 'clave': list(clave),
+                                            'historial': esperado, 'resumen': actual})
+
+        resumen = {
+            'consistente': not diferencias,
+            'combinaciones': total,
+            'diferencias': len(diferencias),
+            'detalle': diferencias[:max_diferencias],
+            'duracion': round(time.perf_counter() - inicio, 3)
+        }
+        self.logger.info(
+            f"Verificación del resumen de cumplimiento: {total} combinaciones, {len(diferencias)} diferencias"
+        )
+        return resumen
+
+    def consultar(self, periodo: Optional[str] = None, facultad: Optional[str] = None) -> List[Dict]:
+        """Cumplimiento por periodo, facultad, carrera y categoría leído del resumen.
+
+        Cada fila tiene la cantidad de ítems por estado, el cumplimiento de la
+        categoría (con los pesos de cada estado) y el promedio de
+        PorcentajeCumplimiento de las evaluaciones de la carrera.
+        """
+        condiciones, parametros = ["1 = 1"], []
+        if periodo:
+            condiciones.append("p.Nombre = ?")
+            parametros.append(periodo)
+        if facultad:
+            condiciones.append("f.Nombre = ?")
+            parametros.append(facultad)
+
+        filas: Dict[Tuple, Dict] = {}
+        with self.sistema.conexion() as conn:
+            cursor = conn.cursor()
+            cursor.execute(SQL_CONSULTAR_RESUMEN.format(filtro=" AND ".join(condiciones)), parametros)
+            for periodo_, facultad_, carrera, categoria, estado, items, evaluaciones, suma in cursor.fetchall():
+                fila = filas.setdefault((periodo_, facultad_, carrera, categoria), {
+                    'periodo': periodo_,
+                    'facultad': facultad_,
+                    'carrera': carrera,
+                    'categoria': categoria,
+                    'estados': {},
+                    'evaluaciones': evaluaciones,
+                    'promedio_cumplimiento': round(_numero(suma) / evaluaciones, 2) if evaluaciones else 0.0
+                })
+                fila['estados'][estado] = items
+
+        for fila in filas.values():
+            acumulado = [0.0, 0]
+            for estado, items in fila['estados'].items():
+                acumular_estado(acumulado, estado, items)
+            fila['cumplimiento_categoria'] = porcentaje_acumulado(acumulado)
+        return list(filas.values())
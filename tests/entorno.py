@@ -0,0 +1,53 @@
+"""Entorno de las pruebas: rutas de importación y un sistema sobre el sustituto SQLite"""
+import os
+import sys
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _ruta in (os.path.join(RAIZ, 'src'), os.path.join(RAIZ, 'benchmarks')):
+    if _ruta not in sys.path:
+        sys.path.insert(0, _ruta)
+
+from evaluacion_docente import EvaluacionDocenteSystem  # noqa: E402
+from generar_libros import generar_catalogo, generar_libros  # noqa: E402
+from sustituto_sqlite import crear_base, fabrica_conexiones  # noqa: E402
+
+
+class PruebaConBase(unittest.TestCase):
+    """Caso con libros sintéticos y una base SQLite sustituta nueva en cada prueba"""
+
+    ARCHIVOS = 6
+    ITEMS = 12
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp(prefix='evaluacion_prueba_')
+        self.addCleanup(shutil.rmtree, self.directorio, ignore_errors=True)
+        self.catalogo = generar_catalogo(self.ARCHIVOS, self.ITEMS)
+        self.rutas = generar_libros(os.path.join(self.directorio, 'libros'), self.catalogo, self.ARCHIVOS)
+        self.ruta_bd = os.path.join(self.directorio, 'bd.db')
+        crear_base(self.ruta_bd, self.catalogo)
+        self.sistema = self.crear_sistema('datos')
+
+    def crear_sistema(self, nombre: str) -> EvaluacionDocenteSystem:
+        """Sistema con su propio directorio de datos (manifiesto, diario y caché)"""
+        sistema = EvaluacionDocenteSystem(
+            fabrica_conexion=fabrica_conexiones(self.ruta_bd),
+            directorio_datos=os.path.join(self.directorio, nombre)
+        )
+        self.addCleanup(sistema.pool.cerrar)
+        self.addCleanup(sistema.cerrar_conexion)
+        return sistema
+
+    def consultar(self, sql: str, *parametros):
+        """Filas de una consulta directa a la base sustituta"""
+        conn = sqlite3.connect(self.ruta_bd)
+        try:
+            return conn.execute(sql, parametros).fetchall()
+        finally:
+            conn.close()
+
+    def contar(self, tabla: str) -> int:
+        return self.consultar(f"SELECT COUNT(*) FROM {tabla}")[0][0]
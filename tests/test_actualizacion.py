@@ -0,0 +1,156 @@
+import unittest
+from datetime import datetime
+
+from openpyxl import load_workbook
+
+from tests.entorno import PruebaConBase
+from evaluacion_docente import diferencias_resultados, extraer_evaluacion
+from ingesta_lote import MotorIngestaLote
+
+FECHA = datetime(2024, 5, 10)
+FECHA_DEFECTO = datetime(2024, 6, 1)
+
+
+class PruebaDiferenciasResultados(unittest.TestCase):
+    """Comparación ítem por ítem de un libro corregido con lo almacenado"""
+
+    def setUp(self):
+        self.almacenados = [
+            (1, 'Ítem 1', 'Cumplimiento satisfactorio', FECHA, None),
+            (2, 'Ítem 2', 'Incumplimiento', FECHA, 'Falta el sílabo'),
+            (3, 'Ítem 3', 'No Aplica', FECHA, None)
+        ]
+
+    def test_sin_cambios(self):
+        resultados = [(item, estado, fecha, obs) for _, item, estado, fecha, obs in self.almacenados]
+        self.assertEqual(diferencias_resultados(self.almacenados, resultados), ([], [], []))
+
+    def test_modificado_nuevo_y_eliminado(self):
+        resultados = [
+            ('ítem 1 ', 'Cumplimiento parcial', FECHA, None),
+            ('Ítem 2', 'Incumplimiento', FECHA, 'Falta el sílabo'),
+            ('Ítem 4', 'Cumplimiento satisfactorio', FECHA, None)
+        ]
+        cambios, modificados, eliminados = diferencias_resultados(self.almacenados, resultados)
+        self.assertEqual(cambios, [resultados[0], resultados[2]])
+        self.assertEqual(modificados, [1])
+        self.assertEqual(eliminados, [3])
+
+    def test_fecha_vacia_conserva_la_almacenada(self):
+        resultados = [(item, estado, FECHA_DEFECTO, obs) for _, item, estado, _, obs in self.almacenados]
+        self.assertEqual(diferencias_resultados(self.almacenados, resultados, FECHA_DEFECTO), ([], [], []))
+
+        resultados[1] = ('Ítem 2', 'Cumplimiento satisfactorio', FECHA_DEFECTO, 'Falta el sílabo')
+        cambios, modificados, _ = diferencias_resultados(self.almacenados, resultados, FECHA_DEFECTO)
+        self.assertEqual(cambios, [('Ítem 2', 'Cumplimiento satisfactorio', FECHA, 'Falta el sílabo')])
+        self.assertEqual(modificados, [2])
+
+    def test_item_repetido_en_el_libro(self):
+        resultados = [('Ítem 1', 'Incumplimiento', FECHA, None), ('ÍTEM 1', 'Incumplimiento', FECHA, None)]
+        with self.assertRaisesRegex(ValueError, 'Ya existe un resultado para el ítem: ÍTEM 1'):
+            diferencias_resultados(self.almacenados, resultados)
+
+
+class PruebaActualizarEvaluacion(PruebaConBase):
+    """Reingreso de libros corregidos de evaluaciones ya registradas"""
+
+    def resultados_almacenados(self, evaluacion_id: int):
+        return self.consultar("""
+            SELECT i.Nombre, r.Estado FROM ResultadosEvaluacion r
+            INNER JOIN ItemsEvaluacion i ON r.ItemID = i.ItemID
+            WHERE r.EvaluacionID = ? ORDER BY i.Nombre
+        """, evaluacion_id)
+
+    def corregir_libro(self, ruta: str):
+        """Otro estado en la primera fila del libro y sin la última"""
+        libro = load_workbook(ruta)
+        hoja = libro['EVALUACION']
+        estado = hoja.cell(row=2, column=3).value
+        hoja.cell(row=2, column=3).value = 'Incumplimiento' if estado != 'Incumplimiento' else 'Cumplimiento parcial'
+        hoja.delete_rows(hoja.max_row)
+        libro.save(ruta)
+
+    def test_aplica_modificados_nuevos_y_eliminados(self):
+        original = extraer_evaluacion(self.rutas[0])
+        agregado = original['resultados'].pop(0)
+        evaluacion_id = self.sistema.registrar_evaluacion(original)
+
+        corregido = extraer_evaluacion(self.rutas[0])
+        item, estado, fecha, observaciones = corregido['resultados'][1]
+        nuevo_estado = 'Incumplimiento' if estado != 'Incumplimiento' else 'Cumplimiento satisfactorio'
+        corregido['resultados'][1] = (item, nuevo_estado, fecha, observaciones)
+        eliminado = corregido['resultados'].pop()
+
+        resumen = self.sistema.actualizar_evaluacion(corregido)
+
+        self.assertEqual(resumen['evaluacion_id'], evaluacion_id)
+        self.assertEqual(resumen['cambios'], 2)
+        self.assertEqual(resumen['eliminados'], 1)
+        self.assertEqual(resumen['sin_cambios'], len(corregido['resultados']) - 2)
+        self.assertEqual(self.contar('Evaluaciones'), 1)
+
+        almacenados = dict(self.resultados_almacenados(evaluacion_id))
+        self.assertEqual(len(almacenados), len(corregido['resultados']))
+        self.assertEqual(almacenados[item], nuevo_estado)
+        self.assertIn(agregado[0], almacenados)
+        self.assertNotIn(eliminado[0], almacenados)
+        comparacion = self.sistema.recalcular_cumplimiento([evaluacion_id], verificar_paridad=True)
+        self.assertEqual(comparacion.loc[evaluacion_id, 'diferencia'], 0)
+
+    def test_libro_sin_cambios_no_escribe(self):
+        evaluacion_id = self.sistema.registrar_evaluacion(extraer_evaluacion(self.rutas[0]))
+        antes = self.consultar("SELECT * FROM ResultadosEvaluacion ORDER BY ItemID")
+
+        resumen = self.sistema.actualizar_evaluacion(extraer_evaluacion(self.rutas[0]))
+
+        self.assertEqual((resumen['evaluacion_id'], resumen['cambios'], resumen['eliminados']),
+                         (evaluacion_id, 0, 0))
+        self.assertEqual(self.consultar("SELECT * FROM ResultadosEvaluacion ORDER BY ItemID"), antes)
+
+    def test_evaluacion_inexistente_se_registra(self):
+        datos = extraer_evaluacion(self.rutas[0])
+        resumen = self.sistema.actualizar_evaluacion(datos)
+
+        self.assertTrue(resumen['nueva'])
+        self.assertEqual((resumen['cambios'], resumen['eliminados']), (len(datos['resultados']), 0))
+        self.assertEqual(self.contar('Evaluaciones'), 1)
+        self.assertEqual(len(self.resultados_almacenados(resumen['evaluacion_id'])), len(datos['resultados']))
+        self.assertEqual(self.sistema.buscar_hash_en_manifiesto(datos['hash_contenido']), resumen['evaluacion_id'])
+
+    def test_lote_en_modo_actualizar(self):
+        MotorIngestaLote(self.sistema, max_workers=1).procesar(self.rutas[:2])
+        self.corregir_libro(self.rutas[0])
+
+        resumen = MotorIngestaLote(self.sistema, max_workers=1, actualizar=True).procesar(self.rutas[:2])
+
+        corregido, intacto = resumen['resultados']
+        self.assertTrue(corregido['exito'] and intacto['exito'])
+        self.assertEqual((corregido['cambios'], corregido['eliminados']), (1, 1))
+        self.assertEqual((intacto['cambios'], intacto['eliminados']), (0, 0))
+        self.assertEqual(self.contar('Evaluaciones'), 2)
+
+    def test_lote_en_grupo_con_libros_nuevos_y_corregidos(self):
+        MotorIngestaLote(self.sistema, max_workers=1).procesar(self.rutas[:2])
+        self.corregir_libro(self.rutas[0])
+        aplicar = self.sistema.aplicar_resumen
+        aplicaciones = []
+        self.sistema.aplicar_resumen = lambda: aplicaciones.append(1) or aplicar()
+
+        motor = MotorIngestaLote(self.sistema, max_workers=1, tamano_grupo=10, actualizar=True)
+        resumen = motor.procesar(self.rutas[:3])
+
+        # El libro sin cambios se resuelve antes de confirmar el grupo
+        por_archivo = {r['archivo']: r for r in resumen['resultados']}
+        corregido, intacto, nuevo = (por_archivo[ruta] for ruta in self.rutas[:3])
+        self.assertTrue(all(r['exito'] for r in resumen['resultados']))
+        self.assertEqual((corregido['cambios'], corregido['eliminados']), (1, 1))
+        self.assertEqual((intacto['cambios'], intacto['eliminados']), (0, 0))
+        self.assertEqual(nuevo['eliminados'], 0)
+        self.assertGreater(nuevo['cambios'], 0)
+        self.assertEqual(self.contar('Evaluaciones'), 3)
+        # Un solo commit de grupo seguido de un solo MERGE del resumen
+        self.assertEqual(len(aplicaciones), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import json
+import sqlite3
+import threading
+import unittest
+
+from tests.entorno import PruebaConBase
+from catalogos import CatalogoCache
+
+
+class PruebaReferenciasHomonimas(PruebaConBase):
+    """Nombres de referencia repetidos en la base de datos"""
+
+    def duplicar_docente(self) -> str:
+        """Inserta un segundo docente con el nombre del primero y devuelve ese nombre"""
+        conn = sqlite3.connect(self.ruta_bd)
+        try:
+            nombres, apellidos = conn.execute(
+                "SELECT Nombres, Apellidos FROM Docentes ORDER BY DocenteID LIMIT 1"
+            ).fetchone()
+            conn.execute("INSERT INTO Docentes (Nombres, Apellidos) VALUES (?, ?)", (nombres, apellidos))
+            conn.commit()
+        finally:
+            conn.close()
+        return f"{nombres} {apellidos}"
+
+    def test_nombre_unico_devuelve_su_id(self):
+        docente_id, nombres, apellidos = self.consultar(
+            "SELECT DocenteID, Nombres, Apellidos FROM Docentes ORDER BY DocenteID LIMIT 1"
+        )[0]
+        self.assertEqual(self.sistema.obtener_id_docente(f"{nombres} {apellidos}"), docente_id)
+        self.assertIsNone(self.sistema.obtener_id_docente('Docente Inexistente'))
+
+    def test_docente_homonimo_es_ambiguo(self):
+        nombre = self.duplicar_docente()
+        self.sistema.catalogos.recargar()
+
+        with self.assertRaisesRegex(ValueError, 'Nombre de docente ambiguo'):
+            self.sistema.obtener_id_docente(nombre.upper())
+        self.assertEqual(self.sistema.obtener_evaluaciones_docente(nombre), [])
+        self.assertIn(nombre, self.sistema.catalogos.nombres_referencia('docentes'))
+
+    def test_instantanea_anterior_con_un_id_por_nombre(self):
+        ruta = self.sistema.catalogos.ruta_snapshot
+        self.sistema.catalogos.recargar()
+        with open(ruta, encoding='utf-8') as f:
+            snapshot = json.load(f)
+        snapshot['referencias'] = {
+            tipo: {nombre: ids[0] for nombre, ids in nombres.items()}
+            for tipo, nombres in snapshot['referencias'].items()
+        }
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f)
+
+        catalogos = CatalogoCache(self.sistema, ruta_snapshot=ruta)
+        nombre, docente_id = next(iter(snapshot['referencias']['docentes'].items()))
+        self.assertEqual(catalogos.id_referencia('docentes', nombre), docente_id)
+
+
+class PruebaRefrescoCatalogos(PruebaConBase):
+    """Refresco de la caché mientras otros hilos la consultan"""
+
+    def test_refresco_publica_bajo_el_candado(self):
+        catalogos = self.sistema.catalogos
+        catalogos.recargar()
+        anteriores = catalogos._datos
+        nombre = self.consultar("SELECT Nombres || ' ' || Apellidos FROM Docentes LIMIT 1")[0][0]
+
+        # Con el candado tomado el refresco lee la base, pero no reemplaza los índices
+        with catalogos._lock:
+            hilo = threading.Thread(target=catalogos._refrescar_en_segundo_plano)
+            hilo.start()
+            hilo.join(0.5)
+            self.assertTrue(hilo.is_alive())
+            self.assertIs(catalogos._datos, anteriores)
+            self.assertIsNotNone(catalogos.id_referencia('docentes', nombre))
+        hilo.join()
+
+        self.assertIsNot(catalogos._datos, anteriores)
+        self.assertEqual(catalogos.nombres_referencia('docentes'), list(anteriores['referencias']['docentes']))
+
+
+if __name__ == '__main__':
+    unittest.main()
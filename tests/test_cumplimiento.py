@@ -0,0 +1,75 @@
+import unittest
+
+import pandas as pd
+
+from tests.entorno import PruebaConBase
+from cumplimiento import acumular_estado, calcular_cumplimiento, cumplimiento_evaluacion, porcentaje_acumulado
+from evaluacion_docente import extraer_evaluacion
+
+
+class PruebaPesos(unittest.TestCase):
+    """Regla de pesos compartida por la carga, los resúmenes y los informes"""
+
+    def test_no_aplica_y_estados_desconocidos_no_cuentan(self):
+        acumulado = [0.0, 0]
+        self.assertTrue(acumular_estado(acumulado, 'Cumplimiento satisfactorio'))
+        self.assertTrue(acumular_estado(acumulado, 'Cumplimiento parcial', 2))
+        self.assertTrue(acumular_estado(acumulado, 'Incumplimiento'))
+        self.assertFalse(acumular_estado(acumulado, 'No Aplica'))
+        self.assertFalse(acumular_estado(acumulado, None))
+        self.assertEqual(acumulado, [2.0, 4])
+        self.assertEqual(porcentaje_acumulado(acumulado), 50.0)
+        self.assertEqual(porcentaje_acumulado([0.0, 0]), 0.0)
+
+    def test_recorrido_y_calculo_vectorizado_coinciden(self):
+        estados = ['Cumplimiento satisfactorio', 'No Aplica', 'Cumplimiento parcial', 'Incumplimiento']
+        categorias = ['Docencia', 'Docencia', 'Gestión', 'Gestión']
+        total = cumplimiento_evaluacion([(None, e, None, None) for e in estados])
+
+        totales, tabla = calcular_cumplimiento(pd.DataFrame({
+            'evaluacion_id': [1] * len(estados), 'categoria': categorias, 'estado': estados
+        }))
+        self.assertEqual(total, totales[1])
+        self.assertEqual(dict(zip(tabla['categoria'], tabla['porcentaje'])), {'Docencia': 100.0, 'Gestión': 25.0})
+
+
+class PruebaParidadCumplimiento(PruebaConBase):
+    """El cálculo del cliente frente a sp_CalcularPorcentajeCumplimiento"""
+
+    def test_desactivado_por_defecto(self):
+        self.assertFalse(self.sistema.cumplimiento_cliente)
+        with self.assertRaisesRegex(ValueError, 'desactivado'):
+            self.sistema.recalcular_cumplimiento()
+
+    def test_paridad_con_el_procedimiento(self):
+        porcentajes = {}
+        for ruta in self.rutas:
+            datos = extraer_evaluacion(ruta)
+            porcentajes[self.sistema.registrar_evaluacion(datos)] = datos['cumplimiento']
+
+        comparacion = self.sistema.recalcular_cumplimiento(verificar_paridad=True)
+        self.assertEqual(sorted(comparacion.index), sorted(porcentajes))
+        self.assertTrue((comparacion['diferencia'].abs() <= 0.01).all())
+        for evaluacion_id, porcentaje in porcentajes.items():
+            self.assertAlmostEqual(comparacion.loc[evaluacion_id, 'almacenado'], porcentaje, places=2)
+
+    def test_cumplimiento_cliente_guarda_lo_mismo_que_el_servidor(self):
+        servidor = self.sistema.registrar_evaluacion(extraer_evaluacion(self.rutas[0]))
+        cliente_sistema = self.crear_sistema('cliente')
+        cliente_sistema.cumplimiento_cliente = True
+        cliente = cliente_sistema.registrar_evaluacion(extraer_evaluacion(self.rutas[1]))
+
+        comparacion = self.sistema.recalcular_cumplimiento([servidor, cliente], verificar_paridad=True)
+        self.assertEqual(len(comparacion), 2)
+        self.assertTrue((comparacion['diferencia'].abs() <= 0.01).all())
+
+    def test_sin_resultados_no_escribe(self):
+        self.sistema.cumplimiento_cliente = True
+        for verificar in (True, False):
+            comparacion = self.sistema.recalcular_cumplimiento(verificar_paridad=verificar)
+            self.assertTrue(comparacion.empty)
+            self.assertEqual(list(comparacion.columns), ['almacenado', 'calculado', 'diferencia'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import shutil
+import unittest
+from unittest import mock
+
+from tests.entorno import PruebaConBase
+import evaluacion_docente
+import manifiesto
+from ingesta_lote import MotorIngestaLote
+
+
+class PruebaManifiesto(PruebaConBase):
+    """Omisión de libros ya cargados según el manifiesto local"""
+
+    def test_un_archivo_nuevo_se_lee_una_sola_vez_para_el_hash(self):
+        calcular = mock.Mock(wraps=manifiesto.calcular_hash)
+        with mock.patch.object(manifiesto, 'calcular_hash', calcular), \
+                mock.patch.object(evaluacion_docente, 'calcular_hash', calcular):
+            resumen = MotorIngestaLote(self.sistema, max_workers=1).procesar(self.rutas[:2])
+        self.assertEqual(resumen['procesados'], 2)
+        self.assertEqual(calcular.call_count, 2)
+
+    def test_archivo_sin_cambios_se_omite_por_firma(self):
+        motor = MotorIngestaLote(self.sistema, max_workers=1)
+        motor.procesar(self.rutas[:1])
+        resultado = motor.procesar(self.rutas[:1])['resultados'][0]
+        self.assertTrue(resultado['duplicado'])
+        self.assertEqual(self.contar('Evaluaciones'), 1)
+
+    def test_copia_con_otra_ruta_se_omite_por_hash(self):
+        motor = MotorIngestaLote(self.sistema, max_workers=1)
+        motor.procesar(self.rutas[:1])
+        copia = os.path.join(self.directorio, 'copia.xlsx')
+        shutil.copyfile(self.rutas[0], copia)
+
+        resultado = motor.procesar([copia])['resultados'][0]
+        self.assertTrue(resultado['duplicado'])
+        self.assertIn('Ya existe una evaluación para este archivo', resultado['error'])
+        self.assertEqual(self.contar('Evaluaciones'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
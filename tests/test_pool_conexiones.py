@@ -0,0 +1,73 @@
+import time
+import unittest
+
+from tests import entorno  # noqa: F401  (rutas de importación)
+from pool_conexiones import PoolConexiones
+
+
+class ConexionFalsa:
+    """Conexión que cuenta las consultas de verificación"""
+
+    def __init__(self):
+        self.verificaciones = 0
+        self.closed = False
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql):
+        self.verificaciones += 1
+
+    def fetchone(self):
+        return (1,)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class PruebaPoolConexiones(unittest.TestCase):
+
+    def crear_pool(self, **opciones) -> PoolConexiones:
+        self.creadas = []
+
+        def fabrica():
+            conn = ConexionFalsa()
+            self.creadas.append(conn)
+            return conn
+
+        pool = PoolConexiones(fabrica, **opciones)
+        self.addCleanup(pool.cerrar)
+        return pool
+
+    def test_una_conexion_usada_hace_poco_se_presta_sin_verificar(self):
+        pool = self.crear_pool(verificar_tras=60.0)
+        for _ in range(5):
+            with pool.conexion():
+                pass
+        self.assertEqual(len(self.creadas), 1)
+        self.assertEqual(self.creadas[0].verificaciones, 0)
+
+    def test_una_conexion_inactiva_se_verifica_antes_de_prestarse(self):
+        pool = self.crear_pool(verificar_tras=0.0)
+        with pool.conexion():
+            pass
+        with pool.conexion():
+            pass
+        self.assertEqual(self.creadas[0].verificaciones, 1)
+
+    def test_las_conexiones_inactivas_se_cierran_sin_pedir_otras(self):
+        pool = self.crear_pool(inactividad_maxima=0.05, intervalo_expulsion=0.02)
+        with pool.conexion():
+            pass
+        limite = time.monotonic() + 2.0
+        while not self.creadas[0].closed and time.monotonic() < limite:
+            time.sleep(0.02)
+        self.assertTrue(self.creadas[0].closed)
+        self.assertEqual(pool._abiertas, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+
+from tests.entorno import PruebaConBase
+from evaluacion_docente import extraer_evaluacion
+from registro_grupal import RegistroGrupal, es_error_de_conexion, es_error_transitorio
+
+
+class ErrorBase(Exception):
+    """Error con la forma de pyodbc: args = (SQLSTATE, mensaje)"""
+
+
+INTERBLOQUEO = ErrorBase('40001', '[40001] Transaction was deadlocked (1205)')
+ESPERA_AGOTADA = ErrorBase('HY000', '[HY000] Lock request time out period exceeded. (1222)')
+ENLACE_CAIDO = ErrorBase('08S01', '[08S01] Communication link failure')
+
+
+class PruebaClasificacionErrores(unittest.TestCase):
+
+    def test_transitorios_que_conservan_la_conexion(self):
+        for error in (INTERBLOQUEO, ESPERA_AGOTADA, ErrorBase('HYT00', 'Query timeout expired')):
+            self.assertTrue(es_error_transitorio(error))
+            self.assertFalse(es_error_de_conexion(error))
+
+    def test_enlace_caido_descarta_la_conexion(self):
+        self.assertTrue(es_error_transitorio(ENLACE_CAIDO))
+        self.assertTrue(es_error_de_conexion(ENLACE_CAIDO))
+
+
+class PruebaRegistroGrupal(PruebaConBase):
+    """Commit en grupo con puntos de guardado por archivo"""
+
+    def registrar(self, lista_datos, **opciones):
+        registro = RegistroGrupal(self.sistema, tamano_grupo=len(lista_datos), espera_inicial=0, **opciones)
+        resueltas = []
+        for datos in lista_datos:
+            resueltas += registro.agregar(datos, {'archivo': datos['archivo']})
+        resueltas += registro.confirmar()
+        return [entrada['resultado'] for entrada in resueltas]
+
+    def fallar_una_vez(self, error):
+        """Hace fallar con error la primera escritura de una evaluación"""
+        escribir = self.sistema.escribir_evaluacion
+        fallos = []
+
+        def escribir_con_fallo(cursor, datos):
+            if not fallos:
+                fallos.append(error)
+                raise error
+            return escribir(cursor, datos)
+
+        self.sistema.escribir_evaluacion = escribir_con_fallo
+        return fallos
+
+    def test_un_archivo_con_errores_no_revierte_el_grupo(self):
+        self.sistema.prevalidacion = False
+        lista_datos = [extraer_evaluacion(ruta) for ruta in self.rutas[:3]]
+        _, estado, fecha, observaciones = lista_datos[1]['resultados'][0]
+        lista_datos[1]['resultados'][0] = ('Ítem inexistente', estado, fecha, observaciones)
+
+        resultados = self.registrar(lista_datos)
+
+        self.assertEqual([r.get('exito', False) for r in resultados], [True, False, True])
+        self.assertIn('Ítem no encontrado', resultados[1]['error'])
+        self.assertEqual(self.contar('Evaluaciones'), 2)
+        esperados = len(lista_datos[0]['resultados']) + len(lista_datos[2]['resultados'])
+        self.assertEqual(self.contar('ResultadosEvaluacion'), esperados)
+        for resultado in (resultados[0], resultados[2]):
+            filas = self.consultar(
+                "SELECT COUNT(*) FROM Evaluaciones WHERE EvaluacionID = ?", resultado['evaluacion_id']
+            )
+            self.assertEqual(filas[0][0], 1)
+
+    def test_interbloqueo_reutiliza_la_conexion(self):
+        lista_datos = [extraer_evaluacion(ruta) for ruta in self.rutas[:2]]
+        self.sistema.conectar_bd()
+        conexion = self.sistema.conn
+        fallos = self.fallar_una_vez(INTERBLOQUEO)
+
+        resultados = self.registrar(lista_datos)
+
+        self.assertEqual(len(fallos), 1)
+        self.assertTrue(all(r['exito'] for r in resultados))
+        self.assertIs(self.sistema.conn, conexion)
+        self.assertEqual(self.contar('Evaluaciones'), 2)
+
+    def test_enlace_caido_descarta_la_conexion(self):
+        lista_datos = [extraer_evaluacion(ruta) for ruta in self.rutas[:2]]
+        self.sistema.conectar_bd()
+        conexion = self.sistema.conn
+        self.fallar_una_vez(ENLACE_CAIDO)
+
+        resultados = self.registrar(lista_datos)
+
+        self.assertTrue(all(r['exito'] for r in resultados))
+        self.assertIsNot(self.sistema.conn, conexion)
+        self.assertEqual(self.contar('Evaluaciones'), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import re
+import unittest
+
+from tests.entorno import PruebaConBase
+from evaluacion_docente import SQL_REGISTRAR_RESULTADOS_LOTE, extraer_evaluacion
+
+
+class PruebaRegistroResultados(PruebaConBase):
+    """Registro en bloque de los resultados de una evaluación"""
+
+    def test_el_lote_usa_el_procedimiento_almacenado(self):
+        self.assertIn('EXEC sp_RegistrarResultadosEvaluacion', SQL_REGISTRAR_RESULTADOS_LOTE)
+        self.assertNotIn('INSERT INTO ResultadosEvaluacion', SQL_REGISTRAR_RESULTADOS_LOTE)
+
+    def test_registra_todos_los_resultados(self):
+        datos = extraer_evaluacion(self.rutas[0])
+        evaluacion_id = self.sistema.registrar_evaluacion(datos)
+
+        filas = self.consultar(
+            "SELECT COUNT(*) FROM ResultadosEvaluacion WHERE EvaluacionID = ?", evaluacion_id
+        )
+        self.assertEqual(filas[0][0], len(datos['resultados']))
+        porcentaje = self.consultar(
+            "SELECT PorcentajeCumplimiento FROM Evaluaciones WHERE EvaluacionID = ?", evaluacion_id
+        )[0][0]
+        self.assertIsNotNone(porcentaje)
+
+    def test_item_desconocido_revierte_la_evaluacion(self):
+        # Sin prevalidación el error lo informa el servidor
+        self.sistema.prevalidacion = False
+        datos = extraer_evaluacion(self.rutas[0])
+        _, estado, fecha, observaciones = datos['resultados'][3]
+        datos['resultados'][3] = ('Ítem inexistente', estado, fecha, observaciones)
+
+        with self.assertRaisesRegex(Exception, 'Ítem no encontrado: Ítem inexistente'):
+            self.sistema.registrar_evaluacion(datos)
+        self.assertEqual(self.contar('Evaluaciones'), 0)
+        self.assertEqual(self.contar('ResultadosEvaluacion'), 0)
+
+    def test_item_duplicado_revierte_la_evaluacion(self):
+        self.sistema.prevalidacion = False
+        datos = extraer_evaluacion(self.rutas[0])
+        datos['resultados'].append(datos['resultados'][0])
+
+        item = datos['resultados'][0][0]
+        with self.assertRaisesRegex(Exception, 'Ya existe un resultado para el ítem: ' + re.escape(item)):
+            self.sistema.registrar_evaluacion(datos)
+        self.assertEqual(self.contar('Evaluaciones'), 0)
+        self.assertEqual(self.contar('ResultadosEvaluacion'), 0)
+
+    def test_evaluacion_duplicada_en_el_servidor(self):
+        self.sistema.registrar_evaluacion(extraer_evaluacion(self.rutas[0]))
+
+        # Otro equipo, sin el manifiesto local del primero
+        otro = self.crear_sistema('otro_equipo')
+        with self.assertRaisesRegex(Exception, 'Ya existe una evaluación'):
+            otro.registrar_evaluacion(extraer_evaluacion(self.rutas[0]))
+        self.assertEqual(self.contar('Evaluaciones'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
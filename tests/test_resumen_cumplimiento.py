@@ -0,0 +1,103 @@
+import unittest
+from unittest import mock
+
+from tests.entorno import PruebaConBase
+from evaluacion_docente import extraer_evaluacion
+from registro_grupal import RegistroGrupal
+from resumen_cumplimiento import SQL_ACUMULAR_RESUMEN, SQL_CREAR_DELTAS_RESUMEN, ResumenCumplimiento
+from sustituto_sqlite import CursorSustituto
+
+
+class PruebaResumenCumplimiento(PruebaConBase):
+    """Resumen de BI anotado en la transacción y aplicado después del commit"""
+
+    def setUp(self):
+        super().setUp()
+        self.resumen = ResumenCumplimiento(self.sistema)
+        self.resumen.reconstruir()
+
+    def assertConsistente(self):
+        verificacion = self.resumen.verificar()
+        self.assertTrue(verificacion['consistente'], verificacion['detalle'])
+
+    def test_la_transaccion_del_archivo_no_toca_el_resumen(self):
+        datos = extraer_evaluacion(self.rutas[0])
+        self.sistema.preparar_registro(datos)
+        self.sistema.conectar_bd()
+        cursor = self.sistema.conn.cursor()
+        self.sistema.escribir_evaluacion(cursor, datos)
+
+        cursor.execute("SELECT COUNT(*) FROM ResumenEvaluaciones")
+        self.assertEqual(cursor.fetchval(), 0)
+        cursor.execute("SELECT COUNT(*) FROM #DeltaEvaluaciones")
+        self.assertEqual(cursor.fetchval(), 1)
+
+        self.sistema.conn.commit()
+        self.sistema.aplicar_resumen()
+        self.assertEqual(self.contar('ResumenEvaluaciones'), 1)
+        self.assertConsistente()
+
+    def test_temporales_creadas_fuera_de_los_lotes_con_parametros(self):
+        # Con pyodbc un lote con parámetros corre en sp_executesql y sus #tablas
+        # desaparecen al terminar la llamada
+        llamadas = []
+        ejecutar = CursorSustituto.execute
+
+        def registrar_llamada(cursor, sql, *parametros):
+            llamadas.append((sql, bool(parametros)))
+            return ejecutar(cursor, sql, *parametros)
+
+        with mock.patch.object(CursorSustituto, 'execute', registrar_llamada):
+            self.sistema.registrar_evaluacion(extraer_evaluacion(self.rutas[0]))
+
+        self.assertTrue(any('MERGE #DeltaEvaluaciones' in sql for sql, _ in llamadas))
+        creadas = [sql for sql, con_parametros in llamadas if con_parametros and 'CREATE TABLE #' in sql]
+        self.assertEqual(creadas, [])
+        self.assertEqual(self.contar('ResumenEvaluaciones'), 1)
+        self.assertConsistente()
+
+    def test_el_sustituto_descarta_temporales_de_lotes_con_parametros(self):
+        # Crear y anotar en un mismo lote con parámetros no deja nada que aplicar
+        evaluacion_id = self.sistema.registrar_evaluacion(extraer_evaluacion(self.rutas[0]))
+        otro = self.crear_sistema('otro_equipo')
+        otro.conectar_bd()
+        cursor = otro.conn.cursor()
+        cursor.execute(SQL_CREAR_DELTAS_RESUMEN + SQL_ACUMULAR_RESUMEN, (1, evaluacion_id))
+        cursor.execute("SELECT COUNT(*) FROM sqlite_temp_master WHERE name = 'DeltaEvaluaciones'")
+        self.assertEqual(cursor.fetchval(), 0)
+
+    def test_registro_individual(self):
+        for ruta in self.rutas[:3]:
+            self.sistema.registrar_evaluacion(extraer_evaluacion(ruta))
+        self.assertConsistente()
+
+    def test_grupo_con_un_archivo_revertido(self):
+        self.sistema.prevalidacion = False
+        lista_datos = [extraer_evaluacion(ruta) for ruta in self.rutas[:4]]
+        _, estado, fecha, observaciones = lista_datos[2]['resultados'][0]
+        lista_datos[2]['resultados'][0] = ('Ítem inexistente', estado, fecha, observaciones)
+
+        registro = RegistroGrupal(self.sistema, tamano_grupo=10)
+        for datos in lista_datos:
+            registro.agregar(datos, {})
+        resueltas = registro.confirmar()
+
+        self.assertEqual([e['resultado'].get('exito', False) for e in resueltas], [True, True, False, True])
+        self.assertEqual(self.contar('Evaluaciones'), 3)
+        self.assertConsistente()
+
+    def test_actualizacion_descuenta_el_aporte_anterior(self):
+        self.sistema.registrar_evaluacion(extraer_evaluacion(self.rutas[0]))
+
+        datos = extraer_evaluacion(self.rutas[0])
+        item, _, fecha, observaciones = datos['resultados'][0]
+        datos['resultados'][0] = (item, 'Incumplimiento', fecha, observaciones)
+        datos['resultados'].pop()
+        self.sistema.actualizar_evaluacion(datos)
+
+        self.assertConsistente()
+        self.assertEqual(self.consultar("SELECT SUM(Evaluaciones) FROM ResumenEvaluaciones")[0][0], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()